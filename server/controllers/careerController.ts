@@ -1,40 +1,25 @@
-import { spawn } from 'child_process';
 import { Request, Response } from 'express';
-import path from 'path';
-import { CareerPathResponse } from '../types/career';
+import careerPathWorker from '../services/careerPathWorker';
+import { CareerPathResponse, GenerationBudget } from '../types/career';
 
-// Helper function to run Python script and return output as a Promise
-const runPythonScript = (scriptPath: string, inputData: any): Promise<string> => {
-  return new Promise((resolve, reject) => {
-    const python = spawn('python', [scriptPath]);
-    let stdoutBuffer = '';
-    let stderrBuffer = '';
+const BUDGET_FIELDS = ['deadlineMs', 'maxNewTokens'];
 
-    python.stdout.on('data', (data) => {
-      const chunk = data.toString();
-      stdoutBuffer += chunk;
-      console.log('Python stdout data:', chunk);
-    });
-
-    python.stderr.on('data', (data) => {
-      const chunk = data.toString();
-      stderrBuffer += chunk;
-      console.error('Python stderr data:', chunk);
-    });
-
-    python.on('close', (code) => {
-      if (code === 0) {
-        resolve(stdoutBuffer);
-      } else {
-        reject(new Error(`Python script exited with code ${code}: ${stderrBuffer}`));
-      }
-    });
-
-    python.stdin.write(JSON.stringify(inputData));
-    python.stdin.end();
-  });
+// Budget fields are optional, but when given must be positive whole numbers
+const budgetError = (body: any): string | undefined => {
+  for (const field of BUDGET_FIELDS) {
+    const value = body[field];
+    if (value !== undefined && value !== null && !(Number.isInteger(value) && value > 0)) {
+      return `Invalid input. ${field} must be a positive integer.`;
+    }
+  }
+  return undefined;
 };
 
+const budgetFrom = (body: any): GenerationBudget => ({
+  deadlineMs: typeof body.deadlineMs === 'number' ? body.deadlineMs : undefined,
+  maxNewTokens: typeof body.maxNewTokens === 'number' ? body.maxNewTokens : undefined
+});
+
 export const predictAndPlan = async (req: Request, res: Response) => {
   try {
     const { skills, role } = req.body;
@@ -43,26 +28,19 @@ export const predictAndPlan = async (req: Request, res: Response) => {
       return res.status(400).json({ error: 'Invalid input. Skills array and role are required.' });
     }
 
-    const scriptPath = path.join(__dirname, '..', 'scripts', 'career_path_predictor.py');
+    const invalidBudget = budgetError(req.body);
+    if (invalidBudget) {
+      return res.status(400).json({ error: invalidBudget });
+    }
 
     try {
-      console.log('Attempting to run Python career path script...');
-      const generatedContent = await runPythonScript(scriptPath, { skills, role });
-      console.log('Python script ran successfully.');
-
-      if (!generatedContent) {
-        console.error('generatedContent is empty after script run.');
-        return res.status(500).json({ 
-          error: 'No content generated',
-          details: 'Python script ran, but returned empty content.'
-        });
-      }
-
-      const response: CareerPathResponse = JSON.parse(generatedContent);
+      console.log('Requesting career path from worker...');
+      const response: CareerPathResponse = await careerPathWorker.predict(skills, role, budgetFrom(req.body));
+      console.log('Career path worker responded successfully.');
       res.json(response);
 
     } catch (scriptRunError: any) {
-      console.error('Caught error from runPythonScript:', scriptRunError);
+      console.error('Caught error from career path worker:', scriptRunError);
       return res.status(500).json({ 
         error: 'Error during career path prediction',
         details: scriptRunError.message
@@ -76,4 +54,42 @@ export const predictAndPlan = async (req: Request, res: Response) => {
       details: error.message
     });
   }
-}; 
\ No newline at end of file
+}; 
+export const streamPredictAndPlan = async (req: Request, res: Response) => {
+  const { skills, role } = req.body;
+
+  if (!skills || !Array.isArray(skills) || !role) {
+    return res.status(400).json({ error: 'Invalid input. Skills array and role are required.' });
+  }
+
+  const invalidBudget = budgetError(req.body);
+  if (invalidBudget) {
+    return res.status(400).json({ error: invalidBudget });
+  }
+
+  // Server-sent events: forward partial steps to the UI while the model is still generating
+  res.setHeader('Content-Type', 'text/event-stream');
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Connection', 'keep-alive');
+  res.flushHeaders();
+
+  const send = (event: string, data: unknown) => {
+    res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+
+  try {
+    const response = await careerPathWorker.stream(skills, role, (event) => {
+      if (event.event === 'token') {
+        send('token', { text: event.text });
+      } else if (event.event === 'step') {
+        send('step', { index: event.index, step: event.step });
+      }
+    }, budgetFrom(req.body));
+    send('summary', response);
+  } catch (error: any) {
+    console.error('Caught error in streamPredictAndPlan:', error);
+    send('error', { error: 'Error during career path prediction', details: error.message });
+  } finally {
+    res.end();
+  }
+};
@@ -3,10 +3,35 @@ import crypto from 'crypto';
 import { Request, Response } from 'express';
 import fs from 'fs';
 import path from 'path'; // Import the 'path' module to help resolve paths
+import resumeCustomizerService, { ResumeCustomizerBusyError, ResumeStreamFrame } from '../services/resumeCustomizerService';
 import { handleError } from '../utils/errorHandler';
+import { forEachLine } from '../utils/lineStream';
 
 export const customizeResume = async (req: Request, res: Response) => {
-  const { jobPost, resume } = req.body;
+  // strategy: 'single' (whole resume in one prompt), 'sections' (each section rewritten separately)
+  // or 'fast' (bullets and skills reordered by relevance without the model, with a keyword gap report).
+  // numVariants (1-4) asks for alternative resumes, generated together in one batched pass
+  const { jobPost, resume, strategy, numVariants } = req.body;
+
+  if (resumeCustomizerService.isEnabled()) {
+    // The resident server keeps the model loaded, so only generation time is paid per request
+    try {
+      const result = await resumeCustomizerService.customize(jobPost, resume, strategy, numVariants);
+      return res.json({
+        customizedResume: result.customizedResume,
+        variants: result.variants,
+        servedBy: result.servedBy,
+        keywordGaps: result.keywordGaps
+      });
+    } catch (error: any) {
+      if (error instanceof ResumeCustomizerBusyError) {
+        res.setHeader('Retry-After', '5');
+        return res.status(503).json({ error: error.message });
+      }
+      console.error('Resume customizer server error:', error);
+      return res.status(500).json({ error: 'Resume customization failed', details: error.message });
+    }
+  }
 
   // Define the path to the Python script relative to the project root
   // Assuming the Node.js process is started from the project root directory.
@@ -14,7 +39,7 @@ export const customizeResume = async (req: Request, res: Response) => {
 
   console.log(`Debug: Spawning python script at ${scriptPath}`);
 
-  const pythonProcess = spawn('python', [scriptPath]);
+  const pythonProcess = spawn('python', [scriptPath, '--json']);
 
   let scriptOutput = '';
   let scriptError = '';
@@ -33,8 +58,14 @@ export const customizeResume = async (req: Request, res: Response) => {
     if (code === 0) {
       // Script executed successfully, return its stdout
       try {
-         // The Python script should return plain text. Return the raw text output.
-         res.json({ customizedResume: scriptOutput.trim() });
+         // With --json the script prints {customizedResume, servedBy, keywordGaps?, timings}
+         const result = JSON.parse(scriptOutput);
+         res.json({
+           customizedResume: result.customizedResume.trim(),
+           variants: result.variants,
+           servedBy: result.servedBy,
+           keywordGaps: result.keywordGaps
+         });
 
       } catch (e) {
          console.error(`Error processing script output: ${e}`);
@@ -54,10 +85,73 @@ export const customizeResume = async (req: Request, res: Response) => {
   });
 
   // Write the input JSON to the Python script's stdin
-  pythonProcess.stdin.write(JSON.stringify({ jobPost, resume }));
+  pythonProcess.stdin.write(JSON.stringify({ jobPost, resume, strategy, numVariants }));
   pythonProcess.stdin.end(); // Close stdin to signal end of input
 };
 
+export const streamCustomizeResume = async (req: Request, res: Response) => {
+  const { jobPost, resume, strategy } = req.body;
+
+  if (!jobPost || !resume) {
+    return res.status(400).json({ error: 'Missing jobPost or resume in input.' });
+  }
+
+  // Server-sent events: forward tokens to the UI while the model is still generating
+  res.setHeader('Content-Type', 'text/event-stream');
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Connection', 'keep-alive');
+  res.flushHeaders();
+
+  let finished = false;
+  const send = (frame: ResumeStreamFrame) => {
+    if (frame.event !== 'token') {
+      finished = true;
+    }
+    const { event, ...data } = frame;
+    res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+
+  try {
+    if (resumeCustomizerService.isEnabled()) {
+      await resumeCustomizerService.stream(jobPost, resume, strategy, send);
+    } else {
+      const scriptPath = path.join(__dirname, '../scripts/resume_customizer_script.py');
+      const pythonProcess = spawn('python', [scriptPath, '--stream']);
+      pythonProcess.stderr.on('data', (data) => {
+        console.error(`Python script stderr: ${data}`);
+      });
+      const exited = new Promise<number | null>((resolve, reject) => {
+        pythonProcess.on('close', resolve);
+        pythonProcess.on('error', reject);
+      });
+
+      pythonProcess.stdin.write(JSON.stringify({ jobPost, resume, strategy }));
+      pythonProcess.stdin.end();
+
+      await forEachLine(pythonProcess.stdout, (line) => {
+        try {
+          send(JSON.parse(line) as ResumeStreamFrame);
+        } catch {
+          // Plain-text error messages from the script's input checks are logged, not forwarded
+          console.error(`Unexpected resume customizer output: ${line}`);
+        }
+      });
+      const code = await exited;
+      if (code !== 0 && !finished) {
+        throw new Error(`Python script exited with code ${code}`);
+      }
+    }
+    if (!finished) {
+      throw new Error('Resume customizer stream ended without a result');
+    }
+  } catch (error: any) {
+    console.error('Caught error in streamCustomizeResume:', error);
+    send({ event: 'error', error: error.message || 'Resume customization failed' });
+  } finally {
+    res.end();
+  }
+};
+
 export const uploadResumeAndExtractSkills = async (req: Request, res: Response) => {
   console.log("=== Resume upload request received ===");
   console.log("URL:", req.originalUrl);
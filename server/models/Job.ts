@@ -43,6 +43,8 @@ JobSchema.index({ posted_date: -1 });
 JobSchema.index({ is_active: 1 });
 JobSchema.index({ location: 1 });
 JobSchema.index({ skills: 1 });
+// Scraped jobs are upserted by URL
+JobSchema.index({ url: 1 });
 
 // Check if the model already exists to prevent OverwriteModelError
 const Job = mongoose.models.Job || mongoose.model<IJob>('Job', JobSchema);
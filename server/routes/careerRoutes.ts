@@ -1,9 +1,12 @@
 import express from 'express';
-import { predictAndPlan } from '../controllers/careerController';
+import { predictAndPlan, streamPredictAndPlan } from '../controllers/careerController';
 
 const router = express.Router();
 
 // Career path prediction endpoint
 router.post('/predict-and-plan', predictAndPlan);
 
+// Streaming variant: server-sent token, step and summary events
+router.post('/predict-and-plan/stream', streamPredictAndPlan);
+
 export default router; 
\ No newline at end of file
@@ -1,11 +1,12 @@
 import express from 'express';
-import { customizeResume, uploadResumeAndExtractSkills } from '../controllers/resumeController';
+import { customizeResume, streamCustomizeResume, uploadResumeAndExtractSkills } from '../controllers/resumeController';
 import { authenticateUser } from '../middleware/auth';
 
 const router = express.Router();
 
 // General resume endpoints
 router.post('/resume/customize', customizeResume);
+router.post('/resume/customize/stream', streamCustomizeResume);
 router.post('/resume/upload', uploadResumeAndExtractSkills);
 
 // User resume endpoints - these need to match the API calls from the frontend
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compares the career model backends (torch, int8, onnx) on a fixed prompt set.
+
+Each backend runs in its own child process so peak RSS is measured in
+isolation. Generation is greedy so the outputs are comparable; agreement is
+reported against the torch backend as the exact-match rate and the mean
+text similarity.
+
+Usage:
+    python bench_career_backends.py [--backends torch int8 onnx] [--max-new-tokens 256]
+"""
+import argparse
+import difflib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from career_backends import BACKENDS, load_pipeline
+from career_path_predictor import build_prompt
+
+# Fixed (skills, role) prompt set so runs are comparable over time
+PROMPT_SET = [
+    (["Python", "SQL", "Excel"], "Data Scientist"),
+    (["JavaScript", "React", "CSS"], "Senior Frontend Engineer"),
+    (["Java", "Spring", "MySQL"], "Backend Engineer"),
+    (["Communication", "Jira", "Scrum"], "Product Manager"),
+    (["Linux", "Bash", "Networking"], "DevOps Engineer"),
+    (["Python", "Statistics"], "Machine Learning Engineer"),
+    (["Figma", "User Research"], "UX Designer"),
+    (["Excel", "Tableau", "SQL"], "Business Analyst")
+]
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def run_backend(backend, max_new_tokens):
+    """Runs the prompt set on one backend in this process and returns its measurements."""
+    started = time.perf_counter()
+    generator = load_pipeline(backend)
+    load_seconds = time.perf_counter() - started
+
+    tokenizer = generator.tokenizer
+    outputs = []
+    generated_tokens = 0
+    generation_seconds = 0.0
+    for skills, role in PROMPT_SET:
+        started = time.perf_counter()
+        text = generator(build_prompt(skills, role), max_new_tokens=max_new_tokens, do_sample=False)[0]['generated_text']
+        generation_seconds += time.perf_counter() - started
+        generated_tokens += len(tokenizer(text, add_special_tokens=False)['input_ids'])
+        outputs.append(text)
+
+    return {
+        'backend': backend,
+        'loadSeconds': load_seconds,
+        'generatedTokens': generated_tokens,
+        'tokensPerSecond': generated_tokens / generation_seconds if generation_seconds else 0.0,
+        'peakRssMb': peak_rss_mb(),
+        'outputs': outputs
+    }
+
+def run_child(backend, max_new_tokens):
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', backend, '--max-new-tokens', str(max_new_tokens)],
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        return {'backend': backend, 'error': process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'failed'}
+    return json.loads(process.stdout)
+
+def agreement(reference, outputs):
+    exact = sum(1 for a, b in zip(reference, outputs) if a == b)
+    similarity = sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(reference, outputs))
+    return exact / len(reference), similarity / len(reference)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the career model inference backends.")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--max-new-tokens', type=int, default=256)
+    parser.add_argument('--child', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.max_new_tokens)))
+        return 0
+
+    results = [run_child(backend, args.max_new_tokens) for backend in args.backends]
+    reference = next((r['outputs'] for r in results if r['backend'] == 'torch' and 'outputs' in r), None)
+
+    print(f"{'backend':8} {'load s':>8} {'tok/s':>8} {'peak RSS MB':>12} {'exact':>7} {'similar':>8}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['backend']:8} error: {result['error']}")
+            continue
+        exact, similarity = agreement(reference, result['outputs']) if reference else (float('nan'), float('nan'))
+        print(f"{result['backend']:8} {result['loadSeconds']:8.1f} {result['tokensPerSecond']:8.1f} "
+              f"{result['peakRssMb']:12.0f} {exact:7.0%} {similarity:8.0%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
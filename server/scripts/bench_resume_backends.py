@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compares the resume customizer backends (bnb4, int8, gguf) on a fixed job/resume set.
+
+Each backend runs in its own child process so peak RSS is measured in
+isolation. Every backend gets the same build_prompt() prompt and the same
+generation settings, except that decoding is greedy so the outputs are
+comparable. Agreement is reported as the mean text similarity against the
+bnb4 backend, which is the current GPU path.
+
+Usage:
+    python bench_resume_backends.py [--backends bnb4 int8 gguf] [--max-new-tokens 256]
+"""
+import argparse
+import difflib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from resume_backends import count_tokens, load_pipeline
+from resume_customizer_script import GENERATION_KWARGS, build_prompt, model_id
+
+BENCH_BACKENDS = ('bnb4', 'int8', 'gguf')
+
+# Fixed (job post, resume) pairs so runs are comparable over time
+SAMPLES = [
+    (
+        "Senior Backend Engineer. We build payment APIs in Python and Go on AWS. You will design "
+        "PostgreSQL schemas, own services end to end, mentor engineers and improve CI/CD. "
+        "Requirements: 5+ years Python, distributed systems, Docker, Kubernetes.",
+        "Jane Doe - jane@example.com\nSummary: Software engineer with 6 years of experience.\n"
+        "Skills: Python, Django, MySQL, Docker, JavaScript\nExperience:\n- Acme Corp, Software Engineer "
+        "(2019-2024): built REST APIs in Django; migrated services to Docker; led a team of 3.\n"
+        "Education: BSc Computer Science"
+    ),
+    (
+        "Data Analyst. Turn sales data into weekly dashboards in Tableau, write SQL against Snowflake and "
+        "present findings to stakeholders. Requirements: SQL, Excel, Tableau or Power BI, communication.",
+        "John Smith - john@example.com\nSummary: Operations associate moving into analytics.\n"
+        "Skills: Excel, SQL, Python basics, Salesforce\nExperience:\n- Retail Co, Operations Associate "
+        "(2021-2024): built Excel reports for regional managers; automated inventory exports.\n"
+        "Education: BA Economics; Google Data Analytics Certificate"
+    )
+]
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def run_backend(backend, max_new_tokens):
+    """Runs the sample set on one backend in this process and returns its measurements."""
+    started = time.perf_counter()
+    generator = load_pipeline(backend, model_id)
+    load_seconds = time.perf_counter() - started
+
+    generation_kwargs = dict(GENERATION_KWARGS, max_new_tokens=max_new_tokens, do_sample=False)
+    outputs = []
+    generated_tokens = 0
+    generation_seconds = 0.0
+    for job_post, resume in SAMPLES:
+        started = time.perf_counter()
+        text = generator(build_prompt(job_post, resume), **generation_kwargs)[0]['generated_text']
+        generation_seconds += time.perf_counter() - started
+        generated_tokens += count_tokens(generator, text)
+        outputs.append(text)
+
+    return {
+        'backend': backend,
+        'loadSeconds': load_seconds,
+        'generatedTokens': generated_tokens,
+        'tokensPerSecond': generated_tokens / generation_seconds if generation_seconds else 0.0,
+        'peakRssMb': peak_rss_mb(),
+        'outputs': outputs
+    }
+
+def run_child(backend, max_new_tokens):
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', backend, '--max-new-tokens', str(max_new_tokens)],
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        return {'backend': backend, 'error': process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'failed'}
+    return json.loads(process.stdout)
+
+def similarity(reference, outputs):
+    return sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(reference, outputs)) / len(reference)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume customizer inference backends.")
+    parser.add_argument('--backends', nargs='+', choices=BENCH_BACKENDS, default=list(BENCH_BACKENDS))
+    parser.add_argument('--max-new-tokens', type=int, default=256)
+    parser.add_argument('--child', choices=BENCH_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.max_new_tokens)))
+        return 0
+
+    results = [run_child(backend, args.max_new_tokens) for backend in args.backends]
+    reference = next((r['outputs'] for r in results if r['backend'] == 'bnb4' and 'outputs' in r), None)
+
+    print(f"{'backend':8} {'load s':>8} {'tok/s':>8} {'peak RSS MB':>12} {'similar':>8}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['backend']:8} error: {result['error']}")
+            continue
+        agreement = similarity(reference, result['outputs']) if reference else float('nan')
+        print(f"{result['backend']:8} {result['loadSeconds']:8.1f} {result['tokensPerSecond']:8.1f} "
+              f"{result['peakRssMb']:12.0f} {agreement:8.0%}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
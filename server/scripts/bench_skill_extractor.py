@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for skill extraction over the seed job descriptions.
+
+Compares the old per-skill substring scan from linkedin_scraper.py (32
+skills, `skill in description.lower()`), the same scan over every spelling
+in the taxonomy, and the compiled SkillExtractor. It also reports how many
+of the old scan's hits the extractor rejects as partial words ("java" in
+"javascript"). --synthetic N adds N made-up skills to the taxonomy to show
+how each approach scales with taxonomy size.
+
+Usage:
+    python bench_skill_extractor.py [--repeat 5] [--synthetic 5000]
+"""
+import argparse
+import json
+import os
+import random
+import string
+import time
+
+from skill_extractor import SkillExtractor, load_taxonomy
+
+SEED_JOBS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'seed-jobs.json')
+
+# The list linkedin_scraper.py used to scan for
+COMMON_SKILLS = ["python", "javascript", "react", "node.js", "java", "c#", "sql", "nosql",
+                 "mongodb", "aws", "azure", "docker", "kubernetes", "git", "agile", "scrum",
+                 "typescript", "html", "css", "php", "ruby", "swift", "kotlin", "flutter",
+                 "angular", "vue.js", "django", "flask", "spring", ".net", "rest api", "graphql"]
+
+def substring_scan(skills):
+    def extract(text):
+        lower = text.lower()
+        return [skill for skill in skills if skill in lower]
+    return extract
+
+def synthetic_taxonomy(taxonomy, count, seed=0):
+    """A copy of taxonomy with count extra made-up skills, each with one alias."""
+    rng = random.Random(seed)
+    skills = dict(taxonomy['skills'])
+    while len(skills) < len(taxonomy['skills']) + count:
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        skills[name.title() + 'DB'] = [name + ' db']
+    return dict(taxonomy, skills=skills)
+
+def time_it(extract, descriptions, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in descriptions:
+            extract(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction over the seed job descriptions.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed passes per approach; the best is reported.")
+    parser.add_argument('--synthetic', type=int, default=5000, help="Made-up skills added for the scaling run.")
+    args = parser.parse_args()
+
+    with open(SEED_JOBS, encoding='utf-8') as f:
+        descriptions = [job['description'] for job in json.load(f) if isinstance(job.get('description'), str)]
+    chars = sum(len(text) for text in descriptions)
+    print(f"{len(descriptions)} descriptions, {chars / 1e6:.2f} M characters")
+
+    taxonomy = load_taxonomy()
+    big_taxonomy = synthetic_taxonomy(taxonomy, args.synthetic)
+    runs = []
+    for label, tax in (('taxonomy', taxonomy), (f'+{args.synthetic} synthetic', big_taxonomy)):
+        started = time.perf_counter()
+        extractor = SkillExtractor(tax)
+        build_ms = (time.perf_counter() - started) * 1000.0
+        spellings = sorted(set(extractor.aliases) | {spelling.lower() for spelling in extractor.exact})
+        runs.append((f'substring, {len(spellings)} spellings ({label})', substring_scan(spellings), None))
+        runs.append((f'compiled, {len(spellings)} spellings ({label})', extractor.extract, build_ms))
+    runs.insert(0, (f'substring, {len(COMMON_SKILLS)} skills (old)', substring_scan(COMMON_SKILLS), None))
+
+    print(f"{'approach':48} {'build ms':>9} {'total ms':>9} {'us/desc':>8}")
+    for label, extract, build_ms in runs:
+        seconds = time_it(extract, descriptions, args.repeat)
+        build = f"{build_ms:9.1f}" if build_ms is not None else f"{'-':>9}"
+        print(f"{label:48} {build} {seconds * 1000:9.1f} {seconds / len(descriptions) * 1e6:8.1f}")
+
+    # Old-scan hits the extractor rejects: the skill is not mentioned as a word of its own
+    extractor = SkillExtractor(taxonomy)
+    old = substring_scan(COMMON_SKILLS)
+    rejected = {}
+    for text in descriptions:
+        found = {skill.lower() for skill in extractor.extract(text)}
+        found |= {alias for alias, name in extractor.aliases.items() if name.lower() in found}
+        for skill in old(text):
+            if skill not in found:
+                rejected[skill] = rejected.get(skill, 0) + 1
+    total = sum(rejected.values())
+    print(f"old-scan hits rejected as partial words: {total}"
+          + (f" ({', '.join(f'{skill} x{count}' for skill, count in sorted(rejected.items(), key=lambda item: -item[1])[:8])})"
+             if total else ''))
+
+if __name__ == '__main__':
+    main()
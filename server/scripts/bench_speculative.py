@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Measures speculative decoding for the resume customizer on a fixed corpus.
+
+The target model is loaded once and, as in production, wrapped in a
+PrefixCachedGenerator unless RESUME_PREFIX_CACHE=0. The corpus is generated
+twice with the same seeds and sampling settings: once with plain decoding,
+once with the drafter. For each run the script reports wall time and
+tokens/s and the number of target-model forward passes. For the drafted
+run it also reports the acceptance rate: draft tokens the target accepted
+over draft tokens proposed. Both are read from transformers' candidate
+generator (the assistant model or prompt lookup), so the rate means the
+same thing for either drafter.
+
+Usage:
+    python bench_speculative.py --draft-model <id|prompt-lookup> [--backend int8] [--max-new-tokens 256]
+"""
+import argparse
+import sys
+import time
+
+from bench_resume_backends import SAMPLES
+from lazy_imports import lazy_import
+from prefix_cache import PrefixCachedGenerator
+from resume_backends import count_tokens, load_pipeline
+from resume_customizer_script import GENERATION_KWARGS, PREFIX_CACHE, PROMPT_PREFIX, build_prompt, model_id
+from speculative import draft_generation_kwargs
+
+torch = lazy_import("torch")
+candidate_generator = lazy_import("transformers.generation.candidate_generator")
+
+class ForwardCounter:
+    """Counts forward passes of a module through a forward hook."""
+
+    def __init__(self, module):
+        self.calls = 0
+        module.register_forward_hook(self._hook)
+
+    def _hook(self, module, inputs, output):
+        self.calls += 1
+
+class DraftCounter:
+    """
+    Counts draft tokens proposed and accepted during assisted generation by
+    wrapping the get_candidates() and update_candidate_strategy() methods of
+    transformers' candidate generators (assistant model and prompt lookup).
+    """
+
+    def __init__(self):
+        self.proposed = 0
+        self.accepted = 0
+        # A subclass method calling its parent's must only be counted once
+        self._depth = 0
+        base = candidate_generator.CandidateGenerator
+        for cls in vars(candidate_generator).values():
+            if isinstance(cls, type) and issubclass(cls, base) and cls is not base:
+                for name, count in (('get_candidates', self._count_proposed),
+                                    ('update_candidate_strategy', self._count_accepted)):
+                    if name in vars(cls):
+                        setattr(cls, name, self._wrap(vars(cls)[name], count))
+
+    def _wrap(self, method, count):
+        def counted(generator, input_ids, *args, **kwargs):
+            self._depth += 1
+            try:
+                result = method(generator, input_ids, *args, **kwargs)
+            finally:
+                self._depth -= 1
+            if self._depth == 0:
+                count(input_ids, result, *args, **kwargs)
+            return result
+        return counted
+
+    def _count_proposed(self, input_ids, result):
+        # get_candidates returns (candidate_ids, candidate_logits): the input plus the draft
+        self.proposed += result[0].shape[-1] - input_ids.shape[-1]
+
+    def _count_accepted(self, input_ids, result, scores=None, num_matches=0):
+        self.accepted += int(num_matches)
+
+    def reset(self):
+        self.proposed = self.accepted = 0
+
+def run_corpus(generator, generation_kwargs, target_counter, draft_counter, seed):
+    target_counter.calls = 0
+    draft_counter.reset()
+    tokens = 0
+    started = time.perf_counter()
+    for index, (job_post, resume) in enumerate(SAMPLES):
+        torch.manual_seed(seed + index)
+        text = generator(build_prompt(job_post, resume), **generation_kwargs)[0]['generated_text']
+        tokens += count_tokens(generator, text)
+    seconds = time.perf_counter() - started
+    return {
+        'seconds': seconds,
+        'tokens': tokens,
+        'tokensPerSecond': tokens / seconds if seconds else 0.0,
+        'targetCalls': target_counter.calls,
+        'draftProposed': draft_counter.proposed,
+        'draftAccepted': draft_counter.accepted
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speculative decoding for the resume customizer.")
+    parser.add_argument('--draft-model', required=True, help="Draft model id/path, or 'prompt-lookup'.")
+    parser.add_argument('--backend', choices=('auto', 'bnb4', 'int8'), default='auto')
+    parser.add_argument('--max-new-tokens', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = load_pipeline(args.backend, model_id)
+    if not hasattr(generator, 'model'):
+        print("Speculative decoding is benchmarked on the HF backends only.", file=sys.stderr)
+        return 1
+    speculative_kwargs = draft_generation_kwargs(args.draft_model, generator)
+    if PREFIX_CACHE:
+        # Benchmark the generator production serves, which starts each request from the cached prefix
+        generator = PrefixCachedGenerator(generator, PROMPT_PREFIX)
+
+    target_counter = ForwardCounter(generator.model)
+    draft_counter = DraftCounter()
+
+    # Same sampling settings as production, shorter outputs so the run finishes in reasonable time
+    generation_kwargs = dict(GENERATION_KWARGS, max_new_tokens=args.max_new_tokens)
+    baseline = run_corpus(generator, generation_kwargs, target_counter, draft_counter, args.seed)
+    speculative = run_corpus(generator, dict(generation_kwargs, **speculative_kwargs),
+                             target_counter, draft_counter, args.seed)
+
+    print(f"{'mode':12} {'seconds':>8} {'tokens':>7} {'tok/s':>7} {'target passes':>14}")
+    for name, result in (('plain', baseline), ('speculative', speculative)):
+        print(f"{name:12} {result['seconds']:8.1f} {result['tokens']:7d} {result['tokensPerSecond']:7.1f} "
+              f"{result['targetCalls']:14d}")
+    print(f"tokens per target pass: {speculative['tokens'] / max(speculative['targetCalls'], 1):.2f}")
+    if speculative['draftProposed']:
+        print(f"acceptance rate: {speculative['draftAccepted'] / speculative['draftProposed']:.0%} "
+              f"({speculative['draftAccepted']} of {speculative['draftProposed']} drafted tokens)")
+    else:
+        print("acceptance rate: no draft tokens were proposed")
+    # Sampled outputs differ in length between runs, so compare time per generated token
+    print(f"end-to-end speedup: {speculative['tokensPerSecond'] / max(baseline['tokensPerSecond'], 1e-9):.2f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Python entry points.
+
+Runs each script on its fallback path (invalid input, so no model is ever
+needed) under `python -X importtime`, and reports the wall time and total
+import time. It fails when:
+  - a heavy module (transformers, torch, ...) is imported on the fallback path,
+  - a run takes longer than --max-ms, or
+  - a run is more than --tolerance slower than the saved baseline.
+
+Usage:
+    python bench_startup.py                    # check against startup_baseline.json if present
+    python bench_startup.py --update-baseline  # record the current numbers as the baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(SCRIPTS_DIR, 'startup_baseline.json')
+
+# Entry point -> stdin that takes the invalid-input fallback path
+ENTRY_POINTS = {
+    'career_path_predictor.py': '{}',
+    'resume_customizer_script.py': '{"jobPost": "", "resume": ""}'
+}
+
+# Modules that must only be imported when inference really runs
+HEAVY_MODULES = ('transformers', 'torch', 'bitsandbytes', 'accelerate', 'onnxruntime', 'optimum', 'llama_cpp')
+
+def parse_importtime(stderr):
+    """Returns (total_import_us, top-level module names) from -X importtime output."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        # Lines look like "import time:       357 |        912 |   package.module"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|', 2)
+        total_us += int(self_us)
+        modules.add(name.strip().split('.')[0])
+    return total_us, modules
+
+def run_once(script, stdin_text):
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(SCRIPTS_DIR, script)],
+        input=stdin_text,
+        capture_output=True,
+        text=True,
+        cwd=SCRIPTS_DIR
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    import_us, modules = parse_importtime(process.stderr)
+    return elapsed_ms, import_us / 1000.0, modules
+
+def measure(script, stdin_text, runs):
+    wall_ms, import_ms, modules = [], [], set()
+    for _ in range(runs):
+        elapsed, imported, loaded = run_once(script, stdin_text)
+        wall_ms.append(elapsed)
+        import_ms.append(imported)
+        modules |= loaded
+    return {
+        'wallMs': statistics.median(wall_ms),
+        'importMs': statistics.median(import_ms),
+        'heavyModules': sorted(module for module in modules if module in HEAVY_MODULES)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold-start cost of the Python entry points.")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per entry point (the median is reported).")
+    parser.add_argument('--max-ms', type=float, default=1000.0, help="Hard limit on fallback-path wall time.")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline, as a fraction.")
+    parser.add_argument('--update-baseline', action='store_true', help="Write the measured numbers as the new baseline.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH) and not args.update_baseline:
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    for script, stdin_text in ENTRY_POINTS.items():
+        result = measure(script, stdin_text, args.runs)
+        results[script] = result
+        print(f"{script:32} wall {result['wallMs']:8.1f} ms   imports {result['importMs']:8.1f} ms")
+
+        if result['heavyModules']:
+            failures.append(f"{script} imports {', '.join(result['heavyModules'])} on the fallback path")
+        if result['wallMs'] > args.max_ms:
+            failures.append(f"{script} took {result['wallMs']:.1f} ms (limit {args.max_ms:.0f} ms)")
+        previous = baseline.get(script)
+        if previous and result['wallMs'] > previous['wallMs'] * (1 + args.tolerance):
+            failures.append(
+                f"{script} fallback path got slower: {result['wallMs']:.1f} ms vs baseline {previous['wallMs']:.1f} ms"
+            )
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {BASELINE_PATH}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Inference backends for the fine-tuned career model.
+
+  torch - the original fp32 PyTorch model
+  int8  - the same model with its Linear layers dynamically quantized to int8
+  onnx  - an ONNX Runtime graph exported with optimum
+
+All three come back as a text2text-generation pipeline, so callers do not
+care which one is running. The int8 and onnx variants are converted once and
+written next to the model:
+
+    python career_backends.py export --backend onnx
+    python career_backends.py export --backend int8
+"""
+import argparse
+import os
+import sys
+
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'finetuned_resume_model')
+
+BACKENDS = ('torch', 'int8', 'onnx')
+
+# File the int8 backend saves the state_dict of its quantized module to; exports from before it
+# pickled the whole module (model_int8.pt) and have to be redone
+INT8_WEIGHTS = 'model_int8_state.pt'
+
+def backend_model_path(backend, model_path=MODEL_PATH):
+    """Where a backend's model lives: the original directory, or its converted sibling."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    if backend == 'torch':
+        return model_path
+    return os.path.normpath(model_path) + f'-{backend}'
+
+def _quantize(model):
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _load_int8(path):
+    """
+    Rebuilds the quantized module from the export's config and loads its saved state_dict.
+
+    Dynamically quantized modules are not loadable through from_pretrained, so the
+    architecture is quantized again (randomly initialized, then overwritten) to get the
+    same modules, and the weights are read with weights_only=True: no pickled code runs.
+    """
+    weights_path = os.path.join(path, INT8_WEIGHTS)
+    if not os.path.exists(weights_path):
+        raise FileNotFoundError(
+            f"No int8 weights at {weights_path}. Run: python career_backends.py export --backend int8"
+        )
+    model = _quantize(transformers.AutoModelForSeq2SeqLM.from_config(transformers.AutoConfig.from_pretrained(path)))
+    model.load_state_dict(torch.load(weights_path, weights_only=True))
+    model.generation_config = transformers.GenerationConfig.from_pretrained(path)
+    model.eval()
+    return model
+
+def load_pipeline(backend, model_path=MODEL_PATH):
+    """Loads the career model with the given backend as a text2text-generation pipeline."""
+    path = backend_model_path(backend, model_path)
+    if not os.path.exists(path):
+        if backend == 'torch':
+            raise FileNotFoundError(f"Model not found at {path}. Please ensure the model is properly installed.")
+        raise FileNotFoundError(
+            f"No {backend} export found at {path}. Run: python career_backends.py export --backend {backend}"
+        )
+
+    if backend == 'torch':
+        return transformers.pipeline('text2text-generation', model=path)
+
+    tokenizer = transformers.AutoTokenizer.from_pretrained(path)
+    if backend == 'int8':
+        model = _load_int8(path)
+    else:
+        optimum_onnx = lazy_import("optimum.onnxruntime")
+        model = optimum_onnx.ORTModelForSeq2SeqLM.from_pretrained(path)
+
+    return transformers.pipeline('text2text-generation', model=model, tokenizer=tokenizer)
+
+def export_backend(backend, model_path=MODEL_PATH):
+    """Converts the fp32 model for the given backend and writes it next to the original."""
+    if backend == 'torch':
+        print("The torch backend uses the model as-is; nothing to export.", file=sys.stderr)
+        return model_path
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}. Please ensure the model is properly installed.")
+
+    output_path = backend_model_path(backend, model_path)
+    os.makedirs(output_path, exist_ok=True)
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_path)
+
+    if backend == 'int8':
+        model = transformers.AutoModelForSeq2SeqLM.from_pretrained(model_path)
+        model.eval()
+        torch.save(_quantize(model).state_dict(), os.path.join(output_path, INT8_WEIGHTS))
+        # The loader rebuilds the architecture from these
+        model.config.save_pretrained(output_path)
+        model.generation_config.save_pretrained(output_path)
+    else:
+        optimum_onnx = lazy_import("optimum.onnxruntime")
+        model = optimum_onnx.ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True)
+        model.save_pretrained(output_path)
+
+    tokenizer.save_pretrained(output_path)
+    print(f"Exported {backend} backend to {output_path}", file=sys.stderr)
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the career model for an alternative inference backend.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="Write a converted copy of the model next to the original.")
+    export_parser.add_argument('--backend', choices=BACKENDS, required=True)
+    export_parser.add_argument('--model-path', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    try:
+        export_backend(args.backend, args.model_path)
+    except Exception as e:
+        print(f"Error exporting {args.backend} backend: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import json
+import os
+import sys
+import time
+
+from career_path_predictor import GenerationBudget, generate_career_paths, validate_request
+
+class BatchCheckpoint:
+    """
+    Records how far a batch run got: the input byte offset fully processed and
+    the output size at that point. Written atomically after every batch, so a
+    crashed run resumes exactly where the last completed batch ended.
+    """
+
+    def __init__(self, path, input_path):
+        self.path = path
+        self.input_path = os.path.abspath(input_path)
+        self.input_offset = 0
+        self.output_offset = 0
+        self.rows = 0
+
+    def load(self):
+        """Loads a checkpoint left for the same input file; returns False if there is none."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('inputPath') != self.input_path:
+            return False
+        self.input_offset = state['inputOffset']
+        self.output_offset = state['outputOffset']
+        self.rows = state['rows']
+        return True
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'inputPath': self.input_path,
+                'inputOffset': self.input_offset,
+                'outputOffset': self.output_offset,
+                'rows': self.rows
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _answer_rows(rows):
+    """Generates results for one batch of input rows, in order."""
+    results = [None] * len(rows)
+    valid = []
+    for index, row in enumerate(rows):
+        if isinstance(row, Exception):
+            results[index] = {'userId': None, 'status': 'error', 'result': {'error': f"Invalid JSON row: {str(row)}"}}
+            continue
+        invalid_response = validate_request(row)
+        if invalid_response is not None:
+            results[index] = {'userId': row.get('userId') if isinstance(row, dict) else None,
+                              'status': 'error', 'result': invalid_response}
+        else:
+            valid.append(index)
+
+    if valid:
+        generated = generate_career_paths([(rows[i]['skills'], rows[i]['role']) for i in valid],
+                                          [GenerationBudget.from_request(rows[i]) for i in valid])
+        for index, (result, exit_code) in zip(valid, generated):
+            results[index] = {
+                'userId': rows[index].get('userId'),
+                'status': 'ok' if exit_code == 0 else 'error',
+                'result': result
+            }
+    return results
+
+def run_batch(input_path, output_path, batch_size=16, checkpoint_path=None, resume=True, progress_seconds=10.0):
+    """
+    Generates career paths for every {skills, role, userId} row of a JSONL file.
+
+    Rows are read and answered batch_size at a time and appended to
+    output_path, so memory stays flat however long the input is. After each
+    batch the checkpoint is updated; rerunning the same command after a crash
+    continues from the last completed batch.
+
+    Returns:
+        The number of rows written by this run.
+    """
+    checkpoint = BatchCheckpoint(checkpoint_path or output_path + '.checkpoint', input_path)
+    resumed = resume and checkpoint.load()
+    input_size = os.path.getsize(input_path)
+
+    with open(input_path, 'rb') as source, open(output_path, 'ab' if resumed else 'wb') as sink:
+        if resumed:
+            # Drop anything written after the last checkpoint, then carry on from there
+            sink.truncate(checkpoint.output_offset)
+            sink.seek(checkpoint.output_offset)
+            source.seek(checkpoint.input_offset)
+            print(f"Debug: Resuming at row {checkpoint.rows} (byte {checkpoint.input_offset})", file=sys.stderr)
+
+        started = time.monotonic()
+        last_report = started
+        rows_this_run = 0
+        offset = checkpoint.input_offset
+
+        while True:
+            rows = []
+            while len(rows) < batch_size:
+                line = source.readline()
+                if not line:
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    rows.append(e)
+            if not rows:
+                break
+
+            for result in _answer_rows(rows):
+                sink.write((json.dumps(result) + '\n').encode('utf-8'))
+            sink.flush()
+            os.fsync(sink.fileno())
+
+            rows_this_run += len(rows)
+            checkpoint.rows += len(rows)
+            checkpoint.input_offset = offset
+            checkpoint.output_offset = sink.tell()
+            checkpoint.save()
+
+            now = time.monotonic()
+            if now - last_report >= progress_seconds:
+                last_report = now
+                rate = rows_this_run / (now - started)
+                print(json.dumps({
+                    'event': 'progress',
+                    'rows': checkpoint.rows,
+                    'percent': round(100.0 * offset / input_size, 1) if input_size else 100.0,
+                    'rowsPerSecond': round(rate, 2)
+                }), file=sys.stderr)
+
+    elapsed = time.monotonic() - started
+    print(json.dumps({
+        'event': 'done',
+        'rows': checkpoint.rows,
+        'rowsThisRun': rows_this_run,
+        'seconds': round(elapsed, 2),
+        'rowsPerSecond': round(rows_this_run / elapsed, 2) if elapsed else 0.0
+    }), file=sys.stderr)
+    checkpoint.clear()
+    return rows_this_run
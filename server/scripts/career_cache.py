@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_skills(skills):
+    """Lowercases, trims, de-duplicates and sorts a skill list so equivalent inputs share a key."""
+    return sorted({' '.join(str(skill).lower().split()) for skill in skills if str(skill).strip()})
+
+def normalize_role(role):
+    return ' '.join(str(role).lower().split())
+
+def make_cache_key(skills, role, model_path, generation_kwargs):
+    """Builds a content-addressed key from everything that determines a prediction."""
+    payload = json.dumps({
+        'skills': normalize_skills(skills),
+        'role': normalize_role(role),
+        'model': os.path.normpath(os.path.abspath(model_path)),
+        'generation': generation_kwargs
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class CareerPathCache:
+    """
+    Two-tier result cache for career-path predictions.
+
+    An in-memory LRU sits in front of an optional SQLite file. Entries in
+    either tier expire ttl_seconds after they were stored, and the least
+    recently used disk entries are evicted once the file holds more than
+    max_disk_entries. Values are stored as
+    JSON text, so every hit hands back a fresh copy the caller can modify.
+    """
+
+    def __init__(self, max_memory_entries=1024, db_path=None, ttl_seconds=7 * 24 * 3600, max_disk_entries=100000,
+                 table='career_paths'):
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        # Lets other JSON results (e.g. job digests) share the same two-tier cache code
+        self.table = table
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.counters = {
+            'memoryHits': 0,
+            'diskHits': 0,
+            'misses': 0,
+            'memoryEvictions': 0,
+            'diskEvictions': 0,
+            'expired': 0
+        }
+
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._db.execute(f'CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)')
+            self._db.commit()
+
+    def get(self, key):
+        """Returns the cached response for key, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if self._expired(created, time.time()):
+                    del self._memory[key]
+                    self.counters['expired'] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.counters['memoryHits'] += 1
+                    return json.loads(value)
+
+            row = self._disk_get(key)
+            if row is not None:
+                self.counters['diskHits'] += 1
+                self._memory_put(key, *row)
+                return json.loads(row[0])
+
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, key, response):
+        value = json.dumps(response)
+        with self._lock:
+            now = time.time()
+            self._memory_put(key, value, now)
+            self._disk_put(key, value, now)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memoryEntries'] = len(self._memory)
+            if self._db is not None:
+                stats['diskEntries'] = self._db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+            return stats
+
+    def _expired(self, created, now):
+        return bool(self.ttl_seconds) and now - created > self.ttl_seconds
+
+    def _memory_put(self, key, value, created):
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters['memoryEvictions'] += 1
+
+    def _disk_get(self, key):
+        """Returns (value, created) for a live disk entry, or None."""
+        if self._db is None:
+            return None
+        row = self._db.execute(f'SELECT value, created FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        value, created = row
+        if self._expired(created, now):
+            self._db.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+            self._db.commit()
+            self.counters['expired'] += 1
+            return None
+
+        self._db.execute(f'UPDATE {self.table} SET accessed = ? WHERE key = ?', (now, key))
+        self._db.commit()
+        return value, created
+
+    def _disk_put(self, key, value, now):
+        if self._db is None:
+            return
+        self._db.execute(
+            f'INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+            (key, value, now, now)
+        )
+
+        if self.ttl_seconds:
+            expired = self._db.execute(f'DELETE FROM {self.table} WHERE created < ?', (now - self.ttl_seconds,)).rowcount
+            self.counters['expired'] += max(expired, 0)
+
+        overflow = self._db.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0] - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                f'DELETE FROM {self.table} WHERE key IN '
+                f'(SELECT key FROM {self.table} ORDER BY accessed ASC LIMIT ?)',
+                (overflow,)
+            )
+            self.counters['diskEvictions'] += overflow
+        self._db.commit()
+
+def cache_from_env():
+    """
+    Builds the cache from environment variables:
+    CAREER_CACHE_SIZE (in-memory entries, 0 disables the memory tier),
+    CAREER_CACHE_DB (SQLite path, unset keeps the cache memory-only),
+    CAREER_CACHE_TTL (seconds) and CAREER_CACHE_DISK_ENTRIES.
+    """
+    try:
+        return CareerPathCache(
+            max_memory_entries=int(os.environ.get('CAREER_CACHE_SIZE', 1024)),
+            db_path=os.environ.get('CAREER_CACHE_DB') or None,
+            ttl_seconds=float(os.environ.get('CAREER_CACHE_TTL', 7 * 24 * 3600)),
+            max_disk_entries=int(os.environ.get('CAREER_CACHE_DISK_ENTRIES', 100000))
+        )
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Debug: Career cache disabled: {e}", file=sys.stderr)
+        return CareerPathCache(max_memory_entries=0)
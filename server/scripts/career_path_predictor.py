@@ -1,37 +1,141 @@
+import argparse
 import json
 import sys
 import os
-from transformers import pipeline
+import threading
+import time
+from career_backends import BACKENDS, backend_model_path, load_pipeline
+from career_cache import cache_from_env, make_cache_key
+from role_skill_index import RoleSkillIndex
+from lazy_imports import lazy_import
 
-def predict_career_path(current_skills, target_role):
+transformers = lazy_import("transformers")
+torch = lazy_import("torch")
+
+# Inference backend: 'torch' (fp32), 'int8' (dynamic quantization) or 'onnx' (ONNX Runtime).
+# The model libraries are only imported when a request actually reaches the model,
+# so cache hits and invalid requests never pay for them.
+BACKEND = os.environ.get('CAREER_MODEL_BACKEND', 'torch')
+
+# Schema-constrained decoding: only let the model emit tokens that keep its output
+# a valid CareerPathResponse JSON document, and stop once the object closes
+CONSTRAINED_DECODING = os.environ.get('CAREER_CONSTRAINED_DECODING', '').lower() in ('1', 'true', 'yes')
+
+# Decoded vocabulary for the constrained decoder, built on first use
+json_token_table = None
+
+# Role/skill index used to rank missing skills, opened on first use. Built from the
+# scraped postings (python role_skill_index.py build); CAREER_ROLE_INDEX=0 turns it off.
+USE_ROLE_INDEX = os.environ.get('CAREER_ROLE_INDEX', '1').lower() not in ('0', 'false', 'no')
+role_skill_index = None
+
+# Indexed roles whose titles cover less of the target role than this are not pooled
+ROLE_MATCH_THRESHOLD = 0.75
+
+# Targets backed by fewer pooled postings than this fall back to the built-in role
+# categories: one posting's skill list is an anecdote, not a requirement
+ROLE_MIN_POSTINGS = int(os.environ.get('CAREER_ROLE_MIN_POSTINGS', '2'))
+
+# Latency budget ceilings. A request may ask for a tighter budget with deadlineMs /
+# maxNewTokens, but never a looser one. CAREER_DEADLINE_MS=0 means no deadline.
+MAX_NEW_TOKENS = int(os.environ.get('CAREER_MAX_NEW_TOKENS', '512'))
+DEFAULT_DEADLINE_MS = float(os.environ.get('CAREER_DEADLINE_MS', '0'))
+
+# Global variable to hold the text2text pipeline so a long-running worker
+# only pays the model load once
+generator = None
+
+# A failed model load is remembered so the requests that follow get the same error
+# at once instead of each retrying the full load. The retry delay doubles after every
+# failure, from CAREER_LOAD_RETRY_SECONDS up to CAREER_LOAD_RETRY_MAX_SECONDS.
+LOAD_RETRY_SECONDS = float(os.environ.get('CAREER_LOAD_RETRY_SECONDS', '30'))
+LOAD_RETRY_MAX_SECONDS = float(os.environ.get('CAREER_LOAD_RETRY_MAX_SECONDS', '600'))
+load_error = None
+load_failures = 0
+load_retry_at = 0.0
+
+# Result cache shared by every request this process serves
+result_cache = None
+
+def get_result_cache():
+    global result_cache
+    if result_cache is None:
+        result_cache = cache_from_env()
+    return result_cache
+
+def configure_backend(backend):
+    """Selects the inference backend; must be called before the model is loaded."""
+    global BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    if generator is not None and backend != BACKEND:
+        raise RuntimeError("The career model is already loaded; choose the backend at startup.")
+    BACKEND = backend
+
+def load_generator():
+    """
+    Loads the fine-tuned career model into a text2text generation pipeline (once per process).
+
+    After a failed load the same exception is raised again without touching the
+    model until the retry delay has passed.
+    """
+    global generator, load_error, load_failures, load_retry_at
+    if generator is not None:
+        return generator
+    if load_error is not None and time.monotonic() < load_retry_at:
+        raise load_error
+
+    print(f"Debug: Loading career model with the {BACKEND} backend...", file=sys.stderr)
     try:
-        # Use a relative path for the model
-        model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'finetuned_resume_model')
-        
-        # Check if model exists
-        if not os.path.exists(model_path):
-            raise Exception(f"Model not found at {model_path}. Please ensure the model is properly installed.")
-            
+        generator = load_pipeline(BACKEND)
+    except Exception as e:
+        delay = min(LOAD_RETRY_SECONDS * 2 ** load_failures, LOAD_RETRY_MAX_SECONDS)
+        load_error, load_failures, load_retry_at = e, load_failures + 1, time.monotonic() + delay
+        print(f"Debug: Career model load failed, retrying in {delay:.0f}s: {e}", file=sys.stderr)
+        raise
+    load_error, load_failures = None, 0
+    print("Debug: Career model loaded.", file=sys.stderr)
+    return generator
+
+def configure_constrained_decoding(enabled):
+    global CONSTRAINED_DECODING
+    CONSTRAINED_DECODING = enabled
+
+def constrained_logits_processor(tokenizer):
+    """
+    Returns a schema-constrained logits processor, or None if the tokenizer cannot
+    spell JSON even with stand-ins for the brackets it lacks (as T5 lacks '{' and '}').
+    """
+    global json_token_table, CONSTRAINED_DECODING
+    from json_constraint import CAREER_PATH_SCHEMA, JsonSchemaLogitsProcessor, JsonTokenTable
+
+    if json_token_table is None:
         try:
-            generator = pipeline('text2text-generation', model=model_path)
-        except Exception as model_error:
-            print(json.dumps({
-                'error': f"Failed to load model: {str(model_error)}",
-                'title': f"Path to {target_role}",
-                'steps': [{
-                    'year': 2024,
-                    'title': 'Getting Started',
-                    'description': 'Begin your journey by focusing on fundamental skills.',
-                    'skills': current_skills,
-                    'resources': []
-                }],
-                'missingSkills': [],
-                'learningModules': []
-            }))
-            return 1
-        
-        # Create a prompt for the LLM
-        prompt = f"""
+            json_token_table = JsonTokenTable(tokenizer)
+        except ValueError as e:
+            print(f"Debug: Constrained decoding disabled: {e}", file=sys.stderr)
+            CONSTRAINED_DECODING = False
+            return None
+        for char, alias in json_token_table.aliases.items():
+            print(f"Debug: Tokenizer has no '{char}'; constrained decoding spells it '{alias}'.", file=sys.stderr)
+    return JsonSchemaLogitsProcessor(json_token_table, CAREER_PATH_SCHEMA)
+
+def configure_budget(max_new_tokens, deadline_ms):
+    """Sets the server-wide token ceiling and default deadline (0 disables the deadline)."""
+    global MAX_NEW_TOKENS, DEFAULT_DEADLINE_MS
+    if max_new_tokens <= 0 or deadline_ms < 0:
+        raise ValueError("max_new_tokens must be positive and deadline_ms must not be negative")
+    MAX_NEW_TOKENS = max_new_tokens
+    DEFAULT_DEADLINE_MS = deadline_ms
+    GENERATION_KWARGS['max_new_tokens'] = max_new_tokens
+
+def generation_settings():
+    """Everything that changes the generated text, for the result-cache key."""
+    return dict(GENERATION_KWARGS, constrained=CONSTRAINED_DECODING)
+
+def build_prompt(current_skills, target_role):
+    # Create a prompt for the LLM
+    return f"""
         Analyze the career path from current skills to target role:
         
         Current Skills: {', '.join(current_skills)}
@@ -48,52 +152,435 @@ def predict_career_path(current_skills, target_role):
         - steps: list of career steps with year, title, description, skills, and resources
         - learningModules: list of suggested learning resources
         """
-        
-        # Generate the career path with improved parameters
+
+# Generation parameters shared by single and batched requests
+GENERATION_KWARGS = {
+    'max_new_tokens': MAX_NEW_TOKENS,
+    'num_return_sequences': 1,
+    'no_repeat_ngram_size': 3,
+    'temperature': 0.7,
+    'do_sample': True
+}
+
+class GenerationBudget:
+    """
+    A request's latency budget: an absolute time.monotonic() deadline (or None)
+    and a cap on newly generated tokens. Both are clamped to the server ceilings.
+    """
+
+    def __init__(self, deadline=None, max_new_tokens=None):
+        self.deadline = deadline
+        self.max_new_tokens = min(int(max_new_tokens), MAX_NEW_TOKENS) if max_new_tokens else MAX_NEW_TOKENS
+
+    @classmethod
+    def from_request(cls, request, received_at=None):
+        """Reads deadlineMs / maxNewTokens from a request; the deadline counts from received_at."""
+        received_at = time.monotonic() if received_at is None else received_at
+        deadline_ms = request.get('deadlineMs') or DEFAULT_DEADLINE_MS
+        if DEFAULT_DEADLINE_MS:
+            deadline_ms = min(deadline_ms, DEFAULT_DEADLINE_MS)
+        return cls(received_at + deadline_ms / 1000.0 if deadline_ms else None, request.get('maxNewTokens'))
+
+    def expired(self, now=None):
+        return self.deadline is not None and (time.monotonic() if now is None else now) >= self.deadline
+
+    @property
+    def truncates(self):
+        """True if the request asked for fewer tokens than a normal (cacheable) answer gets."""
+        return self.max_new_tokens < MAX_NEW_TOKENS
+
+class BudgetStoppingCriteria:
+    """
+    Stops each row of a batch as soon as its own deadline passes or it reaches
+    its own token cap, so one tight budget neither holds up nor cuts short the
+    other requests generated alongside it. generate() checks it after every
+    decoding step, which bounds a deadline overrun to a single step.
+    """
+
+    def __init__(self, budgets, finished_token_ids=()):
+        self.budgets = budgets
+        self.finished_token_ids = {token_id for token_id in finished_token_ids if token_id is not None}
+        self.start_length = None
+        self.timed_out = [False] * len(budgets)
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.start_length is None:
+            # First call comes right after the first new token
+            self.start_length = input_ids.shape[-1] - 1
+        generated = input_ids.shape[-1] - self.start_length
+        now = time.monotonic()
+        done = []
+        for row, budget in enumerate(self.budgets):
+            if input_ids[row, -1].item() in self.finished_token_ids:
+                # The row already ended on its own; it only gets padded from here
+                done.append(True)
+                continue
+            if budget.expired(now):
+                self.timed_out[row] = True
+            done.append(self.timed_out[row] or generated >= budget.max_new_tokens)
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+def generate_career_path(current_skills, target_role, budget=None):
+    """
+    Generates a career path for the given skills and role.
+
+    Args:
+        current_skills: List of skills the user already has.
+        target_role: The role the user is aiming for.
+        budget: Optional GenerationBudget limiting wall-clock time and new tokens.
+
+    Returns:
+        A (response, exit_code) tuple. On failure the response still carries a
+        usable fallback path plus an 'error' field, and exit_code is 1.
+    """
+    return generate_career_paths([(current_skills, target_role)], [budget] if budget else None)[0]
+
+def generate_career_paths(requests, budgets=None):
+    """
+    Generates career paths for several (current_skills, target_role) pairs in
+    one padded batch, so the pipeline runs a single forward pass per step
+    instead of one per request.
+
+    Requests already answered for the same normalized skills and role are
+    served from the result cache without touching the model. Requests whose
+    deadline has passed, before or during generation, get the deterministic
+    fallback path instead. Every response says which path served it in
+    'servedBy' ('cache', 'model' or 'fallback').
+
+    Returns:
+        A list of (response, exit_code) tuples in the same order as requests.
+    """
+    budgets = budgets or [None] * len(requests)
+    budgets = [budget or GenerationBudget() for budget in budgets]
+    cache = get_result_cache()
+    keys = [make_cache_key(current_skills, target_role, backend_model_path(BACKEND), generation_settings())
+            for current_skills, target_role in requests]
+    results = [None] * len(requests)
+    # Map each missed key to the requests waiting on it, so duplicates in a batch generate once
+    misses = {}
+    for index, key in enumerate(keys):
+        if key not in misses:
+            cached = cache.get(key)
+            if cached is not None:
+                cached['servedBy'] = 'cache'
+                results[index] = (cached, 0)
+                continue
+        if budgets[index].expired():
+            # Already out of time (e.g. it waited in the queue too long); don't start the model
+            results[index] = (fallback_response(*requests[index]), 0)
+            continue
+        misses.setdefault(key, []).append(index)
+
+    if misses:
+        # Duplicates share one generation, under the most generous of their budgets
+        batch_budgets = [max((budgets[i] for i in indices), key=_budget_sort_key) for indices in misses.values()]
+        generated = _generate_uncached([requests[indices[0]] for indices in misses.values()], batch_budgets)
+        for (key, indices), budget, (response, exit_code) in zip(misses.items(), batch_budgets, generated):
+            # Only complete model answers are cached; failures should be retried next time
+            if exit_code == 0 and response['servedBy'] == 'model' and not budget.truncates:
+                cache.put(key, response)
+            for index in indices:
+                results[index] = (json.loads(json.dumps(response)) if index != indices[0] else response, exit_code)
+    return results
+
+def _budget_sort_key(budget):
+    return (budget.deadline is None, budget.deadline or 0.0, budget.max_new_tokens)
+
+def fallback_response(current_skills, target_role):
+    """The deterministic path served when the model cannot answer within the request's budget."""
+    return {
+        'title': f"Path to {target_role}",
+        'query': target_role,
+        'missingSkills': extract_missing_skills('', current_skills, target_role),
+        'steps': create_fallback_steps(current_skills, target_role),
+        'learningModules': extract_learning_modules(''),
+        'servedBy': 'fallback'
+    }
+
+def error_response(message, current_skills, target_role, steps=None):
+    """An error reply that still carries a usable path for the UI to show."""
+    return {
+        'error': message,
+        'title': f"Path to {target_role}",
+        'steps': steps if steps is not None else create_fallback_steps(current_skills, target_role),
+        'missingSkills': [],
+        'learningModules': [],
+        'servedBy': 'fallback'
+    }
+
+def model_load_error_response(model_error, current_skills, target_role):
+    return error_response(f"Failed to load model: {str(model_error)}", current_skills, target_role, steps=[{
+        'year': 2024,
+        'title': 'Getting Started',
+        'description': 'Begin your journey by focusing on fundamental skills.',
+        'skills': current_skills,
+        'resources': []
+    }])
+
+def _generation_kwargs(text_generator, budgets):
+    """
+    Returns (generate kwargs, constrained logits processor or None, budget
+    stopping criteria) for the loaded pipeline and one budget per prompt.
+    """
+    generation_kwargs = dict(GENERATION_KWARGS)
+    # generate() takes a single token limit; tighter per-request caps are enforced by the criteria
+    generation_kwargs['max_new_tokens'] = max(budget.max_new_tokens for budget in budgets)
+    processor = constrained_logits_processor(text_generator.tokenizer) if CONSTRAINED_DECODING else None
+    if processor is not None:
+        # JSON legitimately repeats n-grams like '"}, {"', so the n-gram ban has to go
+        generation_kwargs.pop('no_repeat_ngram_size', None)
+        generation_kwargs['logits_processor'] = transformers.LogitsProcessorList([processor])
+    tokenizer = text_generator.tokenizer
+    criteria = BudgetStoppingCriteria(budgets, (tokenizer.eos_token_id, tokenizer.pad_token_id))
+    generation_kwargs['stopping_criteria'] = transformers.StoppingCriteriaList([criteria])
+    return generation_kwargs, processor, criteria
+
+def _generate_uncached(requests, budgets):
+    try:
         try:
-            generated_text = generator(
-                prompt,
-                max_length=1000,
-                num_return_sequences=1,
-                no_repeat_ngram_size=3,
-                temperature=0.7,
-                do_sample=True
-            )[0]['generated_text']
-        except Exception as gen_error:
-            print(json.dumps({
-                'error': f"Text generation failed: {str(gen_error)}",
-                'title': f"Path to {target_role}",
-                'steps': create_fallback_steps(current_skills, target_role),
-                'missingSkills': [],
-                'learningModules': []
-            }))
-            return 1
+            text_generator = load_generator()
+        except FileNotFoundError:
+            raise
+        except Exception as model_error:
+            return [(model_load_error_response(model_error, current_skills, target_role), 1)
+                    for current_skills, target_role in requests]
+
+        prompts = [build_prompt(current_skills, target_role) for current_skills, target_role in requests]
         
-        # Parse the generated text as JSON
+        generation_kwargs, processor, criteria = _generation_kwargs(text_generator, budgets)
+        if processor is not None:
+            generation_kwargs['clean_up_tokenization_spaces'] = False
+
+        # Generate the career paths with improved parameters
         try:
-            response = json.loads(generated_text)
-        except json.JSONDecodeError:
-            # If the model doesn't return valid JSON, create a structured response
-            response = {
-                "title": f"Path to {target_role}",
-                "query": target_role,
-                "missingSkills": extract_missing_skills(generated_text, current_skills, target_role),
-                "steps": extract_steps(generated_text, current_skills, target_role),
-                "learningModules": extract_learning_modules(generated_text)
-            }
+            outputs = text_generator(prompts, batch_size=len(prompts), **generation_kwargs)
+        except Exception as gen_error:
+            return [(error_response(f"Text generation failed: {str(gen_error)}", current_skills, target_role), 1)
+                    for current_skills, target_role in requests]
         
-        print(json.dumps(response))
-        return 0
+        results = []
+        for row, ((current_skills, target_role), output) in enumerate(zip(requests, outputs)):
+            if criteria.timed_out[row]:
+                print(f"Debug: Deadline passed while generating for '{target_role}'; serving the fallback path.",
+                      file=sys.stderr)
+                results.append((fallback_response(current_skills, target_role), 0))
+                continue
+            # The pipeline returns one list of sequences per prompt unless it can flatten them
+            if isinstance(output, list):
+                output = output[0]
+            generated_text = output['generated_text']
+            if processor is not None:
+                # Put back any brackets the vocabulary had to spell with stand-ins
+                generated_text = processor.decoder().feed(generated_text)
+            response = parse_generated_text(generated_text, current_skills, target_role)
+            if processor is not None:
+                # The schema leaves out 'query', which is just the requested role
+                response.setdefault('query', target_role)
+            response['servedBy'] = 'model'
+            results.append((response, 0))
+        return results
         
     except Exception as e:
-        print(json.dumps({
-            'error': str(e),
-            'title': f"Path to {target_role}",
-            'steps': create_fallback_steps(current_skills, target_role),
+        return [(error_response(str(e), current_skills, target_role), 1) for current_skills, target_role in requests]
+
+class StepExtractor:
+    """Pulls each completed entry of the "steps" array out of partially generated JSON."""
+
+    def __init__(self):
+        self.text = ''
+        self.position = None
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = None
+        self.finished = False
+
+    def feed(self, chunk):
+        """Adds generated text and returns the steps completed by it."""
+        self.text += chunk
+        if self.finished:
+            return []
+
+        if self.position is None:
+            key = self.text.find('"steps"')
+            bracket = self.text.find('[', key) if key != -1 else -1
+            if bracket == -1:
+                return []
+            self.position = bracket + 1
+
+        steps = []
+        while self.position < len(self.text):
+            char = self.text[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                if self.depth == 0:
+                    self.start = self.position
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0 and self.start is not None:
+                    try:
+                        steps.append(json.loads(self.text[self.start:self.position + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self.start = None
+            elif char == ']' and self.depth == 0:
+                self.finished = True
+                break
+            self.position += 1
+        return steps
+
+def stream_career_path(current_skills, target_role, emit, budget=None):
+    """
+    Generates a career path while reporting progress through emit(event).
+
+    Emits {'event': 'token', 'text': ...} for each decoded chunk and
+    {'event': 'step', 'index': n, 'step': {...}} as soon as an entry of the
+    steps array is complete, then a final {'event': 'summary', ...} carrying
+    the full response and timings. If the budget's deadline passes first,
+    generation stops and the summary carries the fallback path instead.
+
+    Returns:
+        The exit code (0 on success, 1 if the response is an error fallback).
+    """
+    started = time.monotonic()
+    budget = budget or GenerationBudget()
+
+    def summary(response, exit_code, first_token_at=None, cached=False):
+        emit({
+            'event': 'summary',
+            'status': 'ok' if exit_code == 0 else 'error',
+            'cached': cached,
+            'result': response,
+            'timings': {
+                'firstTokenMs': round((first_token_at - started) * 1000.0, 2) if first_token_at else None,
+                'totalMs': round((time.monotonic() - started) * 1000.0, 2)
+            }
+        })
+        return exit_code
+
+    cache = get_result_cache()
+    key = make_cache_key(current_skills, target_role, backend_model_path(BACKEND), generation_settings())
+    cached = cache.get(key)
+    if cached is not None:
+        cached['servedBy'] = 'cache'
+        for index, step in enumerate(cached.get('steps', [])):
+            emit({'event': 'step', 'index': index, 'step': step})
+        return summary(cached, 0, cached=True)
+    if budget.expired():
+        return summary(fallback_response(current_skills, target_role), 0)
+
+    try:
+        text_generator = load_generator()
+    except FileNotFoundError as e:
+        return summary(error_response(str(e), current_skills, target_role), 1)
+    except Exception as model_error:
+        return summary(model_load_error_response(model_error, current_skills, target_role), 1)
+
+    tokenizer = text_generator.tokenizer
+    generation_kwargs, processor, criteria = _generation_kwargs(text_generator, [budget])
+    streamer = transformers.TextIteratorStreamer(
+        tokenizer, skip_prompt=True, skip_special_tokens=True, clean_up_tokenization_spaces=processor is None
+    )
+    inputs = tokenizer(build_prompt(current_skills, target_role), return_tensors='pt')
+    # The tokenizer returns CPU tensors; generate() needs them where the model's weights are
+    inputs = {k: v.to(text_generator.model.device) for k, v in inputs.items()}
+    errors = []
+
+    def run_generation():
+        try:
+            text_generator.model.generate(**inputs, streamer=streamer, **generation_kwargs)
+        except Exception as gen_error:
+            errors.append(gen_error)
+            # Unblock the consumer loop below
+            streamer.end()
+
+    thread = threading.Thread(target=run_generation, daemon=True)
+    thread.start()
+
+    generated_text = ''
+    first_token_at = None
+    extractor = StepExtractor()
+    decoder = processor.decoder() if processor is not None else None
+    step_count = 0
+    for chunk in streamer:
+        if not chunk:
+            continue
+        if decoder is not None:
+            chunk = decoder.feed(chunk)
+        if first_token_at is None:
+            first_token_at = time.monotonic()
+        generated_text += chunk
+        emit({'event': 'token', 'text': chunk})
+        for step in extractor.feed(chunk):
+            emit({'event': 'step', 'index': step_count, 'step': step})
+            step_count += 1
+    thread.join()
+
+    if errors:
+        return summary(error_response(f"Text generation failed: {str(errors[0])}", current_skills, target_role),
+                       1, first_token_at)
+
+    if criteria.timed_out[0]:
+        return summary(fallback_response(current_skills, target_role), 0, first_token_at)
+
+    response = parse_generated_text(generated_text, current_skills, target_role)
+    if processor is not None:
+        response.setdefault('query', target_role)
+    response['servedBy'] = 'model'
+    if not budget.truncates:
+        cache.put(key, response)
+    return summary(response, 0, first_token_at)
+
+def parse_generated_text(generated_text, current_skills, target_role):
+    # Parse the generated text as JSON
+    try:
+        return json.loads(generated_text)
+    except json.JSONDecodeError:
+        # If the model doesn't return valid JSON, create a structured response
+        missing_skills = extract_missing_skills(generated_text, current_skills, target_role)
+        return {
+            "title": f"Path to {target_role}",
+            "query": target_role,
+            "missingSkills": missing_skills,
+            "steps": extract_steps(generated_text, current_skills, target_role, missing_skills),
+            "learningModules": extract_learning_modules(generated_text)
+        }
+
+def predict_career_path(current_skills, target_role, budget=None):
+    response, exit_code = generate_career_path(current_skills, target_role, budget)
+    print(json.dumps(response))
+    return exit_code
+
+def validate_request(input_data):
+    """Returns an error response for invalid input, or None if the request can be served."""
+    if not isinstance(input_data, dict) or not input_data.get('skills') or not input_data.get('role'):
+        return {
+            'error': 'Invalid input: skills and role are required',
+            'title': 'Error',
+            'steps': [],
             'missingSkills': [],
             'learningModules': []
-        }))
-        return 1
+        }
+    for field in ('deadlineMs', 'maxNewTokens'):
+        value = input_data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            return {
+                'error': f'Invalid input: {field} must be a positive number',
+                'title': 'Error',
+                'steps': [],
+                'missingSkills': [],
+                'learningModules': []
+            }
+    return None
 
 def create_fallback_steps(current_skills, target_role):
     return [
@@ -115,7 +602,30 @@ def create_fallback_steps(current_skills, target_role):
         }
     ]
 
+def get_role_skill_index():
+    """Opens the precomputed role/skill index once; False if it is disabled or has not been built."""
+    global role_skill_index
+    if role_skill_index is None:
+        if not USE_ROLE_INDEX:
+            role_skill_index = False
+            return role_skill_index
+        try:
+            role_skill_index = RoleSkillIndex()
+        except (OSError, ValueError) as e:
+            print(f"Debug: Role/skill index unavailable ({e}); run 'python role_skill_index.py build'.",
+                  file=sys.stderr)
+            role_skill_index = False
+    return role_skill_index
+
 def extract_missing_skills(text, current_skills, target_role):
+    # Rank the role's required skills from the job corpus when the index is enabled and
+    # the roles matching the target have enough postings behind them
+    index = get_role_skill_index()
+    if index:
+        matches = index.match_roles(target_role, ROLE_MATCH_THRESHOLD)
+        if matches and index.postings(matches) >= ROLE_MIN_POSTINGS:
+            return index.missing_skills(current_skills, target_role, matches=matches)
+
     # Basic skill extraction based on role
     common_skills = {
         "developer": ["System Design", "Cloud Architecture", "Team Leadership"],
@@ -128,7 +638,10 @@ def extract_missing_skills(text, current_skills, target_role):
     role_category = next((k for k in common_skills.keys() if k in target_role.lower()), "developer")
     return [skill for skill in common_skills[role_category] if skill.lower() not in [s.lower() for s in current_skills]]
 
-def extract_steps(text, current_skills, target_role):
+def extract_steps(text, current_skills, target_role, missing_skills=None):
+    # missing_skills: extract_missing_skills() result the caller already has
+    if missing_skills is None:
+        missing_skills = extract_missing_skills(text, current_skills, target_role)
     # Create basic career progression steps
     return [
         {
@@ -147,7 +660,7 @@ def extract_steps(text, current_skills, target_role):
             "year": 2025,
             "title": f"Transition to {target_role}",
             "description": f"Begin specializing in skills specific to {target_role}",
-            "skills": extract_missing_skills(text, current_skills, target_role),
+            "skills": missing_skills,
             "resources": [
                 {
                     "name": "Professional Certification",
@@ -176,27 +689,98 @@ def extract_learning_modules(text):
         }
     ]
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Predict a career path from current skills to a target role.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a long-lived worker that keeps the model loaded and answers "
+                             "newline-delimited JSON requests instead of a single stdin request.")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="With --serve, listen on this Unix socket instead of stdin/stdout.")
+    parser.add_argument("--batch-input", metavar="JSONL",
+                        help="Offline mode: generate a path for every {skills, role, userId} row of this file.")
+    parser.add_argument("--batch-output", metavar="JSONL",
+                        help="With --batch-input, where to write one result per row.")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="With --batch-input, checkpoint file (defaults to the output path + '.checkpoint').")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="With --batch-input, start over even if a checkpoint exists.")
+    parser.add_argument("--max-batch-size", type=int, default=16,
+                        help="With --serve or --batch-input, the most prompts generated together in one batch.")
+    parser.add_argument("--batch-window-ms", type=float, default=20.0,
+                        help="With --serve, how long to wait for more requests before running a batch.")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND,
+                        help="Inference backend (defaults to $CAREER_MODEL_BACKEND or 'torch'). "
+                             "int8 and onnx need a one-time 'python career_backends.py export'.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write newline-delimited JSON events (tokens, completed steps, then a summary) "
+                             "while generating, instead of one JSON response at the end.")
+    parser.add_argument("--max-new-tokens", type=int, default=MAX_NEW_TOKENS,
+                        help="Most tokens generated for any request (defaults to $CAREER_MAX_NEW_TOKENS or 512). "
+                             "Requests can ask for fewer with maxNewTokens.")
+    parser.add_argument("--deadline-ms", type=float, default=DEFAULT_DEADLINE_MS,
+                        help="Wall-clock budget per request, counted from when it is received; past it the "
+                             "fallback path is served (defaults to $CAREER_DEADLINE_MS, 0 = none). "
+                             "Requests can ask for less with deadlineMs.")
+    parser.add_argument("--constrained", action="store_true", default=CONSTRAINED_DECODING,
+                        help="Constrain generation to valid CareerPathResponse JSON "
+                             "(also enabled by CAREER_CONSTRAINED_DECODING=1).")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    # Deadlines count from when the request arrived, which includes loading the model
+    started = time.monotonic()
+    args = parse_args()
+    configure_backend(args.backend)
+    configure_constrained_decoding(args.constrained)
+    configure_budget(args.max_new_tokens, args.deadline_ms)
+
+    if args.batch_input:
+        if not args.batch_output:
+            print("Error: --batch-input needs --batch-output", file=sys.stderr)
+            sys.exit(2)
+        sys.modules.setdefault('career_path_predictor', sys.modules[__name__])
+        from career_batch import run_batch
+
+        run_batch(args.batch_input, args.batch_output, batch_size=args.max_batch_size,
+                  checkpoint_path=args.checkpoint, resume=not args.no_resume)
+        sys.exit(0)
+
+    if args.serve:
+        # Let the worker module import this already-configured module rather than a fresh copy
+        sys.modules.setdefault('career_path_predictor', sys.modules[__name__])
+        from career_worker import CareerPathWorker, serve_socket, serve_stdio
+
+        worker = CareerPathWorker(max_batch_size=args.max_batch_size, batch_window_ms=args.batch_window_ms)
+        if args.socket:
+            serve_socket(worker, args.socket)
+        else:
+            serve_stdio(worker)
+        sys.exit(0)
+
     try:
         # Read input from stdin
         input_data = json.loads(sys.stdin.read())
         
         # Validate input
-        if not input_data.get('skills') or not input_data.get('role'):
-            print(json.dumps({
-                'error': 'Invalid input: skills and role are required',
-                'title': 'Error',
-                'steps': [],
-                'missingSkills': [],
-                'learningModules': []
-            }))
+        invalid_response = validate_request(input_data)
+        if invalid_response is not None:
+            print(json.dumps(invalid_response))
             sys.exit(1)
         
+        budget = GenerationBudget.from_request(input_data, received_at=started)
+
         # Generate career path
-        exit_code = predict_career_path(
-            input_data['skills'],
-            input_data['role']
-        )
+        if args.stream:
+            def emit(event):
+                print(json.dumps(event), flush=True)
+
+            exit_code = stream_career_path(input_data['skills'], input_data['role'], emit, budget)
+        else:
+            exit_code = predict_career_path(
+                input_data['skills'],
+                input_data['role'],
+                budget
+            )
         
         sys.exit(exit_code)
     except Exception as e:
@@ -207,4 +791,4 @@ if __name__ == "__main__":
             'missingSkills': [],
             'learningModules': []
         }))
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,307 @@
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+
+from career_path_predictor import (
+    GenerationBudget, generate_career_paths, get_result_cache, load_generator, stream_career_path, validate_request
+)
+
+# Sentinel used to tell the inference thread to stop once the queue is drained
+_STOP = object()
+
+class BatchStats:
+    """Running per-batch size and latency statistics for tuning the batching window."""
+
+    def __init__(self, max_samples=1000):
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self.batches = 0
+        self.requests = 0
+        self.size_histogram = {}
+        self._latencies_ms = []
+        self._queue_waits_ms = []
+
+    def record(self, size, latency_ms, queue_wait_ms):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.size_histogram[size] = self.size_histogram.get(size, 0) + 1
+            self._latencies_ms.append(latency_ms)
+            self._queue_waits_ms.append(queue_wait_ms)
+            # Only keep the most recent samples for the percentiles
+            del self._latencies_ms[:-self._max_samples]
+            del self._queue_waits_ms[:-self._max_samples]
+
+    @staticmethod
+    def _percentile(samples, fraction):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'requests': self.requests,
+                'meanBatchSize': self.requests / self.batches if self.batches else 0.0,
+                'batchSizeHistogram': {str(size): count for size, count in sorted(self.size_histogram.items())},
+                'latencyMs': {
+                    'p50': self._percentile(self._latencies_ms, 0.5),
+                    'p95': self._percentile(self._latencies_ms, 0.95),
+                    'max': max(self._latencies_ms, default=0.0)
+                },
+                'queueWaitMs': {
+                    'p50': self._percentile(self._queue_waits_ms, 0.5),
+                    'p95': self._percentile(self._queue_waits_ms, 0.95)
+                }
+            }
+
+class CareerPathWorker:
+    """
+    Serves career-path requests from a single inference thread.
+
+    The model is loaded once, and every request (whichever client it came from)
+    is queued for that one thread, so concurrent callers wait their turn
+    instead of each loading their own copy of the model. Requests that arrive
+    within batch_window_ms of each other are generated together, up to
+    max_batch_size prompts per batch.
+    """
+
+    def __init__(self, max_batch_size=16, batch_window_ms=20.0):
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = max(0.0, batch_window_ms) / 1000.0
+        self.stats = BatchStats()
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="career-path-inference", daemon=True)
+        self._thread.start()
+
+    def submit(self, request, reply):
+        """
+        Queues a request; reply(response) is called from the inference thread when it is done.
+
+        Requests with "stream": true are generated on their own and get their
+        token/step events first, as reply(event, final=False) calls.
+        """
+        if isinstance(request, dict) and request.get('op') == 'stats':
+            stats = self.stats.snapshot()
+            stats['cache'] = get_result_cache().stats()
+            reply({'id': request.get('id'), 'status': 'ok', 'result': stats})
+            return
+        self._requests.put((request, reply, time.monotonic()))
+
+    def close(self):
+        """Stops accepting work and waits for queued requests to finish."""
+        self._requests.put(_STOP)
+        self._thread.join()
+
+    def handle_batch(self, requests, received_at=None):
+        """
+        Answers a list of requests, generating all the valid ones in one batch.
+
+        Deadlines (deadlineMs) count from received_at, one time.monotonic()
+        value per request, so time spent waiting in the queue is part of the
+        budget; requests that ran out of time there get the fallback path
+        without reaching the model.
+        """
+        received_at = received_at or [time.monotonic()] * len(requests)
+        responses = [None] * len(requests)
+        valid = []
+        for index, request in enumerate(requests):
+            request_id = request.get('id') if isinstance(request, dict) else None
+            invalid_response = validate_request(request)
+            if invalid_response is not None:
+                responses[index] = {'id': request_id, 'status': 'error', 'result': invalid_response}
+            else:
+                valid.append(index)
+
+        if valid:
+            results = generate_career_paths(
+                [(requests[i]['skills'], requests[i]['role']) for i in valid],
+                [GenerationBudget.from_request(requests[i], received_at[i]) for i in valid]
+            )
+            for index, (result, exit_code) in zip(valid, results):
+                responses[index] = {
+                    'id': requests[index].get('id'),
+                    'status': 'ok' if exit_code == 0 else 'error',
+                    'result': result
+                }
+        return responses
+
+    @staticmethod
+    def _is_stream(request):
+        return isinstance(request, dict) and bool(request.get('stream')) and validate_request(request) is None
+
+    def _stream(self, request, reply, received_at):
+        request_id = request.get('id')
+
+        def emit(event):
+            event['id'] = request_id
+            reply(event, final=event['event'] == 'summary')
+
+        try:
+            stream_career_path(request['skills'], request['role'], emit,
+                               GenerationBudget.from_request(request, received_at))
+        except Exception as e:
+            reply({'id': request_id, 'event': 'summary', 'status': 'error',
+                   'result': {'error': f"Worker error: {str(e)}"}})
+
+    def _next_batch(self):
+        """Blocks for one request, then gathers more until the window closes or the batch is full."""
+        first = self._requests.get()
+        if first is _STOP:
+            return None, True
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        # Load the model up front so the first request only pays for generation
+        try:
+            load_generator()
+        except Exception as e:
+            print(f"Debug: Career model preload failed: {e}", file=sys.stderr)
+
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if not batch:
+                continue
+
+            streaming = [item for item in batch if self._is_stream(item[0])]
+            batch = [item for item in batch if not self._is_stream(item[0])]
+            for request, reply, enqueued in streaming:
+                self._stream(request, reply, enqueued)
+            if not batch:
+                continue
+
+            requests = [request for request, _, _ in batch]
+            started = time.monotonic()
+            try:
+                responses = self.handle_batch(requests, [enqueued for _, _, enqueued in batch])
+            except Exception as e:
+                responses = [{
+                    'id': request.get('id') if isinstance(request, dict) else None,
+                    'status': 'error',
+                    'result': {'error': f"Worker error: {str(e)}"}
+                } for request in requests]
+            finished = time.monotonic()
+
+            latency_ms = (finished - started) * 1000.0
+            queue_wait_ms = max(started - enqueued for _, _, enqueued in batch) * 1000.0
+            self.stats.record(len(batch), latency_ms, queue_wait_ms)
+            print(json.dumps({
+                'event': 'batch',
+                'size': len(batch),
+                'latencyMs': round(latency_ms, 2),
+                'queueWaitMs': round(queue_wait_ms, 2)
+            }), file=sys.stderr)
+
+            for (_, reply, _), response in zip(batch, responses):
+                try:
+                    reply(response)
+                except Exception as e:
+                    print(f"Debug: Failed to deliver response: {e}", file=sys.stderr)
+
+def _decode_line(line):
+    """Parses one NDJSON request line, returning (request, error_response)."""
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, {'id': None, 'status': 'error', 'result': {'error': f"Invalid JSON request: {str(e)}"}}
+
+def serve_stdio(worker, stdin=None, stdout=None):
+    """Reads one JSON request per line from stdin and writes one JSON response per line to stdout."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def reply(response, final=True):
+        with write_lock:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        request, error_response = _decode_line(line)
+        if error_response is not None:
+            reply(error_response)
+            continue
+        worker.submit(request, reply)
+
+    # stdin closed: finish whatever is still queued before exiting
+    worker.close()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        write_lock = threading.Lock()
+        pending = threading.Semaphore(0)
+        submitted = 0
+
+        def reply(response, final=True):
+            try:
+                with write_lock:
+                    self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+            finally:
+                # Streamed requests send several lines; only the last one completes them
+                if final:
+                    pending.release()
+
+        for raw_line in self.rfile:
+            line = raw_line.decode("utf-8")
+            if not line.strip():
+                continue
+            request, error_response = _decode_line(line)
+            submitted += 1
+            if error_response is not None:
+                reply(error_response)
+                continue
+            self.server.worker.submit(request, reply)
+
+        # The client half-closed the connection; wait for its answers before closing ours
+        for _ in range(submitted):
+            pending.acquire()
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve_socket(worker, socket_path):
+    """Serves NDJSON requests over a local Unix socket until interrupted."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = _UnixServer(socket_path, _RequestHandler)
+    server.worker = worker
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    print(f"Debug: Career path worker listening on {socket_path}", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
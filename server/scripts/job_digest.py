@@ -0,0 +1,203 @@
+"""
+Compact digest of a job post for the resume customizer.
+
+Prompts only need what a job asks for, not the full posting, so the post
+is boiled down into its key requirement lines, the keywords it repeats,
+and its tone, formatted into a few hundred characters of prompt text.
+
+Popular jobs are customized against hundreds of times, so digests are
+cached by a hash of the normalized post text: in memory, and in a bounded
+SQLite file that every customizer process (including one-shot runs) shares.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+
+from career_cache import CareerPathCache
+
+# Bump when the digest format changes so stale cache entries are not reused
+DIGEST_VERSION = 2
+DIGEST_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache', 'job_digests.sqlite')
+
+MAX_REQUIREMENTS = 8
+MAX_KEYWORDS = 15
+MAX_LINE_CHARS = 160
+
+# Phrases that mark a line or sentence as a requirement rather than company blurb
+_REQUIREMENT_CUES = re.compile(
+    r'\b(requir\w*|must|experience|proficien\w*|knowledge|familiar\w*|degree|years?|skills?|ability|'
+    r'expert\w*|hands-on|understanding|qualifications?|responsib\w*|you will|you\'ll)\b',
+    re.IGNORECASE
+)
+
+_TONE_CUES = [
+    ('energetic', re.compile(r'fast-paced|passionate|rockstar|ninja|exciting|thrive|hustle|!', re.IGNORECASE)),
+    ('collaborative', re.compile(r'collaborat\w*|team player|cross-functional|together', re.IGNORECASE)),
+    ('formal', re.compile(r'\bshall\b|candidates? (?:must|will)|in accordance|compliance|clearance', re.IGNORECASE)),
+    ('mission-driven', re.compile(r'mission|impact|purpose|community|diversity', re.IGNORECASE))
+]
+
+# Sections that hold no requirements: benefits lists and equal-opportunity statements
+_BOILERPLATE_HEADING = re.compile(
+    r'^(?:our |the )?(?:benefits|perks|perks (?:and|&) benefits|benefits (?:and|&) perks|compensation (?:and|&) benefits|'
+    r'what we offer|why (?:join|work (?:with|for)) us|equal (?:employment )?opportunity(?: employer| statement)?|'
+    r'eeo(?: statement)?|diversity (?:and|&) inclusion)$',
+    re.IGNORECASE
+)
+# Sentences that are boilerplate wherever they appear
+_BOILERPLATE_SENTENCE = re.compile(
+    r'equal (?:employment )?opportunity|without regard to|sexual orientation|gender identity|national origin|'
+    r'protected veteran|reasonable accommodation|e-verify|affirmative action|401\(?k\)?|paid time off|\bPTO\b|'
+    r'(?:medical|health),? dental|dental (?:and|&) vision|parental leave|employee assistance program|'
+    r'wellness (?:stipend|program)|commuter benefits',
+    re.IGNORECASE
+)
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9+#./-]*[A-Za-z0-9+#]|[A-Za-z]")
+
+_STOPWORDS = set("""
+a about above after all also an and any are as at be been being both but by can could do does
+each etc for from get has have having help how if in including into is it its join just least
+like make may more most must new not of on or other our out over own per plus preferred
+required role should so some such team than that the their them then there these they this
+those through to under up us using very via we well what when where which while who will with
+within work working would year years you your strong ability experience skills knowledge
+requirements responsibilities responsible qualifications description position candidate
+""".split())
+
+def _heading(line):
+    """A line's text if it looks like a section heading ('Benefits:', '## Perks'), else None."""
+    text = line.strip().strip('#*=_ \t')
+    if not text or len(text) > 40 or re.match(r'[-•·]', text):
+        return None
+    if text.endswith(':') or line.lstrip().startswith('#') or not re.search(r'[.!?,]', text):
+        return text.rstrip(':').strip()
+    return None
+
+def strip_boilerplate(job_post):
+    """
+    Removes benefits sections, equal-opportunity statements and similar
+    boilerplate from a job post.
+
+    Returns:
+        (remaining text, number of characters removed)
+    """
+    kept = []
+    skipping = False
+    for line in job_post.splitlines():
+        heading = _heading(line)
+        if heading is not None:
+            skipping = bool(_BOILERPLATE_HEADING.match(heading))
+            if skipping:
+                continue
+        elif skipping:
+            continue
+        if _BOILERPLATE_SENTENCE.search(line):
+            sentences = [sentence for sentence in re.split(r'(?<=[.!?])\s+', line)
+                         if not _BOILERPLATE_SENTENCE.search(sentence)]
+            if not sentences:
+                continue
+            line = ' '.join(sentences)
+        kept.append(line)
+    text = re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+    return text, max(len(job_post.strip()) - len(text), 0)
+
+def terms(text):
+    """Lowercased content words of text (stopwords and single letters dropped), in order."""
+    return [word.lower() for word in _WORD.findall(text)
+            if len(word) > 1 and word.lower() not in _STOPWORDS]
+
+def _requirement_lines(job_post):
+    lines = []
+    for raw in re.split(r'[\n\r]+|(?<=[.;])\s+', job_post):
+        line = raw.strip(' \t-*•·')
+        # Skip headings like 'Requirements:' as well as lines without a requirement cue
+        if len(line) < 12 or line.endswith(':') or not _REQUIREMENT_CUES.search(line):
+            continue
+        if len(line) > MAX_LINE_CHARS:
+            line = line[:MAX_LINE_CHARS].rsplit(' ', 1)[0] + '...'
+        if line not in lines:
+            lines.append(line)
+    return lines[:MAX_REQUIREMENTS]
+
+def _keywords(job_post, requirement_lines):
+    counts = Counter()
+    forms = {}
+    # Words in requirement lines are counted twice, so they outrank company blurb
+    for text in (job_post, ' '.join(requirement_lines)):
+        for word in _WORD.findall(text):
+            key = word.lower()
+            if key in _STOPWORDS or len(key) < 2:
+                continue
+            # Product names and acronyms (Python, AWS, C++) say more than plain lowercase words
+            boost = 1.5 if any(char.isupper() or char in '+#' for char in word[1:]) or word[0].isupper() else 1.0
+            counts[key] += boost
+            forms.setdefault(key, Counter())[word] += 1
+    return [forms[key].most_common(1)[0][0] for key, _ in counts.most_common(MAX_KEYWORDS)]
+
+def _tone(job_post):
+    tones = [name for name, pattern in _TONE_CUES if len(pattern.findall(job_post)) >= 2]
+    return ', '.join(tones) if tones else 'professional'
+
+def digest_job_post(job_post):
+    """Returns {'requirements': [...], 'keywords': [...], 'tone': str} for a job post."""
+    job_post = strip_boilerplate(job_post)[0]
+    requirements = _requirement_lines(job_post)
+    return {
+        'requirements': requirements,
+        'keywords': _keywords(job_post, requirements),
+        'tone': _tone(job_post)
+    }
+
+def format_digest(digest):
+    """The digest as compact prompt text."""
+    lines = ['Key requirements:']
+    lines.extend(f'- {requirement}' for requirement in digest['requirements'] or ['(none stated)'])
+    lines.append(f"Keywords: {', '.join(digest['keywords'])}")
+    lines.append(f"Tone: {digest['tone']}")
+    return '\n'.join(lines)
+
+# Digest cache shared by every request this process serves, opened on first use
+digest_cache = None
+
+def get_digest_cache():
+    """
+    Opens the digest cache from environment variables:
+    RESUME_DIGEST_CACHE_DB (SQLite path; empty keeps it memory-only),
+    RESUME_DIGEST_CACHE_ENTRIES (most digests kept on disk) and
+    RESUME_DIGEST_CACHE_TTL (seconds).
+    """
+    global digest_cache
+    if digest_cache is None:
+        try:
+            digest_cache = CareerPathCache(
+                max_memory_entries=256,
+                db_path=os.environ.get('RESUME_DIGEST_CACHE_DB', DIGEST_CACHE_DB) or None,
+                ttl_seconds=float(os.environ.get('RESUME_DIGEST_CACHE_TTL', 30 * 24 * 3600)),
+                max_disk_entries=int(os.environ.get('RESUME_DIGEST_CACHE_ENTRIES', 5000)),
+                table='job_digests'
+            )
+        except (ValueError, sqlite3.Error) as e:
+            print(f"Debug: Job digest disk cache disabled: {e}", file=sys.stderr)
+            digest_cache = CareerPathCache(max_memory_entries=256, table='job_digests')
+    return digest_cache
+
+def digest_key(job_post):
+    """Content hash of a job post; whitespace differences do not change it."""
+    payload = json.dumps({'version': DIGEST_VERSION, 'jobPost': ' '.join(job_post.split())})
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def cached_job_digest(job_post):
+    """Returns (digest, True if it came from the cache) for a job post."""
+    cache = get_digest_cache()
+    key = digest_key(job_post)
+    digest = cache.get(key)
+    if digest is not None:
+        return digest, True
+    digest = digest_job_post(job_post)
+    cache.put(key, digest)
+    return digest, False
@@ -0,0 +1,376 @@
+"""
+Schema-constrained JSON decoding.
+
+JsonSchemaMatcher is a character-level pushdown automaton that accepts
+exactly the prefixes of JSON documents matching a small schema (objects
+with a fixed key order, arrays, strings and integers). JsonSchemaLogitsProcessor
+plugs it into `generate()`: at every step it only lets through tokens that
+keep the output a valid prefix, and once the top-level object closes the
+only allowed token is EOS, so generation stops right there.
+
+Some vocabularies cannot spell all of JSON: T5's SentencePiece model has no
+'{' or '}', so the career model can never emit them. JsonTokenTable then
+picks a stand-in the vocabulary does have ('(' for '{', ')' for '}') and the
+matcher accepts the stand-in wherever the bracket is structural. Inside
+strings every character is literal. JsonAliasDecoder turns the generated
+text back into plain JSON, in one piece or chunk by chunk while streaming.
+"""
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+
+# Schema for CareerPathResponse (see server/types/career.ts). Keys are emitted
+# in this order; maxItems/maxLength keep a rambling model from running on.
+_STRING = {'type': 'string', 'maxLength': 300}
+_STRING_LIST = {'type': 'array', 'items': _STRING, 'maxItems': 10}
+
+CAREER_PATH_SCHEMA = {
+    'type': 'object',
+    'properties': [
+        ('title', _STRING),
+        ('missingSkills', _STRING_LIST),
+        ('steps', {
+            'type': 'array',
+            'maxItems': 6,
+            'items': {
+                'type': 'object',
+                'properties': [
+                    ('year', {'type': 'integer', 'maxDigits': 4}),
+                    ('title', _STRING),
+                    ('description', _STRING),
+                    ('skills', _STRING_LIST),
+                    ('resources', {
+                        'type': 'array',
+                        'maxItems': 5,
+                        'items': {'type': 'object', 'properties': [('name', _STRING), ('url', _STRING)]}
+                    })
+                ]
+            }
+        }),
+        ('learningModules', {
+            'type': 'array',
+            'maxItems': 6,
+            'items': {'type': 'object', 'properties': [('name', _STRING), ('url', _STRING), ('type', _STRING)]}
+        })
+    ]
+}
+
+_WHITESPACE = ' \t\n\r'
+
+# Stand-ins tried, in order, for structural characters a vocabulary cannot spell.
+# They only ever appear outside strings, where JSON itself never uses them.
+_ALIAS_CANDIDATES = {'{': '(<', '}': ')>', '[': '<|', ']': '>|'}
+
+class JsonSchemaMatcher:
+    """
+    Incrementally validates text against a schema.
+
+    feed() returns False as soon as the text can no longer be completed into a
+    matching document; the matcher must not be used after that, so callers
+    probing candidates should feed a clone().
+    """
+
+    def __init__(self, schema, max_whitespace=2, aliases=None):
+        self.max_whitespace = max_whitespace
+        # Stand-in -> structural character, e.g. {'(': '{'} (see JsonTokenTable)
+        self.aliases = aliases or {}
+        self.whitespace_run = 0
+        self.done = False
+        # Each frame is a list: [kind, schema, phase, counter]
+        self.stack = [['value', schema, 'start', 0]]
+
+    def clone(self):
+        other = JsonSchemaMatcher.__new__(JsonSchemaMatcher)
+        other.max_whitespace = self.max_whitespace
+        other.aliases = self.aliases
+        other.whitespace_run = self.whitespace_run
+        other.done = self.done
+        other.stack = [list(frame) for frame in self.stack]
+        return other
+
+    def feed(self, text):
+        for char in text:
+            if not self._feed_char(char):
+                return False
+        return True
+
+    def _whitespace(self, char):
+        """Accepts bounded whitespace between tokens; returns None if char is not whitespace."""
+        if char not in _WHITESPACE:
+            self.whitespace_run = 0
+            return None
+        self.whitespace_run += 1
+        return self.whitespace_run <= self.max_whitespace
+
+    def _complete_value(self):
+        """Pops a finished value and moves its parent on."""
+        self.stack.pop()
+        if not self.stack:
+            self.done = True
+            return
+        parent = self.stack[-1]
+        if parent[0] == 'array':
+            parent[2] = 'after_item'
+            parent[3] += 1
+        elif parent[0] == 'object':
+            parent[2] = 'after_value'
+
+    def _feed_char(self, char):
+        if self.done:
+            return False
+
+        frame = self.stack[-1]
+        kind, schema, phase = frame[0], frame[1], frame[2]
+
+        if kind == 'string':
+            return self._feed_string(frame, char)
+        char = self.aliases.get(char, char)
+
+        if kind == 'integer':
+            if char.isdigit():
+                if phase == 'zero' or frame[3] >= schema.get('maxDigits', 9):
+                    return False
+                frame[2] = 'zero' if phase == 'start' and char == '0' else 'digits'
+                frame[3] += 1
+                return True
+            if phase == 'start':
+                return False
+            # Any other character ends the number and belongs to the parent
+            self._complete_value()
+            return self._feed_char(char)
+
+        if kind == 'object' and phase == 'key' and frame[4] > 0:
+            # Part-way through a key literal, where whitespace is not allowed
+            return self._feed_key(frame, char)
+
+        accepted = self._whitespace(char)
+        if accepted is not None:
+            return accepted
+
+        if kind == 'value':
+            value_type = schema['type']
+            if value_type == 'string' and char == '"':
+                self.stack[-1] = ['string', schema, 'body', 0]
+                return True
+            if value_type == 'integer' and char.isdigit():
+                self.stack[-1] = ['integer', schema, 'start', 0]
+                return self._feed_char(char)
+            if value_type == 'array' and char == '[':
+                self.stack[-1] = ['array', schema, 'first', 0]
+                return True
+            if value_type == 'object' and char == '{':
+                self.stack[-1] = ['object', schema, 'key', 0, 0]
+                return True
+            return False
+
+        if kind == 'array':
+            if phase in ('first', 'next'):
+                if phase == 'first' and char == ']':
+                    self._complete_value()
+                    return True
+                self.stack.append(['value', schema['items'], 'start', 0])
+                return self._feed_char(char)
+            # after_item
+            if char == ']':
+                self._complete_value()
+                return True
+            if char == ',' and frame[3] < schema.get('maxItems', 1000):
+                frame[2] = 'next'
+                return True
+            return False
+
+        if kind == 'object':
+            properties = schema['properties']
+            if phase == 'key':
+                return self._feed_key(frame, char)
+            if phase == 'colon':
+                if char != ':':
+                    return False
+                frame[2] = 'value'
+                self.stack.append(['value', properties[frame[3]][1], 'start', 0])
+                return True
+            # after_value: every key is required, in schema order
+            if frame[3] + 1 < len(properties):
+                if char != ',':
+                    return False
+                frame[2] = 'key'
+                frame[3] += 1
+                frame[4] = 0
+                return True
+            if char != '}':
+                return False
+            self._complete_value()
+            return True
+
+        return False
+
+    def _feed_key(self, frame, char):
+        literal = '"' + frame[1]['properties'][frame[3]][0] + '"'
+        if char != literal[frame[4]]:
+            return False
+        frame[4] += 1
+        if frame[4] == len(literal):
+            frame[2] = 'colon'
+        return True
+
+    def _feed_string(self, frame, char):
+        phase = frame[2]
+        if phase == 'escape':
+            if char == 'u':
+                frame[2] = 'unicode0'
+            elif char in '"\\/bfnrt':
+                frame[2] = 'body'
+            else:
+                return False
+            frame[3] += 1
+            return True
+        if phase.startswith('unicode'):
+            if char not in '0123456789abcdefABCDEF':
+                return False
+            digits = int(phase[len('unicode'):]) + 1
+            frame[2] = 'body' if digits == 4 else f'unicode{digits}'
+            return True
+        if char == '"':
+            self.whitespace_run = 0
+            self._complete_value()
+            return True
+        if ord(char) < 0x20:
+            return False
+        if frame[3] >= frame[1].get('maxLength', 10000):
+            return False
+        frame[3] += 1
+        if char == '\\':
+            frame[2] = 'escape'
+        return True
+
+class JsonTokenTable:
+    """Decoded text for every vocabulary id, built once per tokenizer."""
+
+    # Word-boundary markers used by SentencePiece and byte-level BPE vocabularies
+    _MARKERS = {'▁': ' ', 'Ġ': ' ', 'Ċ': '\n'}
+
+    def __init__(self, tokenizer):
+        self.eos_token_id = tokenizer.eos_token_id
+        special_ids = set(tokenizer.all_special_ids)
+        self.texts = []
+        for token_id, piece in enumerate(tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))):
+            if token_id in special_ids or piece is None:
+                self.texts.append(None)
+                continue
+            for marker, replacement in self._MARKERS.items():
+                piece = piece.replace(marker, replacement)
+            self.texts.append(piece)
+
+        covered = set(''.join(text for text in self.texts if text))
+        # Structural character -> stand-in, for the brackets the vocabulary cannot spell
+        self.aliases = {}
+        for char, candidates in _ALIAS_CANDIDATES.items():
+            if char in covered:
+                continue
+            alias = next((candidate for candidate in candidates
+                          if candidate in covered and candidate not in self.aliases.values()), None)
+            if alias is not None:
+                self.aliases[char] = alias
+        missing = [char for char in '{}[]":,' if char not in covered and char not in self.aliases]
+        if missing:
+            raise ValueError(f"Tokenizer cannot produce JSON punctuation: {' '.join(missing)}")
+
+    @property
+    def matcher_aliases(self):
+        """Stand-in -> structural character, as JsonSchemaMatcher and JsonAliasDecoder take them."""
+        return {alias: char for char, alias in self.aliases.items()}
+
+class JsonAliasDecoder:
+    """
+    Turns text constrained with stand-ins back into plain JSON.
+
+    Only characters outside strings are translated, so a '(' inside a
+    description stays a '('. feed() keeps its string state between calls,
+    so streamed chunks can be passed in as they arrive.
+    """
+
+    def __init__(self, aliases):
+        self.aliases = aliases
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text):
+        if not self.aliases:
+            return text
+        out = []
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            else:
+                char = self.aliases.get(char, char)
+            out.append(char)
+        return ''.join(out)
+
+class JsonSchemaLogitsProcessor:
+    """
+    Logits processor that masks every token which would break the schema.
+
+    Only the top_k highest-scoring tokens are checked at each step; the rest of
+    the vocabulary is scanned (in score order) only when none of those fit.
+    """
+
+    def __init__(self, token_table, schema, top_k=64):
+        self.token_table = token_table
+        self.schema = schema
+        self.top_k = top_k
+        self.aliases = token_table.matcher_aliases
+        self._rows = {}
+
+    def _matcher_for(self, row, token_ids):
+        consumed, matcher = self._rows.get(row, (0, None))
+        if matcher is None or consumed > len(token_ids):
+            consumed, matcher = 0, JsonSchemaMatcher(self.schema, aliases=self.aliases)
+        for token_id in token_ids[consumed:]:
+            text = self.token_table.texts[token_id] if token_id < len(self.token_table.texts) else None
+            if text and not matcher.done:
+                matcher.feed(text)
+        self._rows[row] = (len(token_ids), matcher)
+        return matcher
+
+    def _allowed(self, matcher, candidates):
+        texts = self.token_table.texts
+        allowed = []
+        for token_id in candidates:
+            text = texts[token_id] if token_id < len(texts) else None
+            if text and matcher.clone().feed(text):
+                allowed.append(token_id)
+        return allowed
+
+    def __call__(self, input_ids, scores):
+        mask = torch.full_like(scores, float('-inf'))
+        for row in range(scores.shape[0]):
+            matcher = self._matcher_for(row, input_ids[row].tolist())
+            if matcher.done:
+                allowed = [self.token_table.eos_token_id]
+            else:
+                top = torch.topk(scores[row], min(self.top_k, scores.shape[-1])).indices.tolist()
+                allowed = self._allowed(matcher, top)
+                if not allowed:
+                    ranked = torch.argsort(scores[row], descending=True).tolist()
+                    allowed = self._allowed(matcher, ranked[len(top):])[:self.top_k]
+                if not allowed:
+                    # Nothing can continue the document; end it rather than emit garbage
+                    allowed = [self.token_table.eos_token_id]
+            mask[row, allowed] = 0.0
+        return scores + mask
+
+    def completed(self, row=0):
+        """True if the given row produced a complete document."""
+        _, matcher = self._rows.get(row, (0, None))
+        return matcher is not None and matcher.done
+
+    def decoder(self):
+        """A JsonAliasDecoder that turns this processor's output back into plain JSON."""
+        return JsonAliasDecoder(self.aliases)
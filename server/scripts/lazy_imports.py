@@ -0,0 +1,42 @@
+import importlib
+import sys
+import threading
+import types
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a heavy module that is only imported on first attribute access.
+
+    Scripts bind e.g. `torch = lazy_import('torch')` at the top of the file and
+    use `torch.cuda` as usual; requests that never reach inference (invalid
+    input, cache hits, fallbacks) never pay the import.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """Returns the module if it is already imported, otherwise a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
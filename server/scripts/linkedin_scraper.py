@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
+import argparse
+import asyncio
 import json
 import logging
 import sys
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from rate_limit import HostRateLimiter
+from seen_jobs import UNCHANGED, content_hash, job_key, open_seen_store
+from skill_extractor import extract_skills
 from linkedin_jobs_scraper import LinkedinScraper
 from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
 from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
@@ -15,14 +24,27 @@ from linkedin_jobs_scraper.filters import (
     OnSiteOrRemoteFilters
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Defaults for multi-query runs: concurrent queries (one Chrome session each), and search pages per second
+# and back-to-back pages per worker; a host sees at most workers x rate pages per second
+DEFAULT_WORKERS = int(os.environ.get("LINKEDIN_SCRAPER_WORKERS", "4"))
+DEFAULT_RATE = float(os.environ.get("LINKEDIN_SCRAPER_RATE", "0.5"))
+DEFAULT_BURST = int(os.environ.get("LINKEDIN_SCRAPER_BURST", "2"))
+# LinkedIn lists 25 jobs per search page; a query is issued one page at a time so each page can be rate-limited
+PAGE_SIZE = 25
+SEARCH_URL = "https://www.linkedin.com/jobs/search"
 
-# List to store scraped jobs
-jobs = []
+class JsonLinesWriter:
+    """Writes each job as one JSON line (NDJSON) and flushes it, so readers see it immediately."""
 
-# Event callbacks
-def on_data(data: EventData):
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __call__(self, job):
+        self.stream.write(json.dumps(job, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+def normalize_job(data: EventData):
+    """The job object for one scraped posting."""
     # Convert date string to Date object if available
     posted_date = datetime.now()
     if data.date_text:
@@ -48,17 +70,8 @@ def on_data(data: EventData):
     if data.place and ("remote" in data.place.lower() or "anywhere" in data.place.lower()):
         remote = True
 
-    # Extract skills from description (simple keyword extraction)
-    skills = []
-    common_skills = ["python", "javascript", "react", "node.js", "java", "c#", "sql", "nosql", 
-                    "mongodb", "aws", "azure", "docker", "kubernetes", "git", "agile", "scrum",
-                    "typescript", "html", "css", "php", "ruby", "swift", "kotlin", "flutter",
-                    "angular", "vue.js", "django", "flask", "spring", ".net", "rest api", "graphql"]
-    
-    description_lower = data.description.lower()
-    for skill in common_skills:
-        if skill in description_lower:
-            skills.append(skill)
+    # Extract skills from description (whole-word taxonomy match, see skill_extractor.py)
+    skills = extract_skills(data.description)
 
     # Determine job type
     job_type = "Full-time"  # Default
@@ -93,50 +106,25 @@ def on_data(data: EventData):
                 job["salary"] = insight
                 break
 
-    jobs.append(job)
-    logging.info(f"Scraped job: {data.title} at {data.company}")
+    return job
 
-def on_error(error):
-    logging.error(f"Error: {error}")
-
-def on_end():
-    logging.info(f"Scraping finished. Total jobs found: {len(jobs)}")
-
-def scrape_linkedin_jobs(keyword, location, limit=25):
-    """
-    Scrape LinkedIn jobs based on keyword and location
-    
-    Args:
-        keyword (str): Job title or keyword to search for
-        location (str): Location to search in
-        limit (int): Maximum number of jobs to scrape
-        
-    Returns:
-        list: List of scraped job objects
-    """
-    # Clear global jobs list
-    global jobs
-    jobs = []
-    
-    # Initialize the scraper
-    scraper = LinkedinScraper(
+def create_scraper(max_workers):
+    """A headless LinkedinScraper that runs up to max_workers queries at once."""
+    return LinkedinScraper(
         chrome_executable_path=None,  # Will use default ChromeDriver path
         chrome_options=None,  # Default Chrome options
         headless=True,
         slow_mo=1.3,  # Slow down to avoid getting blocked
-        max_workers=1  # Just one worker to avoid rate limiting
+        max_workers=max_workers
     )
 
-    # Add event listeners
-    scraper.on(Events.DATA, on_data)
-    scraper.on(Events.ERROR, on_error)
-    scraper.on(Events.END, on_end)
-
-    # Define the search query
-    query = Query(
+def build_query(keyword, location, limit, page_offset=0):
+    """The search query for one keyword and location, starting page_offset search pages in."""
+    return Query(
         query=keyword,
         options=QueryOptions(
             locations=[location],
+            page_offset=page_offset,
             apply_link=False,  # Don't try to extract apply link to speed up scraping
             skip_promoted_jobs=True,  # Skip promoted jobs
             limit=limit,
@@ -155,24 +143,339 @@ def scrape_linkedin_jobs(keyword, location, limit=25):
         )
     )
 
-    # Run the scraper with the query
-    try:
-        scraper.run([query])
-    finally:
-        scraper.close()
+class LinkedInJobCollector:
+    """
+    One scrape of a keyword x location matrix, with all of its state on the instance
+
+    The collector owns its LinkedinScrapers (and so their Chrome sessions), event
+    handlers, counters and rate limiter, so several can run at once in one
+    process, e.g. from the threads or event loop of a long-lived service.
+    A collector runs once; its jobs can be taken in any one of these ways:
+
+        jobs = collector.collect()          # list, when the run is over
+        count = collector.run(sink)         # sink(job) as each job is scraped
+        for job in collector: ...           # scrape runs on a background thread
+        async for job in collector: ...     # same, without blocking the event loop
+
+    Each worker has its own single-session scraper and takes queries off a
+    shared list, issuing each one a search page (PAGE_SIZE jobs) at a time;
+    with a rate, the worker takes a token from LinkedIn's bucket before it
+    issues each page, so the limit holds back the requests themselves.
+
+    Leaving an iterator early (break, an exception, an abandoned task) stops
+    the collector from processing jobs and from issuing further pages: later
+    postings are neither parsed nor checked against the seen-job index. The
+    library offers no way to stop a page from outside, so each worker still
+    finishes the page it is on before it closes its scraper.
+
+    Args:
+        keywords (str or list): Job titles or keywords to search for
+        locations (str or list): Locations to search in ("" for anywhere)
+        limit (int): Maximum number of jobs to scrape per query
+        workers (int): Queries scraped concurrently
+        rate (float): Search pages per second per worker; LinkedIn sees at most workers x rate.
+            0 disables the limit
+        burst (int): Search pages per worker LinkedIn may get back to back before the rate applies
+        seen (SeenJobStore): If given, postings it has already seen unchanged are skipped.
+            Other jobs carry "seen": {"key", "content"}, which the caller passes to
+            seen.mark() once it has stored them; it closes the store after the run
+        tag_queries (bool): Add "query": {"keyword", "location"} to every job;
+            by default only when there is more than one query
+    """
+
+    def __init__(self, keywords, locations, limit=25, workers=1, rate=0, burst=DEFAULT_BURST,
+                 seen=None, tag_queries=None):
+        keywords = [keywords] if isinstance(keywords, str) else list(keywords)
+        locations = [locations] if isinstance(locations, str) else list(locations)
+        self.queries = [(keyword, location) for keyword in keywords for location in locations]
+        self.limit = limit
+        self.workers = max(1, min(workers, len(self.queries)))
+        # The host's bucket grows with the workers, or adding workers would buy no throughput
+        self.rate_limiter = (HostRateLimiter(rate * self.workers, burst * self.workers)
+                             if rate > 0 else None)
+        self.seen = seen
+        self.tag_queries = len(self.queries) > 1 if tag_queries is None else tag_queries
+        self.jobs_scraped = 0
+        # Postings listed per query (seen or not), so paging stops once a query runs out of results
+        self.listed = {}
+        self.errors = []
+        self._sink = None
+        self._started = False
+        # Scraper threads share the sink and the counters
+        self._lock = threading.Lock()
+        # Set when an iterator is abandoned, so the rest of the run skips its jobs (the crawl itself goes on)
+        self._cancelled = threading.Event()
+
+    def run(self, sink):
+        """Scrapes every query, handing each job to sink(job) as soon as it is scraped; returns the job count."""
+        with self._lock:
+            if self._started:
+                raise RuntimeError("A LinkedInJobCollector runs once; create a new one for another scrape")
+            self._started = True
+        self._sink = sink
+        if not self.queries:
+            return 0
+
+        pending = queue.Queue()
+        for keyword, location in self.queries:
+            pending.put((keyword, location))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="linkedin-query") as executor:
+            workers = [executor.submit(self._scrape_queries, pending) for _ in range(self.workers)]
+            for worker in workers:
+                worker.result()
+        logging.info(f"Scraped {self.jobs_scraped} jobs from {len(self.queries)} queries with "
+                     f"{self.workers} workers in {time.perf_counter() - started:.1f}s")
+        return self.jobs_scraped
+
+    def _scrape_queries(self, pending):
+        """One worker: scrapes queries off pending in its own Chrome session until none are left."""
+        scraper = create_scraper(1)
+        scraper.on(Events.DATA, self._on_data)
+        scraper.on(Events.ERROR, self._on_error)
+        try:
+            while not self._cancelled.is_set():
+                try:
+                    keyword, location = pending.get_nowait()
+                except queue.Empty:
+                    return
+                self._scrape_query(scraper, keyword, location)
+        finally:
+            scraper.close()
+
+    def _scrape_query(self, scraper, keyword, location):
+        """Issues one query a search page at a time, each after taking a token, until limit or the results run out."""
+        for page, offset in enumerate(range(0, self.limit, PAGE_SIZE)):
+            if self._cancelled.is_set():
+                return
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(SEARCH_URL)
+            listed = self.listed.get((keyword, location), 0)
+            scraper.run([build_query(keyword, location, min(PAGE_SIZE, self.limit - offset), page)])
+            if self.listed.get((keyword, location), 0) == listed:
+                return
+
+    def collect(self):
+        """Scrapes every query and returns the list of jobs."""
+        jobs = []
+        self.run(jobs.append)
+        return jobs
+
+    def __iter__(self):
+        jobs = queue.Queue()
+        done = object()
+        self._run_in_background(jobs.put, done)
+        try:
+            while True:
+                job = jobs.get()
+                if job is done:
+                    return
+                if isinstance(job, BaseException):
+                    raise job
+                yield job
+        finally:
+            self._cancelled.set()
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        jobs = asyncio.Queue()
+        done = object()
+        self._run_in_background(lambda job: loop.call_soon_threadsafe(jobs.put_nowait, job), done)
+        try:
+            while True:
+                job = await jobs.get()
+                if job is done:
+                    return
+                if isinstance(job, BaseException):
+                    raise job
+                yield job
+        finally:
+            self._cancelled.set()
+
+    def _run_in_background(self, put, done):
+        """Runs the scrape on a daemon thread, putting each job and then done (or the exception raised)."""
+        def scrape():
+            try:
+                self.run(put)
+            except BaseException as error:
+                outcome = error
+            else:
+                outcome = done
+            # Nobody is reading any more once the iterator is abandoned
+            if not self._cancelled.is_set():
+                put(outcome)
+
+        threading.Thread(target=scrape, name="linkedin-job-collector", daemon=True).start()
+
+    # Event callbacks; DATA runs on the scraper's worker threads
+    def _on_data(self, data: EventData):
+        with self._lock:
+            self.listed[(data.query, data.location)] = self.listed.get((data.query, data.location), 0) + 1
+        if self._cancelled.is_set():
+            return
+
+        # Skip postings emitted by an earlier run before doing any parsing
+        seen = None
+        if self.seen is not None:
+            seen = {"key": job_key(data.job_id, data.link, data.title, data.company, data.place),
+                    "content": content_hash(data.title, data.company, data.place, data.description)}
+            if self.seen.check(seen["key"], seen["content"]) == UNCHANGED:
+                return
+
+        job = normalize_job(data)
+        if seen is not None:
+            # Whoever stores the job records it as seen (SeenJobStore.mark), see seen_jobs.py
+            job["seen"] = seen
+        if self.tag_queries:
+            job["query"] = {"keyword": data.query, "location": data.location}
+        with self._lock:
+            self._sink(job)
+            self.jobs_scraped += 1
+        logging.info(f"Scraped job: {data.title} at {data.company}")
+
+    def _on_error(self, error):
+        self.errors.append(str(error))
+        logging.error(f"Error: {error}")
+
+def scrape_linkedin_jobs(keyword, location, limit=25):
+    """
+    Scrape LinkedIn jobs based on keyword and location
     
-    return jobs
+    Args:
+        keyword (str): Job title or keyword to search for
+        location (str): Location to search in
+        limit (int): Maximum number of jobs to scrape
+        
+    Returns:
+        list: List of scraped job objects
+    """
+    return LinkedInJobCollector(keyword, location, limit).collect()
+
+def stream_linkedin_jobs(keyword, location, limit, sink, seen=None):
+    """
+    Scrape LinkedIn jobs, handing each one to sink(job) as soon as it is scraped
+    instead of collecting them, so memory stays flat whatever the limit
+
+    Args:
+        keyword (str): Job title or keyword to search for
+        location (str): Location to search in
+        limit (int): Maximum number of jobs to scrape
+        sink (callable): Called with every normalized job object
+        seen (SeenJobStore): If given, postings it has already seen unchanged are skipped
+
+    Returns:
+        int: Number of jobs scraped
+    """
+    return LinkedInJobCollector(keyword, location, limit, seen=seen).run(sink)
+
+def stream_linkedin_matrix(keywords, locations, limit, sink, workers=DEFAULT_WORKERS,
+                           rate=DEFAULT_RATE, burst=DEFAULT_BURST, seen=None):
+    """
+    Scrape every keyword x location query in one run, handing each job to sink(job)
+
+    The queries run up to workers at a time, each worker with its own scraper and
+    Chrome session. LinkedIn gets a token bucket of workers x rate search
+    pages per second, taken before a worker issues each page, so the whole run
+    stays under that rate however the workers interleave. Every job carries
+    "query": {"keyword", "location"} naming the query that found it.
+
+    Args:
+        keywords (list): Job titles or keywords to search for
+        locations (list): Locations to search in ("" for anywhere)
+        limit (int): Maximum number of jobs to scrape per query
+        sink (callable): Called with every normalized job object
+        workers (int): Queries scraped concurrently
+        rate (float): Search pages per second per worker (workers x rate for LinkedIn)
+        burst (int): Search pages per worker LinkedIn may get back to back before the rate applies
+        seen (SeenJobStore): If given, postings it has already seen unchanged are skipped
+
+    Returns:
+        int: Number of jobs scraped
+    """
+    collector = LinkedInJobCollector(keywords, locations, limit, workers=workers, rate=rate, burst=burst,
+                                     seen=seen, tag_queries=True)
+    return collector.run(sink)
+
+def read_matrix(path):
+    """Reads {"keywords": [...], "locations": [...], "limit": n} from a JSON file, or stdin for "-"."""
+    if path == "-":
+        matrix = json.load(sys.stdin)
+    else:
+        with open(path, encoding="utf-8") as f:
+            matrix = json.load(f)
+    keywords = [keyword for keyword in matrix.get("keywords", []) if isinstance(keyword, str) and keyword.strip()]
+    locations = [location for location in matrix.get("locations", [""]) if isinstance(location, str)] or [""]
+    return keywords, locations, matrix.get("limit")
 
 if __name__ == "__main__":
-    # Check if keyword and location are provided as command line arguments
-    if len(sys.argv) < 3:
-        print("Usage: python linkedin_scraper.py <keyword> <location> [limit]")
-        sys.exit(1)
-    
-    keyword = sys.argv[1]
-    location = sys.argv[2]
-    limit = int(sys.argv[3]) if len(sys.argv) > 3 else 25
-    
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn jobs for a keyword and location.")
+    parser.add_argument("keyword", nargs="?", help="Job title or keyword to search for")
+    parser.add_argument("location", nargs="?", help="Location to search in")
+    parser.add_argument("limit", type=int, nargs="?", default=25, help="Maximum number of jobs to scrape")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write each job to stdout as one JSON line as soon as it is scraped")
+    parser.add_argument("--output",
+                        help="Append each job as one JSON line to this file as soon as it is scraped")
+    parser.add_argument("--matrix",
+                        help="JSON file ('-' for stdin) with keywords, locations and limit: scrape every "
+                             "keyword x location in one run and stream the jobs, each tagged with its query")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Queries scraped concurrently in --matrix mode")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="Search pages per second per worker in --matrix mode; LinkedIn sees at most "
+                             f"workers x rate (default {DEFAULT_WORKERS} x {DEFAULT_RATE:g} = "
+                             f"{DEFAULT_WORKERS * DEFAULT_RATE:g} pages/s); 0 disables the limit")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST,
+                        help="Search pages per worker LinkedIn may get back to back in --matrix mode")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip postings already stored unchanged; other jobs carry a \"seen\" entry "
+                             "to pass to seen_jobs.py --mark once stored (--stream, --output and --matrix only)")
+    parser.add_argument("--seen-db",
+                        help="Seen-job index for --incremental (default data/cache/seen_jobs.sqlite)")
+    args = parser.parse_args()
+    keyword, location, limit = args.keyword, args.location, args.limit
+
+    if not args.matrix and (keyword is None or location is None):
+        parser.error("keyword and location are required without --matrix")
+
+    if args.matrix or args.stream or args.output:
+        # Streaming modes: stdout carries only job lines, so the summaries go to stderr
+        if args.matrix:
+            keywords, locations, matrix_limit = read_matrix(args.matrix)
+            if matrix_limit is not None:
+                limit = int(matrix_limit)
+        seen = open_seen_store(args.seen_db) if args.incremental else None
+        out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        try:
+            if args.matrix:
+                count = stream_linkedin_matrix(keywords, locations, limit, JsonLinesWriter(out),
+                                               args.workers, args.rate, args.burst, seen=seen)
+            else:
+                count = stream_linkedin_jobs(keyword, location, limit, JsonLinesWriter(out), seen=seen)
+        except BaseException:
+            if seen is not None:
+                seen.close(commit=False)
+            raise
+        finally:
+            if args.output:
+                out.close()
+
+        if args.matrix:
+            print(f"Scraped {count} jobs for {len(keywords) * len(locations)} queries.", file=sys.stderr)
+        else:
+            print(f"Scraped {count} jobs.", file=sys.stderr)
+        if seen is not None:
+            counts = seen.counts
+            seen.close()
+            print(f"Seen-job index: {counts['new']} new, {counts['updated']} updated, "
+                  f"{counts['unchanged']} unchanged (skipped). New and updated jobs are recorded "
+                  f"once stored: seen_jobs.py --mark", file=sys.stderr)
+        sys.exit(0)
+
     # Run the scraper
     scraped_jobs = scrape_linkedin_jobs(keyword, location, limit)
     
@@ -184,4 +487,4 @@ if __name__ == "__main__":
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(scraped_jobs, f, ensure_ascii=False, indent=2)
     
-    print(f"Scraped {len(scraped_jobs)} jobs. Results saved to {output_file}") 
\ No newline at end of file
+    print(f"Scraped {len(scraped_jobs)} jobs. Results saved to {output_file}")
\ No newline at end of file
@@ -0,0 +1,69 @@
+import dotenv from 'dotenv';
+import mongoose from 'mongoose';
+import Job from '../models/Job';
+import { canonicalSkill } from '../utils/skills';
+
+// Load environment variables
+dotenv.config();
+
+// Jobs rewritten per database round trip
+const BATCH_SIZE = 500;
+
+/**
+ * Rewrites the skills of stored jobs to the taxonomy's canonical names.
+ *
+ * The LinkedIn scraper used to store lowercase skills ("node.js", "aws"); it now
+ * stores canonical names ("Node.js", "AWS"). Skills the taxonomy does not know
+ * are kept as they are, duplicates that now collapse into one name are dropped.
+ * Safe to run more than once.
+ */
+async function migrateSkillCasing(): Promise<{ scanned: number; updated: number }> {
+  let scanned = 0;
+  let updated = 0;
+  let operations: any[] = [];
+
+  const flush = async () => {
+    if (operations.length > 0) {
+      await Job.bulkWrite(operations, { ordered: false });
+      updated += operations.length;
+      operations = [];
+    }
+  };
+
+  const cursor = Job.find({ 'skills.0': { $exists: true } }, { skills: 1 }).lean().cursor();
+  for (let job = await cursor.next(); job !== null; job = await cursor.next()) {
+    scanned++;
+    const skills: string[] = job.skills;
+    const canonical = Array.from(new Set(skills.map((skill) => canonicalSkill(skill))));
+    if (canonical.length !== skills.length || canonical.some((skill, i) => skill !== skills[i])) {
+      operations.push({ updateOne: { filter: { _id: job._id }, update: { $set: { skills: canonical } } } });
+      if (operations.length >= BATCH_SIZE) {
+        await flush();
+        console.log(`Updated ${updated} of ${scanned} jobs so far`);
+      }
+    }
+  }
+  await flush();
+  return { scanned, updated };
+}
+
+// Connect to MongoDB and run the migration
+async function run() {
+  try {
+    const mongoURI = process.env.MONGODB_URI || 'mongodb://localhost:27017/career-bloom';
+    await mongoose.connect(mongoURI);
+    console.log('Connected to MongoDB');
+
+    const { scanned, updated } = await migrateSkillCasing();
+    console.log(`Skill casing migration completed: ${updated} of ${scanned} jobs updated`);
+  } catch (error) {
+    console.error('Error migrating skill casing:', error);
+    process.exitCode = 1;
+  } finally {
+    await mongoose.disconnect();
+    console.log('Disconnected from MongoDB');
+  }
+}
+
+// Run the script
+run().catch(console.error);
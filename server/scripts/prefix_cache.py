@@ -0,0 +1,109 @@
+"""
+Prompt-prefix KV-cache reuse for the resume customizer.
+
+Every prompt starts with the same instruction block, so its attention keys
+and values are identical across requests. PrefixCachedGenerator runs that
+block through the model once, keeps the resulting past_key_values, and
+hands generate() a copy of them for each request. Only the job post and
+resume tokens are then prefilled per request.
+
+Several variants of one prompt (num_return_sequences > 1) share the prefill
+as well: the prompt is prefilled once at batch size 1, the cache is then
+repeated once per variant, and generate() decodes the variants as one batch
+until the last of them ends.
+
+The llama.cpp backend needs none of this: llama-cpp-python already keeps
+the KV cache of the previous prompt and reuses its longest common prefix.
+"""
+import copy
+import sys
+import time
+
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+
+class FirstTokenTimer:
+    """Stopping criterion that never stops, only records when the first new token appeared."""
+
+    def __init__(self):
+        self.first_token_at = None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        return False
+
+class PrefixCachedGenerator:
+    """
+    Wraps a TextGenerationPipeline with return_full_text=False and keeps the
+    call contract: generator(prompt, **generation_kwargs) returns
+    [{'generated_text': ...}]. Prompt lists and prompts that do not start
+    with the prefix go straight to the pipeline.
+    """
+
+    def __init__(self, pipeline, prefix):
+        self.pipeline = pipeline
+        self.tokenizer = pipeline.tokenizer
+        self.model = pipeline.model
+        self.prefix = prefix
+
+        self.prefix_ids = self.tokenizer(prefix, return_tensors='pt').input_ids.to(self.model.device)
+        with torch.no_grad():
+            self.prefix_cache = self.model(input_ids=self.prefix_ids, use_cache=True).past_key_values
+            # Time a second, warm pass: the first one includes one-off kernel and allocator warmup
+            started = time.perf_counter()
+            self.model(input_ids=self.prefix_ids, use_cache=True)
+            self.prefix_prefill_ms = (time.perf_counter() - started) * 1000.0
+        print(f"Debug: Cached the KV state of the {self.prefix_ids.shape[-1]}-token prompt prefix; "
+              f"a warm prefill of it takes {self.prefix_prefill_ms:.0f} ms (prefixPrefillMs).", file=sys.stderr)
+
+    def __call__(self, prompt, timings=None, **generation_kwargs):
+        """
+        Generates num_return_sequences completions (default 1) for prompt.
+
+        If timings is a dict, it is filled with prefillMs (time to the first
+        new token), prefixTokens and suffixTokens. The prefill the cache saves
+        depends on the prefix length, not the request; prefix_prefill_ms
+        holds a warm measurement of it taken at load time.
+        """
+        if not isinstance(prompt, str) or not prompt.startswith(self.prefix):
+            return self.pipeline(prompt, **generation_kwargs)
+
+        # The suffix is tokenized on its own (no BOS) and appended to the cached prefix ids
+        suffix_ids = self.tokenizer(prompt[len(self.prefix):], add_special_tokens=False,
+                                    return_tensors='pt').input_ids.to(self.model.device)
+        input_ids = torch.cat([self.prefix_ids, suffix_ids], dim=-1)
+
+        generation_kwargs = dict(generation_kwargs)
+        variants = generation_kwargs.pop('num_return_sequences', None) or 1
+        generation_kwargs.setdefault('pad_token_id', self.tokenizer.pad_token_id)
+        timer = FirstTokenTimer()
+        started = time.perf_counter()
+        with torch.no_grad():
+            # generate() extends the cache in place, so every request gets its own copy
+            cache = copy.deepcopy(self.prefix_cache)
+            if variants > 1:
+                # Prefill everything but the last prompt token once, then give each variant a copy;
+                # generate() only has to run that last token, for all variants in one batch
+                if suffix_ids.shape[-1] > 1:
+                    self.model(input_ids=suffix_ids[:, :-1], past_key_values=cache, use_cache=True)
+                cache.batch_repeat_interleave(variants)
+                input_ids = input_ids.repeat(variants, 1)
+            output = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                past_key_values=cache,
+                stopping_criteria=transformers.StoppingCriteriaList([timer]),
+                **generation_kwargs
+            )
+        texts = self.tokenizer.batch_decode(output[:, input_ids.shape[-1]:], skip_special_tokens=True)
+
+        if timings is not None:
+            timings.update({
+                'prefillMs': round(((timer.first_token_at or time.perf_counter()) - started) * 1000.0, 2),
+                'prefixTokens': self.prefix_ids.shape[-1],
+                'suffixTokens': suffix_ids.shape[-1]
+            })
+        return [{'generated_text': text} for text in texts]
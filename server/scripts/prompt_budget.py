@@ -0,0 +1,99 @@
+"""
+Token budget for resume customization prompts.
+
+The job text and resume are interpolated into a fixed template. Without a
+limit, a huge paste wastes prefill time or pushes prompt + max_new_tokens
+past the context window, which only surfaces as a generic inference error.
+fit_prompt_inputs() tokenizes each input once and then:
+
+  1. strips benefits and equal-opportunity boilerplate from the job text
+  2. reserves max_new_tokens and the template's own tokens
+  3. gives the resume priority, since it is what gets rewritten, but keeps
+     up to JOB_TEXT_RESERVE tokens of the job text
+  4. gives whatever is left to the job text
+
+An input over its share is cut at a token boundary, then back to the last
+line break where one is close by.
+"""
+import os
+import sys
+
+from job_digest import strip_boilerplate
+from resume_backends import GGUF_CONTEXT, decode_tokens, encode_tokens
+
+# Context window the prompt and completion must fit in. It defaults to the
+# llama.cpp n_ctx; Mistral-7B-Instruct-v0.2 accepts more, but prefilling more than
+# that is rarely worth its cost for a resume.
+CONTEXT_TOKENS = int(os.environ.get('RESUME_CONTEXT_TOKENS', str(GGUF_CONTEXT)))
+
+# Job text tokens kept before the resume starts to be cut
+JOB_TEXT_RESERVE = int(os.environ.get('RESUME_JOB_TEXT_RESERVE', '768'))
+
+# Slack for tokens that merge differently where the template and the inputs meet
+MARGIN_TOKENS = 16
+
+# (generator, template token count) of the last generator seen; the template never changes
+_template_tokens = (None, 0)
+
+def template_tokens(generator, build_prompt):
+    """Tokens the prompt template adds around the inputs."""
+    global _template_tokens
+    if _template_tokens[0] is not generator:
+        _template_tokens = (generator, len(encode_tokens(generator, build_prompt('', ''))))
+    return _template_tokens[1]
+
+def _truncate(generator, ids, keep):
+    text = decode_tokens(generator, ids[:keep])
+    # Prefer to end on a whole line when that loses less than a fifth of the kept text
+    cut = text.rfind('\n')
+    if cut > len(text) * 0.8:
+        text = text[:cut]
+    return text.rstrip()
+
+def fit_prompt_inputs(generator, job_text, resume, max_new_tokens, build_prompt, context_tokens=CONTEXT_TOKENS):
+    """
+    Trims the job text and resume so build_prompt(job_text, resume) plus
+    max_new_tokens fits in context_tokens.
+
+    Returns:
+        (job_text, resume, report), where report holds the token counts used:
+        contextTokens, maxNewTokens, templateTokens, promptTokens, jobTokens /
+        jobTokensIn, resumeTokens / resumeTokensIn, boilerplateChars (removed
+        from the job text) and truncated.
+
+    Raises:
+        ValueError: if max_new_tokens and the template alone fill the context.
+    """
+    job_text, boilerplate_chars = strip_boilerplate(job_text)
+    overhead = template_tokens(generator, build_prompt)
+    available = context_tokens - max_new_tokens - overhead - MARGIN_TOKENS
+    if available <= 0:
+        raise ValueError(f"max_new_tokens={max_new_tokens} leaves no room for the prompt "
+                         f"in a {context_tokens}-token context")
+
+    job_ids = encode_tokens(generator, job_text)
+    resume_ids = encode_tokens(generator, resume)
+    resume_keep = min(len(resume_ids), max(available - min(len(job_ids), JOB_TEXT_RESERVE), 0))
+    job_keep = min(len(job_ids), available - resume_keep)
+
+    if job_keep < len(job_ids):
+        job_text = _truncate(generator, job_ids, job_keep)
+    if resume_keep < len(resume_ids):
+        resume = _truncate(generator, resume_ids, resume_keep)
+    truncated = job_keep < len(job_ids) or resume_keep < len(resume_ids)
+    if truncated:
+        print(f"Debug: Prompt inputs cut to fit the context: job text {len(job_ids)} -> {job_keep} tokens, "
+              f"resume {len(resume_ids)} -> {resume_keep} tokens.", file=sys.stderr)
+
+    return job_text, resume, {
+        'contextTokens': context_tokens,
+        'maxNewTokens': max_new_tokens,
+        'templateTokens': overhead,
+        'promptTokens': overhead + job_keep + resume_keep,
+        'jobTokens': job_keep,
+        'jobTokensIn': len(job_ids),
+        'resumeTokens': resume_keep,
+        'resumeTokensIn': len(resume_ids),
+        'boilerplateChars': boilerplate_chars,
+        'truncated': truncated
+    }
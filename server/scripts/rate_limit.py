@@ -0,0 +1,57 @@
+"""
+Token-bucket rate limits for the scrapers.
+
+A TokenBucket holds up to burst tokens and refills at rate tokens per
+second; acquire() takes one, sleeping until one is available. Callers take
+a token before they issue a request, so the limit holds back the request
+itself rather than the handling of its response. HostRateLimiter keeps one
+bucket per host, so concurrent workers against the same site share its
+budget. The clock and sleep are injectable so the limits can be tested
+without waiting.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """Allows rate acquisitions per second on average, with bursts of up to burst; acquire() blocks."""
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Take the token now, going into debt if need be, and sleep the debt off; later callers
+        # queue behind it, and there is no retry loop to spin on rounding error
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            self.sleep(wait)
+
+class HostRateLimiter:
+    """One TokenBucket per host, so concurrent queries against the same site share its budget."""
+
+    def __init__(self, rate, burst, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url or "").netloc or "default"
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst, self.clock, self.sleep)
+        bucket.acquire()
@@ -0,0 +1,326 @@
+"""
+Inference backends for the resume customizer.
+
+  bnb4 - the original path: bitsandbytes 4-bit weights on the GPU (needs CUDA)
+  int8 - the model on the CPU with its Linear layers dynamically quantized to int8
+  gguf - a 4-bit GGUF build of the same model run by llama.cpp (llama-cpp-python) on the CPU
+
+'auto' picks bnb4 when CUDA is available. Otherwise it picks gguf if the
+GGUF file is present, else int8. Every backend is returned as a callable
+with the TextGenerationPipeline contract: generator(prompt, **generation_kwargs)
+returns [{'generated_text': <completion only>}]. So the same prompt and
+generation settings from resume_customizer_script work unchanged.
+stream_generate() yields the same completion piece by piece for any backend.
+
+Quantizing in-process means loading the fp32 weights first (about 29 GB for
+a 7B model), so the int8 backend loads a quantized copy converted once,
+on a machine with enough RAM, and written next to the other models:
+
+    python resume_backends.py export --backend int8
+"""
+import argparse
+import os
+import sys
+import threading
+
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+
+BACKENDS = ('auto', 'bnb4', 'int8', 'gguf')
+
+# Quantized GGUF build of Mistral-7B-Instruct-v0.2, e.g. mistral-7b-instruct-v0.2.Q4_K_M.gguf
+GGUF_PATH = os.environ.get('RESUME_GGUF_PATH', os.path.join(
+    os.path.dirname(__file__), '..', 'models', 'mistral-7b-instruct-v0.2.Q4_K_M.gguf'))
+GGUF_CONTEXT = int(os.environ.get('RESUME_GGUF_CONTEXT', '8192'))
+
+# Directory of the int8 export: the quantized state_dict plus the config and tokenizer
+INT8_PATH = os.environ.get('RESUME_INT8_PATH', os.path.join(
+    os.path.dirname(__file__), '..', 'models', 'mistral-7b-instruct-v0.2-int8'))
+# Exports from before the state_dict format pickled the whole module (model_int8.pt) and have to be redone
+INT8_WEIGHTS = 'model_int8_state.pt'
+
+def resolve_backend(backend='auto'):
+    """Turns 'auto' into a concrete backend for this machine."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    if backend != 'auto':
+        return backend
+    if torch.cuda.is_available():
+        return 'bnb4'
+    return 'gguf' if os.path.exists(GGUF_PATH) else 'int8'
+
+class LlamaCppGenerator:
+    """Runs a GGUF model through llama.cpp behind the TextGenerationPipeline call contract."""
+
+    def __init__(self, model_path=GGUF_PATH, n_ctx=GGUF_CONTEXT, draft_model=None):
+        llama_cpp = lazy_import("llama_cpp")
+        self.llm = llama_cpp.Llama(model_path=model_path, n_ctx=n_ctx, n_threads=os.cpu_count(),
+                                   draft_model=draft_model, verbose=False)
+
+    def count_tokens(self, text):
+        return len(self.llm.tokenize(text.encode('utf-8'), add_bos=False))
+
+    def __call__(self, prompt, max_new_tokens=256, do_sample=True, temperature=0.7, top_k=50, top_p=0.95,
+                 num_return_sequences=1, **kwargs):
+        if not isinstance(prompt, str):
+            # llama.cpp decodes one sequence at a time, so a batch runs prompt by prompt
+            return [self(text, max_new_tokens, do_sample, temperature, top_k, top_p) for text in prompt]
+        completion_kwargs = self._completion_kwargs(max_new_tokens, do_sample, temperature, top_k, top_p)
+        # Variants decode one after another, but each reuses the prompt's KV cache from the one before
+        return [{'generated_text': self.llm(prompt, **completion_kwargs)['choices'][0]['text']}
+                for _ in range(max(num_return_sequences or 1, 1))]
+
+    def stream(self, prompt, max_new_tokens=256, do_sample=True, temperature=0.7, top_k=50, top_p=0.95, **kwargs):
+        """Yields the completion of prompt piece by piece as llama.cpp decodes it."""
+        for chunk in self.llm(prompt, stream=True,
+                              **self._completion_kwargs(max_new_tokens, do_sample, temperature, top_k, top_p)):
+            yield chunk['choices'][0]['text']
+
+    @staticmethod
+    def _completion_kwargs(max_new_tokens, do_sample, temperature, top_k, top_p):
+        return {
+            'max_tokens': max_new_tokens,
+            # llama.cpp has no do_sample switch; temperature 0 is greedy decoding
+            'temperature': temperature if do_sample else 0.0,
+            'top_k': top_k,
+            'top_p': top_p
+        }
+
+def _load_bnb4(model_id):
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_id)
+
+    # Set pad_token_id to eos_token_id to avoid issues with batching (even batch size 1 can benefit)
+    if tokenizer.pad_token_id is None:
+        tokenizer.pad_token_id = tokenizer.eos_token_id
+    # Decoder-only models must be left-padded for batched generation (section rewrites)
+    tokenizer.padding_side = 'left'
+
+    # Configure 4-bit quantization for lower VRAM usage
+    bnb_config = transformers.BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_use_double_quant=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.bfloat16 # Use bfloat16 for computation if possible
+    )
+
+    # Load the model with quantization and automatic device mapping
+    # device_map="auto" attempts to put model layers on available GPUs and then CPU
+    model = transformers.AutoModelForCausalLM.from_pretrained(
+        model_id,
+        quantization_config=bnb_config,
+        device_map="auto",
+        torch_dtype=torch.bfloat16 # Use bfloat16 if supported for potentially better performance/VRAM
+    )
+    print("Debug: Model loaded with 4-bit quantization and device mapping.", file=sys.stderr)
+
+    # Determine device for the pipeline
+    device = 0 if torch.cuda.is_available() else -1
+    if torch.cuda.is_available():
+        print(f"Debug: CUDA available, using device {device}.", file=sys.stderr)
+    else:
+        print("Debug: CUDA not available, using CPU. Inference will be very slow.", file=sys.stderr)
+
+    return transformers.TextGenerationPipeline(
+        model=model,
+        tokenizer=tokenizer,
+        device=device,
+        # Set return_full_text=False to only get the generated part, not the prompt
+        return_full_text=False
+    )
+
+def _available_memory():
+    """Bytes of RAM the process can still take without swapping, or None when unknown."""
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _fp32_footprint(model_id):
+    """Bytes the model's weights take in fp32, counted on the meta device without loading them."""
+    config = transformers.AutoConfig.from_pretrained(model_id)
+    with torch.device('meta'):
+        model = transformers.AutoModelForCausalLM.from_config(config)
+    return sum(parameter.numel() for parameter in model.parameters()) * 4
+
+def _int8_tokenizer(path):
+    tokenizer = transformers.AutoTokenizer.from_pretrained(path)
+    if tokenizer.pad_token_id is None:
+        tokenizer.pad_token_id = tokenizer.eos_token_id
+    # Decoder-only models must be left-padded for batched generation (section rewrites)
+    tokenizer.padding_side = 'left'
+    return tokenizer
+
+def _quantize_fp32(model_id):
+    # Dynamic quantization works on fp32 modules; the int8 weights then replace the fp32 ones
+    model = transformers.AutoModelForCausalLM.from_pretrained(model_id, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _int8_skeleton(path):
+    """
+    The int8 model's modules without weights: the architecture is built on the meta device,
+    so no fp32 weights are allocated, and every Linear is swapped for the dynamic int8
+    Linear that quantize_dynamic puts in its place.
+    """
+    with torch.device('meta'):
+        model = transformers.AutoModelForCausalLM.from_config(transformers.AutoConfig.from_pretrained(path),
+                                                              torch_dtype=torch.float32)
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if isinstance(child, torch.nn.Linear):
+                setattr(module, name, torch.ao.nn.quantized.dynamic.Linear(
+                    child.in_features, child.out_features, bias_=child.bias is not None, dtype=torch.qint8))
+    return model
+
+def _load_int8_export(path):
+    """
+    Rebuilds the quantized module and loads the export's state_dict into it.
+
+    Dynamically quantized modules are not loadable through from_pretrained, so the
+    weights are read with weights_only=True (no pickled code runs) into a skeleton
+    with the same modules quantize_dynamic produced at export time.
+    """
+    model = _int8_skeleton(path)
+    state = torch.load(os.path.join(path, INT8_WEIGHTS), weights_only=True)
+    persistent = set(model.state_dict())
+    model.load_state_dict({name: value for name, value in state.items() if name in persistent}, assign=True)
+    # Non-persistent buffers (the rotary frequencies) are left out of a state_dict; the export saves them too
+    for name, buffer in list(model.named_buffers()):
+        if buffer.is_meta:
+            module_name, _, buffer_name = name.rpartition('.')
+            model.get_submodule(module_name)._buffers[buffer_name] = state[name]
+    model.generation_config = transformers.GenerationConfig.from_pretrained(path)
+    model.eval()
+    return model
+
+def _load_int8(model_id):
+    weights_path = os.path.join(INT8_PATH, INT8_WEIGHTS)
+    if os.path.exists(weights_path):
+        tokenizer = _int8_tokenizer(INT8_PATH)
+        model = _load_int8_export(INT8_PATH)
+        print(f"Debug: Loaded the int8 export from {INT8_PATH}.", file=sys.stderr)
+    else:
+        # Without an export the fp32 weights have to fit in RAM before they can be quantized
+        footprint = _fp32_footprint(model_id)
+        available = _available_memory()
+        if available is not None and available < footprint:
+            raise MemoryError(
+                f"No int8 export at {INT8_PATH}, and quantizing in-process needs {footprint / 2**30:.1f} GB "
+                f"for the fp32 weights but only {available / 2**30:.1f} GB is available. "
+                f"Run on a larger machine: python resume_backends.py export --backend int8"
+            )
+        print(f"Debug: No int8 export at {INT8_PATH}; quantizing the fp32 model in-process "
+              f"({footprint / 2**30:.1f} GB peak). Export it once with: "
+              f"python resume_backends.py export --backend int8", file=sys.stderr)
+        tokenizer = _int8_tokenizer(model_id)
+        model = _quantize_fp32(model_id)
+    torch.set_num_threads(os.cpu_count())
+    print("Debug: Model loaded on the CPU with int8 dynamic quantization.", file=sys.stderr)
+
+    return transformers.TextGenerationPipeline(model=model, tokenizer=tokenizer, device=-1, return_full_text=False)
+
+def export_int8(model_id, output_path=INT8_PATH):
+    """Quantizes the fp32 model to int8 once and writes it, with its tokenizer, to output_path."""
+    os.makedirs(output_path, exist_ok=True)
+    model = _quantize_fp32(model_id)
+    # Every buffer is saved, non-persistent ones included, so the loader's meta skeleton is fully filled in
+    torch.save(dict(model.state_dict(), **dict(model.named_buffers())), os.path.join(output_path, INT8_WEIGHTS))
+    model.config.save_pretrained(output_path)
+    model.generation_config.save_pretrained(output_path)
+    transformers.AutoTokenizer.from_pretrained(model_id).save_pretrained(output_path)
+    print(f"Exported int8 backend to {output_path}", file=sys.stderr)
+    return output_path
+
+def load_pipeline(backend, model_id, draft_model=None):
+    """
+    Loads the resume model with the given backend ('auto' is resolved first).
+
+    draft_model is a llama-cpp-python drafter for speculative decoding and only
+    applies to gguf; HF backends get theirs as generate() kwargs (see speculative.py).
+    """
+    backend = resolve_backend(backend)
+    if backend == 'bnb4':
+        return _load_bnb4(model_id)
+    if backend == 'int8':
+        return _load_int8(model_id)
+    if not os.path.exists(GGUF_PATH):
+        raise FileNotFoundError(f"No GGUF model at {GGUF_PATH}. Download one or set RESUME_GGUF_PATH.")
+    print(f"Debug: Loading GGUF model from {GGUF_PATH} with llama.cpp.", file=sys.stderr)
+    return LlamaCppGenerator(GGUF_PATH, draft_model=draft_model)
+
+def count_tokens(generator, text):
+    """Number of tokens in text for any backend's generator."""
+    if isinstance(generator, LlamaCppGenerator):
+        return generator.count_tokens(text)
+    return len(generator.tokenizer(text, add_special_tokens=False)['input_ids'])
+
+def encode_tokens(generator, text):
+    """Token ids of text (without BOS) for any backend's generator."""
+    if isinstance(generator, LlamaCppGenerator):
+        return generator.llm.tokenize(text.encode('utf-8'), add_bos=False)
+    return generator.tokenizer(text, add_special_tokens=False)['input_ids']
+
+def decode_tokens(generator, ids):
+    """Text of token ids for any backend's generator."""
+    if isinstance(generator, LlamaCppGenerator):
+        return generator.llm.detokenize(ids).decode('utf-8', errors='ignore')
+    return generator.tokenizer.decode(ids, skip_special_tokens=True)
+
+def stream_generate(generator, prompt, **generation_kwargs):
+    """
+    Yields the completion of prompt as text pieces while it is generated.
+
+    HF generators run in a background thread and hand decoded text over
+    through a TextIteratorStreamer; a generation error is re-raised here once
+    the pieces produced before it have been yielded.
+    """
+    if isinstance(generator, LlamaCppGenerator):
+        yield from generator.stream(prompt, **generation_kwargs)
+        return
+
+    streamer = transformers.TextIteratorStreamer(generator.tokenizer, skip_prompt=True, skip_special_tokens=True)
+    errors = []
+
+    def run_generation():
+        try:
+            generator(prompt, streamer=streamer, **generation_kwargs)
+        except Exception as gen_error:
+            errors.append(gen_error)
+            # Unblock the consumer loop below
+            streamer.end()
+
+    thread = threading.Thread(target=run_generation, daemon=True)
+    thread.start()
+    for text in streamer:
+        yield text
+    thread.join()
+    if errors:
+        raise errors[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the resume model for an alternative inference backend.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="Write a converted copy of the model for a CPU backend.")
+    export_parser.add_argument('--backend', choices=('int8',), required=True)
+    export_parser.add_argument('--model-id', default="mistralai/Mistral-7B-Instruct-v0.2")
+    export_parser.add_argument('--output', default=INT8_PATH)
+    args = parser.parse_args()
+
+    try:
+        export_int8(args.model_id, args.output)
+    except Exception as e:
+        print(f"Error exporting {args.backend} backend: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,102 +1,117 @@
+import argparse
 import sys
 import json
 import os
+import time
 
 # --- IMPORTS FOR Hugging Face Transformers ---
 # You'll need to install these libraries in your Python environment where this script will run:
 # pip install transformers torch accelerate bitsandbytes sentencepiece
 # Ensure torch is installed with CUDA support if you have an NVIDIA GPU:
 # pip install torch torchvision torchaudio --index-url https://download.pytorch.org/whl/cu118 # Example for CUDA 11.8
-from transformers import AutoModelForCausalLM, AutoTokenizer, TextGenerationPipeline, BitsAndBytesConfig
-import torch
+# These are imported lazily: nothing is loaded until inference actually needs it,
+# so invalid-input requests return without paying the transformers/torch import.
+from lazy_imports import lazy_import
+transformers = lazy_import("transformers")
+torch = lazy_import("torch")
+from resume_backends import BACKENDS, count_tokens, load_pipeline, resolve_backend, stream_generate
+from prefix_cache import PrefixCachedGenerator
+from speculative import draft_generation_kwargs, llama_cpp_draft
+from job_digest import cached_job_digest, format_digest
+from resume_sections import plan_rewrites, split_sections, stitch_sections
+from resume_fastpath import fast_customize
+from prompt_budget import fit_prompt_inputs
 # ---------------------------------------------
 
 # --- MODEL LOADING ---
 # Define the model ID for Mistral 7B Instruct v0.2
 model_id = "mistralai/Mistral-7B-Instruct-v0.2"
 
+# Inference backend: 'bnb4' (4-bit on the GPU), 'int8' or 'gguf' (CPU), or 'auto' to pick
+# bnb4 when CUDA is available and a CPU backend otherwise (see resume_backends.py)
+BACKEND = os.environ.get('RESUME_MODEL_BACKEND', 'auto')
+
+# How a resume is rewritten: 'single' sends the whole resume in one prompt, 'sections'
+# rewrites each section against a job digest in its own (batched) generation, and 'fast'
+# only reorders bullets and skills by relevance, without the model (see resume_fastpath.py)
+STRATEGIES = ('single', 'sections', 'fast')
+STRATEGY = os.environ.get('RESUME_STRATEGY', 'single')
+
+# Serve the 'fast' result instead of an error when the model cannot be loaded
+# (and, in the resident server, when its queue is full)
+FAST_FALLBACK = os.environ.get('RESUME_FAST_FALLBACK', '1').lower() not in ('0', 'false', 'no')
+
+# When to put the cached job digest (requirements, keywords, tone) in the prompt instead of the
+# full job post: 'auto' only when the full post would have to be cut to fit the prompt budget,
+# 'always' (or 1) to save prefill time on every request, 'never' (or 0)
+_job_digest_setting = os.environ.get('RESUME_JOB_DIGEST', 'auto').lower()
+JOB_DIGEST_MODE = {'1': 'always', 'true': 'always', 'yes': 'always',
+                   '0': 'never', 'false': 'never', 'no': 'never'}.get(_job_digest_setting, _job_digest_setting)
+
+# Speculative decoding drafter: a small model id/path, 'prompt-lookup', or empty for plain decoding
+DRAFT_MODEL = os.environ.get('RESUME_DRAFT_MODEL', '')
+
+# Extra generate() kwargs that turn on assisted decoding, set when the model loads
+speculative_kwargs = {}
+
+# Keep the KV cache of the fixed instruction block between requests (HF backends only)
+PREFIX_CACHE = os.environ.get('RESUME_PREFIX_CACHE', '1').lower() not in ('0', 'false', 'no')
+
 # Global variable to hold the text generation pipeline
 text_generator = None
 
+# A failed model load is remembered so the requests that follow fail (or fall back) at once
+# instead of each retrying the full load. The retry delay doubles after every failure,
+# from RESUME_LOAD_RETRY_SECONDS up to RESUME_LOAD_RETRY_MAX_SECONDS.
+LOAD_RETRY_SECONDS = float(os.environ.get('RESUME_LOAD_RETRY_SECONDS', '30'))
+LOAD_RETRY_MAX_SECONDS = float(os.environ.get('RESUME_LOAD_RETRY_MAX_SECONDS', '600'))
+load_failures = 0
+load_retry_at = 0.0
+
 def load_model():
-    """Loads the LLM model and tokenizer into a text generation pipeline."""
-    global text_generator
+    """
+    Loads the LLM model and tokenizer into a text generation pipeline.
+
+    On failure text_generator stays None, and later calls return without
+    touching the model until the retry delay has passed.
+    """
+    global text_generator, speculative_kwargs, load_failures, load_retry_at
     if text_generator is not None:
         print("Debug: Model already loaded.", file=sys.stderr)
         return
+    if load_failures and time.monotonic() < load_retry_at:
+        print(f"Debug: Model load failed recently, next retry in {load_retry_at - time.monotonic():.0f}s.",
+              file=sys.stderr)
+        return
 
     try:
-        print(f"Debug: Attempting to load model: {model_id}...", file=sys.stderr)
-        tokenizer = AutoTokenizer.from_pretrained(model_id)
-
-        # Set pad_token_id to eos_token_id to avoid issues with batching (even batch size 1 can benefit)
-        if tokenizer.pad_token_id is None:
-             tokenizer.pad_token_id = tokenizer.eos_token_id
-
-        # Configure 4-bit quantization for lower VRAM usage
-        bnb_config = BitsAndBytesConfig(
-            load_in_4bit=True,
-            bnb_4bit_use_double_quant=True,
-            bnb_4bit_quant_type="nf4",
-            bnb_4bit_compute_dtype=torch.bfloat16 # Use bfloat16 for computation if possible
-        )
-
-        # Load the model with quantization and automatic device mapping
-        # device_map="auto" attempts to put model layers on available GPUs and then CPU
-        model = AutoModelForCausalLM.from_pretrained(
-            model_id,
-            quantization_config=bnb_config,
-            device_map="auto",
-            torch_dtype=torch.bfloat16 # Use bfloat16 if supported for potentially better performance/VRAM
-        )
-        print("Debug: Model loaded with 4-bit quantization and device mapping.", file=sys.stderr)
-
-        # Determine device for the pipeline
-        device = 0 if torch.cuda.is_available() else -1
-        if torch.cuda.is_available():
-            print(f"Debug: CUDA available, using device {device}.", file=sys.stderr)
+        backend = resolve_backend(BACKEND)
+        print(f"Debug: Attempting to load model: {model_id} with the {backend} backend...", file=sys.stderr)
+        if backend == 'gguf':
+            text_generator = load_pipeline(backend, model_id, draft_model=llama_cpp_draft(DRAFT_MODEL))
         else:
-             print("Debug: CUDA not available, using CPU. Inference will be very slow.", file=sys.stderr)
-
-
-        # Initialize the text generation pipeline
-        text_generator = TextGenerationPipeline(
-            model=model,
-            tokenizer=tokenizer,
-            device=device,
-            # Set return_full_text=False to only get the generated part, not the prompt
-            return_full_text=False
-        )
+            text_generator = load_pipeline(backend, model_id)
+            try:
+                speculative_kwargs = draft_generation_kwargs(DRAFT_MODEL, text_generator)
+            except Exception as e:
+                print(f"Debug: Draft model unavailable, decoding without it: {e}", file=sys.stderr)
+                speculative_kwargs = {}
+        if PREFIX_CACHE and backend != 'gguf':
+            text_generator = PrefixCachedGenerator(text_generator, PROMPT_PREFIX)
+        load_failures = 0
         print("Debug: Text generation pipeline created successfully.", file=sys.stderr)
 
     except Exception as e:
-        print(f"Error loading model: {e}", file=sys.stderr)
+        delay = min(LOAD_RETRY_SECONDS * 2 ** load_failures, LOAD_RETRY_MAX_SECONDS)
+        load_failures, load_retry_at = load_failures + 1, time.monotonic() + delay
+        print(f"Error loading model: {e}; retrying in {delay:.0f}s", file=sys.stderr)
         # Set generator to None to indicate failure
         text_generator = None
 
-def customize_resume_with_llm(job_post: str, resume: str) -> str:
-    """
-    Uses the loaded Mistral 7B Instruct v0.2 model with prompt engineering to customize a resume.
-
-    Args:
-        job_post: The text content of the job description.
-        resume: The text content of the user's resume.
-
-    Returns:
-        The customized resume text generated by the LLM, or an error message.
-    """
-    # Ensure the model is loaded before attempting to use it
-    if text_generator is None:
-         print("Debug: Model not loaded, attempting to load now.", file=sys.stderr)
-         load_model()
-         if text_generator is None:
-            return "Error: LLM model failed to load. Cannot customize resume."
-
-    print("Debug: Received job_post and resume data for customization.", file=sys.stderr)
-
-    # --- PROMPT ENGINEERING: Craft a detailed prompt for the LLM ---
-    # Using the instruct format [INST] ... [/INST] for Mistral Instruct models.
-    prompt = f"""[INST] You are an expert career coach and resume writer. Your task is to take a user's resume and tailor it specifically for a given job description.
+# Fixed instruction block that starts every prompt. It never changes between requests, so
+# the HF backends keep its attention KV cache and only encode what follows (see prefix_cache.py).
+# Using the instruct format [INST] ... [/INST] for Mistral Instruct models.
+PROMPT_PREFIX = """[INST] You are an expert career coach and resume writer. Your task is to take a user's resume and tailor it specifically for a given job description.
 
 Follow these steps carefully:
 1.  **Analyze the Job Description:** Read the provided job description thoroughly. Identify the key requirements, required skills (both technical and soft), qualifications, responsibilities, company culture hints, and overall tone. Prioritize the most important keywords and phrases used in the job post.
@@ -113,7 +128,11 @@ Follow these steps carefully:
 
 Here is the Job Description:
 ---
-{job_post}
+"""
+
+def build_prompt(job_post: str, resume: str) -> str:
+    """The instruction prompt shared by every backend: PROMPT_PREFIX, then the job post and resume."""
+    return PROMPT_PREFIX + f"""{job_post}
 ---
 
 Here is the User's Original Resume:
@@ -123,26 +142,111 @@ Here is the User's Original Resume:
 
 Please provide the customized resume based on these instructions: [/INST]
 """
-    # Using the instruct format [INST] ... [/INST] for Mistral Instruct models.
+
+# Generation parameters shared by every backend; adjust as needed
+GENERATION_KWARGS = {
+    'max_new_tokens': 1500, # Maximum number of tokens to generate
+    'num_return_sequences': 1, # We only need one generated resume
+    'do_sample': True, # Use sampling for more varied output
+    'top_k': 50,       # Consider top 50 most likely tokens
+    'top_p': 0.95,     # Use nucleus sampling
+    'temperature': 0.7,# Control creativity (lower = more focused)
+}
+
+def job_digest_text(job_post: str, timings: dict = None) -> str:
+    """The compact cached digest of a job post, as prompt text."""
+    digest, hit = cached_job_digest(job_post)
+    text = format_digest(digest)
+    if timings is not None:
+        timings.update({'jobDigest': 'hit' if hit else 'miss', 'jobPostChars': len(job_post), 'jobDigestChars': len(text)})
+    return text
+
+def budgeted_prompt(job_post: str, resume: str, timings: dict) -> str:
+    """
+    build_prompt() for the loaded model with the job text and resume trimmed
+    so the prompt plus max_new_tokens fits the context window (see
+    prompt_budget.py). The token counts used go to timings['promptBudget'].
+
+    The full job post is used unless JOB_DIGEST_MODE says otherwise: with
+    'auto', the digest replaces it only when the post would have been cut.
+    """
+    max_new_tokens = GENERATION_KWARGS['max_new_tokens']
+    if JOB_DIGEST_MODE == 'always':
+        job_text, fitted_resume, budget = fit_prompt_inputs(
+            text_generator, job_digest_text(job_post, timings), resume, max_new_tokens, build_prompt)
+    else:
+        job_text, fitted_resume, budget = fit_prompt_inputs(
+            text_generator, job_post, resume, max_new_tokens, build_prompt)
+        if JOB_DIGEST_MODE == 'auto' and budget['jobTokens'] < budget['jobTokensIn']:
+            job_text, fitted_resume, budget = fit_prompt_inputs(
+                text_generator, job_digest_text(job_post, timings), resume, max_new_tokens, build_prompt)
+    timings['promptBudget'] = budget
+    return build_prompt(job_text, fitted_resume)
+
+def customize_resume_with_llm(job_post: str, resume: str, timings: dict = None) -> str:
+    """
+    Uses the loaded Mistral 7B Instruct v0.2 model with prompt engineering to customize a resume.
+
+    Args:
+        job_post: The text content of the job description.
+        resume: The text content of the user's resume.
+        timings: Optional dict filled with generationMs, the job digest cache outcome
+            and size, the prompt token budget, and, when the prompt prefix is cached, prefillMs /
+            prefixTokens / suffixTokens.
+
+    Returns:
+        The customized resume text generated by the LLM, or an error message.
+    """
+    result = customize_resume_variants_with_llm(job_post, resume, 1, timings)
+    return result if isinstance(result, str) else result[0]
+
+def customize_resume_variants_with_llm(job_post: str, resume: str, num_variants: int = 1, timings: dict = None):
+    """
+    Generates num_variants alternative customized resumes in one batched generation.
+
+    The prompt is prefilled once and shared by every variant (see
+    prefix_cache.py), and decoding stops when the last variant ends.
+    Assisted decoding handles one sequence at a time, so it is only used
+    for a single variant. timings is filled as in customize_resume_with_llm.
+
+    Returns:
+        A list of num_variants resume texts, or an error message.
+    """
+    # Ensure the model is loaded before attempting to use it
+    if text_generator is None:
+         print("Debug: Model not loaded, attempting to load now.", file=sys.stderr)
+         load_model()
+         if text_generator is None:
+            return "Error: LLM model failed to load. Cannot customize resume."
+
+    print("Debug: Received job_post and resume data for customization.", file=sys.stderr)
+    timings = timings if timings is not None else {}
+
+    # --- PROMPT ENGINEERING: Craft a detailed prompt for the LLM (see build_prompt) ---
+    try:
+        prompt = budgeted_prompt(job_post, resume, timings)
+    except ValueError as e:
+        return f"Error: {e}"
     # -----------------------------------------------------------
 
     # --- LLM Inference using the pipeline ---
     try:
         print("Debug: Generating text with LLM pipeline...", file=sys.stderr)
 
-        # Adjust generation parameters as needed
-        response = text_generator(
-            prompt,
-            max_new_tokens=1500, # Maximum number of tokens to generate
-            num_return_sequences=1, # We only need one generated resume
-            do_sample=True, # Use sampling for more varied output
-            top_k=50,       # Consider top 50 most likely tokens
-            top_p=0.95,     # Use nucleus sampling
-            temperature=0.7,# Control creativity (lower = more focused)
-            # The pipeline with return_full_text=False should handle removing the prompt
-        )[0]
-
-        customized_text = response['generated_text']
+        # The pipeline with return_full_text=False should handle removing the prompt
+        started = time.perf_counter()
+        # Assisted decoding only changes speed: the verified tokens follow the same sampling settings
+        if num_variants > 1:
+            generation_kwargs = dict(GENERATION_KWARGS, num_return_sequences=num_variants)
+            timings['variants'] = num_variants
+        else:
+            generation_kwargs = dict(GENERATION_KWARGS, **speculative_kwargs)
+        if isinstance(text_generator, PrefixCachedGenerator):
+            responses = text_generator(prompt, timings=timings, **generation_kwargs)
+        else:
+            responses = text_generator(prompt, **generation_kwargs)
+        timings['generationMs'] = round((time.perf_counter() - started) * 1000.0, 2)
+        print(f"Debug: Generation timings: {json.dumps(timings)}", file=sys.stderr)
 
         print("Debug: Finished text generation.", file=sys.stderr)
 
@@ -151,7 +255,7 @@ Please provide the customized resume based on these instructions: [/INST]
         # and model. Basic cleaning can be added here if necessary after testing.
         # For Mistral Instruct, the output usually starts right after [/INST].
 
-        return customized_text.strip() # Strip leading/trailing whitespace
+        return [response['generated_text'].strip() for response in responses] # Strip leading/trailing whitespace
 
     except Exception as e:
         print(f"Error during LLM inference: {e}", file=sys.stderr)
@@ -159,27 +263,296 @@ Please provide the customized resume based on these instructions: [/INST]
         return "Error: Could not generate customized resume using the LLM. Please check the backend logs for inference errors."
     # ------------------------------------
 
+def customize_resume_by_section(job_post: str, resume: str, timings: dict = None) -> str:
+    """
+    Customizes a resume one section at a time (see resume_sections.py).
+
+    Each summary/skills/experience/projects/education section is rewritten
+    against a compact digest of the job post in its own short prompt; all of
+    them are generated in one batch and stitched back in the original order.
+    Resumes without recognisable section headings go through
+    customize_resume_with_llm instead.
+    """
+    sections = split_sections(resume)
+    prompts, chunks = plan_rewrites(sections, format_digest(cached_job_digest(job_post)[0]))
+    if not prompts:
+        print("Debug: No resume sections recognised; rewriting the resume as a whole.", file=sys.stderr)
+        return customize_resume_with_llm(job_post, resume, timings)
+
+    if text_generator is None:
+        print("Debug: Model not loaded, attempting to load now.", file=sys.stderr)
+        load_model()
+        if text_generator is None:
+            return "Error: LLM model failed to load. Cannot customize resume."
+
+    # Assisted decoding works on one sequence at a time, so the batched rewrites decode without it.
+    # Each rewrite is about as long as its chunk (~4 characters per token), plus some slack
+    longest = max(len(chunk) for _, chunk in chunks)
+    generation_kwargs = dict(GENERATION_KWARGS)
+    generation_kwargs['max_new_tokens'] = min(GENERATION_KWARGS['max_new_tokens'], int(longest / 4 * 1.5) + 64)
+
+    try:
+        print(f"Debug: Rewriting {len(prompts)} resume section chunks in one batch...", file=sys.stderr)
+        started = time.perf_counter()
+        outputs = text_generator(prompts, batch_size=len(prompts), **generation_kwargs)
+        generation_ms = (time.perf_counter() - started) * 1000.0
+    except Exception as e:
+        print(f"Error during LLM inference: {e}", file=sys.stderr)
+        return "Error: Could not generate customized resume using the LLM. Please check the backend logs for inference errors."
+
+    # Pipelines return one list of sequences per prompt
+    texts = [(output[0] if isinstance(output, list) else output)['generated_text'] for output in outputs]
+    if timings is not None:
+        timings.update({
+            'generationMs': round(generation_ms, 2),
+            'sections': len(sections),
+            'chunks': len(prompts),
+            'maxNewTokens': generation_kwargs['max_new_tokens']
+        })
+    return stitch_sections(sections, chunks, texts).strip()
+
+def customize_resume_fast(job_post: str, resume: str, timings: dict = None, report: dict = None) -> str:
+    """
+    Customizes a resume without the LLM: bullets and skills are reordered by
+    relevance to the job (see resume_fastpath.py). If report is a dict, it
+    gets servedBy 'fastpath' and the keywordGaps report.
+    """
+    started = time.perf_counter()
+    text, gaps, hit = fast_customize(job_post, resume)
+    if timings is not None:
+        timings.update({'jobDigest': 'hit' if hit else 'miss', 'fastPathMs': round((time.perf_counter() - started) * 1000.0, 2)})
+    if report is not None:
+        report.update({'servedBy': 'fastpath', 'keywordGaps': gaps})
+    return text
+
+def customize_resume(job_post: str, resume: str, strategy: str = None, timings: dict = None, report: dict = None) -> str:
+    """
+    Customizes a resume with the given strategy ('single', 'sections' or 'fast'; defaults to STRATEGY).
+
+    If report is a dict, it gets servedBy ('model' or 'fastpath'), plus the
+    keywordGaps report when the fast path answered. With FAST_FALLBACK on,
+    the fast path answers when the model cannot be loaded.
+    """
+    strategy = strategy or STRATEGY
+    if strategy not in STRATEGIES:
+        return f"Error: Unknown strategy '{strategy}'. Choose one of: {', '.join(STRATEGIES)}."
+    if strategy == 'fast':
+        return customize_resume_fast(job_post, resume, timings, report)
+
+    if text_generator is None:
+        load_model()
+        if text_generator is None and FAST_FALLBACK:
+            print("Debug: Model unavailable; serving the fast path instead.", file=sys.stderr)
+            return customize_resume_fast(job_post, resume, timings, report)
+    if report is not None:
+        report['servedBy'] = 'model'
+    if strategy == 'sections':
+        return customize_resume_by_section(job_post, resume, timings)
+    return customize_resume_with_llm(job_post, resume, timings)
+
+# Most alternative resumes one request may ask for
+MAX_VARIANTS = 4
+
+def customize_resume_variants(job_post: str, resume: str, num_variants: int, strategy: str = None,
+                              timings: dict = None, report: dict = None):
+    """
+    Generates num_variants alternative customized resumes.
+
+    Several variants come from one batched generation of the 'single'
+    strategy; the fast path is deterministic, so it always gives one.
+    report is filled as in customize_resume.
+
+    Returns:
+        A list of resume texts, or an error message.
+    """
+    strategy = strategy or STRATEGY
+    if not isinstance(num_variants, int) or not 1 <= num_variants <= MAX_VARIANTS:
+        return f"Error: numVariants must be an integer from 1 to {MAX_VARIANTS}."
+    if num_variants > 1 and strategy == 'sections':
+        return "Error: Several variants can only be generated with the 'single' strategy."
+    if num_variants == 1 or strategy not in STRATEGIES or strategy == 'fast':
+        text = customize_resume(job_post, resume, strategy, timings, report)
+        return text if text.startswith("Error:") else [text]
+
+    if text_generator is None:
+        load_model()
+        if text_generator is None and FAST_FALLBACK:
+            print("Debug: Model unavailable; serving the fast path instead.", file=sys.stderr)
+            return [customize_resume_fast(job_post, resume, timings, report)]
+    if report is not None:
+        report['servedBy'] = 'model'
+    return customize_resume_variants_with_llm(job_post, resume, num_variants, timings)
+
+def stream_customized_resume(job_post: str, resume: str, emit, strategy: str = None) -> int:
+    """
+    Customizes a resume while reporting progress through emit(frame).
+
+    Emits {'event': 'token', 'text': ...} for each decoded piece as soon as
+    the model produces it, then one final {'event': 'meta', ...} frame with
+    the prompt and completion token counts and timings (firstTokenMs,
+    totalMs, plus everything customize_resume_with_llm records), servedBy
+    and, from the fast path, keywordGaps. A failure ends the stream with
+    {'event': 'error', 'error': ...} instead. The 'sections' strategy
+    generates its rewrites as one batch and the fast path needs no model,
+    so their result arrives as a single token frame.
+
+    Returns:
+        The exit code (0 on success, 1 on error).
+    """
+    started = time.perf_counter()
+    timings = {}
+    report = {}
+    first_token_at = None
+    pieces = []
+    strategy = strategy or STRATEGY
+
+    def meta(prompt_tokens):
+        text = ''.join(pieces)
+        emit({
+            'event': 'meta',
+            'status': 'ok',
+            'strategy': strategy,
+            'servedBy': report.get('servedBy', 'model'),
+            'promptTokens': prompt_tokens,
+            'completionTokens': count_tokens(text_generator, text) if report.get('servedBy') != 'fastpath' else None,
+            **({'keywordGaps': report['keywordGaps']} if 'keywordGaps' in report else {}),
+            'timings': {
+                **timings,
+                'firstTokenMs': round((first_token_at - started) * 1000.0, 2) if first_token_at else None,
+                'totalMs': round((time.perf_counter() - started) * 1000.0, 2)
+            }
+        })
+        return 0
+
+    if strategy == 'single' and text_generator is None:
+        load_model()
+        if text_generator is None:
+            if not FAST_FALLBACK:
+                emit({'event': 'error', 'error': "Error: LLM model failed to load. Cannot customize resume."})
+                return 1
+            print("Debug: Model unavailable; serving the fast path instead.", file=sys.stderr)
+            strategy = 'fast'
+
+    if strategy != 'single':
+        # Batched section rewrites and the fast path produce the whole text at once
+        text = customize_resume(job_post, resume, strategy, timings, report)
+        if text.startswith("Error:"):
+            emit({'event': 'error', 'error': text})
+            return 1
+        first_token_at = time.perf_counter()
+        pieces.append(text)
+        emit({'event': 'token', 'text': text})
+        return meta(None)
+
+    report['servedBy'] = 'model'
+    try:
+        prompt = budgeted_prompt(job_post, resume, timings)
+    except ValueError as e:
+        emit({'event': 'error', 'error': f"Error: {e}"})
+        return 1
+    generation_kwargs = dict(GENERATION_KWARGS, **speculative_kwargs)
+    if isinstance(text_generator, PrefixCachedGenerator):
+        generation_kwargs['timings'] = timings
+    try:
+        print("Debug: Streaming text from the LLM...", file=sys.stderr)
+        for piece in stream_generate(text_generator, prompt, **generation_kwargs):
+            if not piece:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            pieces.append(piece)
+            emit({'event': 'token', 'text': piece})
+    except Exception as e:
+        print(f"Error during LLM inference: {e}", file=sys.stderr)
+        emit({'event': 'error', 'error': "Error: Could not generate customized resume using the LLM. "
+                                         "Please check the backend logs for inference errors."})
+        return 1
+    timings['generationMs'] = round((time.perf_counter() - started) * 1000.0, 2)
+    return meta(timings['promptBudget']['promptTokens'])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tailor a resume to a job post with an instruction-tuned LLM.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a long-lived HTTP server that keeps the model loaded, instead of "
+                             "answering a single stdin request.")
+    parser.add_argument("--host", default="127.0.0.1", help="With --serve, the address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="With --serve, the port to listen on.")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND,
+                        help="Inference backend (defaults to $RESUME_MODEL_BACKEND or 'auto': bnb4 on a GPU, "
+                             "otherwise gguf if $RESUME_GGUF_PATH exists, else int8).")
+    parser.add_argument("--draft-model", default=DRAFT_MODEL,
+                        help="Speculative decoding drafter: a small causal LM id/path, or 'prompt-lookup' "
+                             "(defaults to $RESUME_DRAFT_MODEL; empty disables it).")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write newline-delimited JSON frames to stdout as tokens are generated: "
+                             "token frames, then a final meta frame with token counts and timings.")
+    parser.add_argument("--json", action="store_true",
+                        help="Print {customizedResume, servedBy, keywordGaps?, timings} as JSON instead of plain text.")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="With --serve, how many requests may wait for the model before new ones get 503.")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    # Load the model once when the script starts (if it's not already loaded)
-    # This helps subsequent calls be faster.
-    load_model()
+    args = parse_args()
+    BACKEND = args.backend
+    DRAFT_MODEL = args.draft_model
+    if args.serve:
+        # Let the server module share this module's loaded pipeline rather than import a fresh copy
+        sys.modules.setdefault('resume_customizer_script', sys.modules[__name__])
+        from resume_server import ResumeCustomizerWorker, serve_http
+
+        serve_http(ResumeCustomizerWorker(queue_size=args.queue_size), host=args.host, port=args.port)
+        sys.exit(0)
 
     try:
         # Read the JSON input from stdin
-        # The Node.js backend sends { jobPost: "...", resume: "..." } as JSON to stdin.
+        # The Node.js backend sends { jobPost: "...", resume: "...", strategy?: "single" | "sections" | "fast",
+        # numVariants?: 1-4 } as JSON to stdin.
         input_data = json.load(sys.stdin)
         job_post = input_data.get('jobPost', '')
         resume = input_data.get('resume', '')
 
+        if args.stream:
+            def emit(frame):
+                # One JSON object per line, flushed so the Node side sees every token immediately
+                print(json.dumps(frame), flush=True)
+
+            if not job_post or not resume:
+                emit({'event': 'error', 'error': "Missing job post or resume input."})
+                sys.exit(1)
+            if input_data.get('numVariants', 1) != 1:
+                emit({'event': 'error', 'error': "Streaming generates a single variant; omit numVariants."})
+                sys.exit(1)
+            sys.exit(stream_customized_resume(job_post, resume, emit, input_data.get('strategy')))
+
         if not job_post or not resume:
             print("Error: Missing jobPost or resume in input.", file=sys.stderr)
             # Print an error message that the frontend can display
             print("No customized resume generated: Missing job post or resume input.")
             sys.exit(1) # Exit with a non-zero code to indicate an error
 
-        # Call the function that uses the LLM
-        customized_resume_text = customize_resume_with_llm(job_post, resume)
+        # Call the function that uses the LLM (it loads the model on first use,
+        # so invalid input above never pays for the model load)
+        report = {}
+        timings = {}
+        variants = customize_resume_variants(job_post, resume, input_data.get('numVariants', 1),
+                                             input_data.get('strategy'), timings, report)
+        if isinstance(variants, str):
+            variants = [variants] # An error message
+        customized_resume_text = variants[0]
+
+        if args.json:
+            # One JSON object with the text, who produced it, and the fast path's keyword gap report
+            result = {'customizedResume': customized_resume_text, **report, 'timings': timings}
+            if len(variants) > 1:
+                result['variants'] = variants
+            print(json.dumps(result))
+            sys.exit(0)
+
+        if len(variants) > 1:
+            customized_resume_text = '\n\n'.join(
+                f"--- Variant {index} ---\n{text}" for index, text in enumerate(variants, start=1))
 
         # Print the result to stdout
         # The Node.js backend will capture this output.
@@ -0,0 +1,142 @@
+"""
+Deterministic resume customization without the LLM.
+
+Many requests only need keyword alignment, which takes milliseconds rather
+than a 7B generation:
+
+  - bullet points in the experience, projects and summary sections are
+    scored against the job with BM25 and the most relevant move to the top
+    of their list (bullets never leave the employer or project they are under)
+  - skills that match the job are listed first
+  - the job's keywords are checked against the resume, and the ones it
+    never mentions are reported as gaps
+
+The job side is the cached digest from job_digest.py: its keywords weigh
+double, words in its requirement lines count once. The wording of the
+resume is never changed, only the order of its lines and skills.
+"""
+import math
+import re
+from collections import Counter
+
+from job_digest import cached_job_digest, terms
+from resume_sections import split_sections, stitch_sections
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Query weight of a digest keyword relative to a word from a requirement line
+KEYWORD_WEIGHT = 2.0
+
+_BULLET = re.compile(r'^\s*(?:[-*•·▪◦]|\d+[.)])\s+')
+_REORDERED_KINDS = ('summary', 'experience', 'projects')
+_SKILL_SEPARATORS = re.compile(r'\s*[,;|•·]\s*')
+
+class BM25:
+    """Okapi BM25 over a small corpus of already tokenized documents."""
+
+    def __init__(self, documents, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.average_length = sum(self.lengths) / len(documents) if documents else 0.0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        total = len(documents)
+        self.idf = {term: math.log(1 + (total - count + 0.5) / (count + 0.5))
+                    for term, count in document_frequency.items()}
+
+    def score(self, index, query):
+        """Score of document index for query, a {term: weight} dict."""
+        counts = self.term_counts[index]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / (self.average_length or 1.0))
+        total = 0.0
+        for term, weight in query.items():
+            frequency = counts.get(term)
+            if frequency:
+                total += weight * self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+        return total
+
+def job_query(digest):
+    """The BM25 query for a job digest: {term: weight}."""
+    query = Counter()
+    for requirement in digest['requirements']:
+        for term in set(terms(requirement)):
+            query[term] += 1.0
+    for keyword in digest['keywords']:
+        for term in terms(keyword):
+            query[term] += KEYWORD_WEIGHT
+    return dict(query)
+
+def _mentions(text, keyword):
+    return re.search(r'(?<![A-Za-z0-9])' + re.escape(keyword) + r'(?![A-Za-z0-9+#])', text, re.IGNORECASE) is not None
+
+def keyword_gaps(resume, digest):
+    """{'matched': [...], 'missing': [...], 'coverage': fraction} of the job keywords in the resume."""
+    matched = [keyword for keyword in digest['keywords'] if _mentions(resume, keyword)]
+    missing = [keyword for keyword in digest['keywords'] if keyword not in matched]
+    total = len(digest['keywords'])
+    return {'matched': matched, 'missing': missing, 'coverage': round(len(matched) / total, 3) if total else 1.0}
+
+def _reorder_bullets(lines, scores):
+    """Sorts each run of consecutive bullet lines by score (stable, so ties keep their order)."""
+    result = []
+    run = []
+    for line in lines + [None]:
+        if line is not None and _BULLET.match(line):
+            run.append(line)
+            continue
+        result.extend(sorted(run, key=lambda bullet: -scores.get(bullet, 0.0)))
+        run = []
+        if line is not None:
+            result.append(line)
+    return result
+
+def _reorder_skills(body, query):
+    """Lists the skills that match the job first, within each line of the skills section."""
+    lines = []
+    for line in body.split('\n'):
+        bullet = _BULLET.match(line)
+        prefix = bullet.group(0) if bullet else ''
+        rest = line[len(prefix):]
+        # Keep a 'Languages:'-style label in front of its list
+        label, colon, items = rest.partition(':') if ':' in rest[:40] else ('', '', rest)
+        parts = [item.strip() for item in _SKILL_SEPARATORS.split(items) if item.strip()]
+        if len(parts) < 2:
+            lines.append(line)
+            continue
+        # Rejoin with the list's own separator
+        separator_char = _SKILL_SEPARATORS.search(items).group(0).strip()
+        delimiter = ', ' if separator_char == ',' else f' {separator_char} '
+        ranked = sorted(parts, key=lambda item: -sum(query.get(term, 0.0) for term in terms(item)))
+        lines.append(f"{prefix}{label}{colon}{' ' if colon else ''}{delimiter.join(ranked)}")
+    return '\n'.join(lines)
+
+def fast_customize(job_post, resume):
+    """
+    Reorders a resume for a job post without a model.
+
+    Returns:
+        (customized resume text, keyword gap report, job digest cache hit)
+    """
+    digest, hit = cached_job_digest(job_post)
+    query = job_query(digest)
+    sections = split_sections(resume)
+
+    # Score every bullet of the resume in one BM25 corpus, so idf reflects the whole resume
+    bullets = [line for section in sections if section.kind in _REORDERED_KINDS
+               for line in section.body.split('\n') if _BULLET.match(line)]
+    scores = {}
+    if bullets:
+        model = BM25([terms(bullet) for bullet in bullets])
+        for index, bullet in enumerate(bullets):
+            scores[bullet] = max(scores.get(bullet, 0.0), model.score(index, query))
+
+    for section in sections:
+        if section.kind == 'skills':
+            section.body = _reorder_skills(section.body, query)
+        elif section.kind in _REORDERED_KINDS:
+            section.body = '\n'.join(_reorder_bullets(section.body.split('\n'), scores))
+
+    return stitch_sections(sections, [], []).strip(), keyword_gaps(resume, digest), hit
@@ -0,0 +1,171 @@
+"""
+Section-aware resume customization.
+
+A resume is split into its sections (summary, skills, experience, projects,
+education). Each section is rewritten against the job digest in a short
+prompt of its own, and all of these are generated as one batch. The results
+are stitched back together in the original order. Text before the first
+heading (name, contact details) and sections of other kinds are kept as
+written, and so is the spacing around every section: stitching sections
+nobody rewrote gives back the original text (with '\n' line endings). A section too long for one generation is cut into chunks at line
+boundaries, so one oversized section cannot push the request past the
+context window.
+"""
+import re
+
+# Section kinds that get rewritten, and the headings that introduce them
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about me', 'about'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'skills and tools', 'competencies',
+               'core competencies', 'technologies', 'tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'projects': ('projects', 'personal projects', 'selected projects', 'key projects'),
+    'education': ('education', 'education and certifications', 'certifications', 'academic background',
+                  'training', 'courses')
+}
+
+# Headings we recognise but leave untouched
+OTHER_HEADINGS = ('awards', 'honors', 'publications', 'volunteer experience', 'volunteering', 'languages',
+                  'interests', 'hobbies', 'references', 'contact', 'contact information', 'activities')
+
+_HEADING_KIND = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_KIND.update({heading: 'other' for heading in OTHER_HEADINGS})
+
+# Longest section body sent in one prompt; longer ones are chunked at line boundaries
+MAX_CHUNK_CHARS = 2400
+
+_SECTION_RULES = {
+    'summary': "Rewrite it as 2-4 sentences stating how the candidate's experience and skills fit this job, "
+               "using the job's keywords where they are true of the candidate.",
+    'skills': "List the candidate's skills that match the job first, using the job's wording for them. "
+              "Keep the remaining skills after them. Never add a skill the candidate does not list.",
+    'experience': "Keep every employer, title and date exactly. Reword the bullet points to reflect the job's "
+                  "requirements and keywords, lead with the most relevant achievements, and keep all numbers.",
+    'projects': "Keep every project name. Reword the descriptions to highlight what is relevant to the job "
+                "and put the most relevant projects first.",
+    'education': "Keep every degree, institution, certification and date exactly. Put the entries most "
+                 "relevant to the job first and mention relevant coursework only if it is already listed."
+}
+
+class ResumeSection:
+    """
+    One section of a resume: its heading line as written, its kind, and its body
+    text. lead and trail are the blank lines around the body, kept so the
+    section can be put back exactly as it was.
+    """
+
+    def __init__(self, heading, kind, body, lead='', trail=''):
+        self.heading = heading
+        self.kind = kind
+        self.body = body
+        self.lead = lead
+        self.trail = trail
+        # The heading line exactly as written (None for the text before the first heading)
+        self.heading_line = None
+
+    def render(self, body=None):
+        """The section's text, with body in place of its own when given."""
+        text = self.lead + (self.body if body is None else body) + self.trail
+        return text if self.heading_line is None else self.heading_line + '\n' + text
+
+    @property
+    def rewritable(self):
+        return self.kind in _SECTION_RULES and bool(self.body.strip())
+
+def _heading_kind(line):
+    """The section kind a line introduces, or None if it is not a heading."""
+    text = line.strip().strip('#*=_-: \t').strip()
+    if not text or len(text) > 40:
+        return None
+    return _HEADING_KIND.get(re.sub(r'\s+', ' ', text.lower().replace('&', 'and')))
+
+def split_sections(resume):
+    """
+    Splits resume text into sections in their original order.
+
+    The text before the first recognised heading becomes a section of kind
+    'header' with an empty heading. Each body is stripped of the blank lines
+    around it, which the section keeps in lead and trail.
+    """
+    sections = [ResumeSection('', 'header', [])]
+    for line in resume.replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        kind = _heading_kind(line)
+        if kind is not None:
+            section = ResumeSection(line.rstrip(), kind, [])
+            section.heading_line = line
+            sections.append(section)
+        else:
+            sections[-1].body.append(line)
+    if not sections[0].body:
+        # The resume starts with a heading
+        sections.pop(0)
+    for section in sections:
+        text = '\n'.join(section.body)
+        section.body = text.strip('\n')
+        section.lead = text[:text.find(section.body)] if section.body else text
+        section.trail = text[len(section.lead) + len(section.body):]
+    return sections
+
+def chunk_text(text, max_chars=MAX_CHUNK_CHARS):
+    """Cuts text into pieces of at most max_chars, preferring blank lines, then line breaks."""
+    if len(text) <= max_chars:
+        return [text]
+    chunks = []
+    current = ''
+    for block in re.split(r'(\n\s*\n)', text):
+        for piece in ([block] if len(block) <= max_chars else block.splitlines(keepends=True)):
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current.strip('\n'))
+                current = ''
+            current += piece
+    if current.strip():
+        chunks.append(current.strip('\n'))
+    return chunks
+
+def build_section_prompt(section, body, digest_text):
+    """A short instruction prompt that rewrites one section (or chunk) of a resume."""
+    heading = section.heading.strip().strip('#*=_-: \t') or section.kind.title()
+    return f"""[INST] You are an expert resume writer tailoring one section of a resume to a job.
+
+The job, in brief:
+{digest_text}
+
+Rules: {_SECTION_RULES[section.kind]} Keep every fact true; do not invent employers, dates, degrees, skills or numbers. Use plain text with - for bullet points and no markdown. Output ONLY the rewritten section body, without the heading and without any explanation.
+
+{heading}:
+{body}
+[/INST]
+"""
+
+def plan_rewrites(sections, digest_text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Returns (prompts, chunks): one prompt per chunk of every rewritable
+    section, and for each prompt the (section index, original chunk text) it rewrites.
+    """
+    prompts = []
+    chunks = []
+    for index, section in enumerate(sections):
+        if not section.rewritable:
+            continue
+        for chunk in chunk_text(section.body, max_chars):
+            prompts.append(build_section_prompt(section, chunk, digest_text))
+            chunks.append((index, chunk))
+    return prompts, chunks
+
+def stitch_sections(sections, chunks, outputs):
+    """
+    Reassembles the resume in the original section order and spacing.
+
+    chunks and outputs line up with the prompts from plan_rewrites(); a chunk
+    whose output is empty (e.g. its generation failed) keeps its original text.
+    Sections without rewritten chunks are put back with their current body.
+    """
+    rewritten = {}
+    for (index, original), output in zip(chunks, outputs):
+        text = output.strip() if output and output.strip() else original.strip('\n')
+        rewritten.setdefault(index, []).append(text)
+
+    return '\n'.join(section.render('\n\n'.join(rewritten[index]) if index in rewritten else None)
+                     for index, section in enumerate(sections))
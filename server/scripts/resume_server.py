@@ -0,0 +1,312 @@
+import json
+import queue
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import resume_customizer_script
+
+# Sentinel used to tell the inference thread to stop once the queue is drained
+_STOP = object()
+
+class WorkerClosed(Exception):
+    """Raised by submit() once the worker has started draining for shutdown."""
+
+class CustomizationJob:
+    """
+    One queued request; done is set once result (or error) is filled in.
+
+    A streaming job has a frames queue instead: the inference thread puts
+    every frame from stream_customized_resume on it, then None.
+    """
+
+    def __init__(self, job_post, resume, strategy=None, stream=False, num_variants=1):
+        self.job_post = job_post
+        self.resume = resume
+        self.strategy = strategy
+        self.num_variants = num_variants
+        self.enqueued = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.variants = None
+        self.error = None
+        # Filled in by customize_resume (generation and prefill breakdown; servedBy and keyword gaps)
+        self.generation_timings = {}
+        self.report = {}
+        self.frames = queue.Queue() if stream else None
+        self.done = threading.Event()
+
+    def timings(self):
+        return {
+            'queueMs': round((self.started - self.enqueued) * 1000.0, 2),
+            'generationMs': round((self.finished - self.started) * 1000.0, 2),
+            **self.generation_timings
+        }
+
+class ResumeCustomizerWorker:
+    """
+    Keeps one resume-customization pipeline resident and runs requests on a
+    single inference thread.
+
+    The queue is bounded: once queue_size requests are waiting, submit()
+    raises queue.Full so the caller can shed load instead of piling up work
+    that would time out anyway. Once close() has been called it raises
+    WorkerClosed instead.
+    """
+
+    def __init__(self, queue_size=8):
+        self._jobs = queue.Queue(maxsize=max(1, queue_size))
+        self.loaded = threading.Event()
+        self.draining = False
+        # Orders submit() against close(), so nothing is queued behind the stop sentinel
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="resume-inference", daemon=True)
+        self._thread.start()
+
+    @property
+    def ready(self):
+        return self.loaded.is_set() and resume_customizer_script.text_generator is not None and not self.draining
+
+    def queue_depth(self):
+        return self._jobs.qsize()
+
+    def submit(self, job_post, resume, strategy=None, stream=False, num_variants=1):
+        """Queues a job without blocking; raises queue.Full when the queue is at capacity, WorkerClosed when draining."""
+        job = CustomizationJob(job_post, resume, strategy, stream, num_variants)
+        with self._lock:
+            if self.draining:
+                raise WorkerClosed("Server is shutting down")
+            self._jobs.put_nowait(job)
+        return job
+
+    def close(self):
+        """Stops accepting work and waits until every queued job has been answered."""
+        with self._lock:
+            self.draining = True
+            self._jobs.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        # Load the model before the first request so warm requests only pay for generation
+        resume_customizer_script.load_model()
+        self.loaded.set()
+
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            job.started = time.monotonic()
+            if job.frames is not None:
+                self._stream(job)
+                continue
+            try:
+                result = resume_customizer_script.customize_resume_variants(
+                    job.job_post, job.resume, job.num_variants, job.strategy,
+                    timings=job.generation_timings, report=job.report)
+                if isinstance(result, str):
+                    job.error = result
+                else:
+                    job.variants = result
+                    job.result = result[0]
+            except Exception as e:
+                job.error = f"Error: {str(e)}"
+            job.finished = time.monotonic()
+            print(json.dumps({
+                'event': 'customize',
+                'status': 'error' if job.error else 'ok',
+                **job.timings()
+            }), file=sys.stderr)
+            job.done.set()
+
+    def _stream(self, job):
+        def emit(frame):
+            if frame.get('event') == 'meta':
+                frame['timings'] = {'queueMs': round((job.started - job.enqueued) * 1000.0, 2), **frame['timings']}
+            elif frame.get('event') == 'error':
+                job.error = frame['error']
+            job.frames.put(frame)
+
+        try:
+            resume_customizer_script.stream_customized_resume(job.job_post, job.resume, emit, job.strategy)
+        except Exception as e:
+            emit({'event': 'error', 'error': f"Error: {str(e)}"})
+        job.finished = time.monotonic()
+        job.frames.put(None)
+        print(json.dumps({
+            'event': 'customize',
+            'stream': True,
+            'status': 'error' if job.error else 'ok',
+            'queueMs': round((job.started - job.enqueued) * 1000.0, 2),
+            'generationMs': round((job.finished - job.started) * 1000.0, 2)
+        }), file=sys.stderr)
+        job.done.set()
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        worker = self.server.worker
+        if self.path == '/healthz':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/readyz':
+            body = {
+                'ready': worker.ready,
+                'modelLoaded': worker.loaded.is_set() and resume_customizer_script.text_generator is not None,
+                'draining': worker.draining,
+                'queueDepth': worker.queue_depth()
+            }
+            # Load-time figure: the warm prefill the cached prompt prefix saves every request
+            prefix_prefill_ms = getattr(resume_customizer_script.text_generator, 'prefix_prefill_ms', None)
+            if prefix_prefill_ms is not None:
+                body['prefixPrefillMs'] = round(prefix_prefill_ms, 2)
+            self._send_json(200 if worker.ready else 503, body)
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ('/customize', '/customize/stream'):
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            input_data = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {'error': 'Invalid JSON input.'})
+            return
+
+        job_post = input_data.get('jobPost', '') if isinstance(input_data, dict) else ''
+        resume = input_data.get('resume', '') if isinstance(input_data, dict) else ''
+        if not job_post or not resume:
+            self._send_json(400, {'error': 'Missing jobPost or resume in input.'})
+            return
+
+        strategy = input_data.get('strategy')
+        stream = self.path == '/customize/stream'
+        num_variants = input_data.get('numVariants', 1)
+        max_variants = resume_customizer_script.MAX_VARIANTS
+        if strategy not in (None, *resume_customizer_script.STRATEGIES):
+            self._send_json(400, {'error': f"strategy must be one of {', '.join(resume_customizer_script.STRATEGIES)}."})
+            return
+        if not isinstance(num_variants, int) or not 1 <= num_variants <= max_variants or (stream and num_variants != 1):
+            self._send_json(400, {'error': f"numVariants must be an integer from 1 to {max_variants} "
+                                           f"(1 when streaming)."})
+            return
+        if num_variants > 1 and (strategy or resume_customizer_script.STRATEGY) == 'sections':
+            self._send_json(400, {'error': "Several variants can only be generated with the 'single' strategy."})
+            return
+        if self.server.worker.draining:
+            self._send_shutting_down()
+            return
+        if strategy == 'fast':
+            # No model involved, so the request is answered right here instead of waiting in the queue
+            self._send_fast(job_post, resume, stream)
+            return
+        try:
+            job = self.server.worker.submit(job_post, resume, strategy, stream=stream, num_variants=num_variants)
+        except WorkerClosed:
+            self._send_shutting_down()
+            return
+        except queue.Full:
+            if resume_customizer_script.FAST_FALLBACK:
+                print("Debug: Resume customizer queue is full; serving the fast path.", file=sys.stderr)
+                self._send_fast(job_post, resume, stream)
+            else:
+                self._send_json(503, {'error': 'Resume customizer is busy, try again shortly.'}, {'Retry-After': '5'})
+            return
+
+        if job.frames is not None:
+            self._send_frames(job.frames)
+            return
+
+        job.done.wait()
+        if job.error:
+            self._send_json(500, {'error': job.error, 'timings': job.timings()})
+        else:
+            body = {'customizedResume': job.result.strip(), **job.report, 'timings': job.timings()}
+            if len(job.variants) > 1:
+                body['variants'] = job.variants
+            self._send_json(200, body)
+
+    def _send_shutting_down(self):
+        # Never the fast path: a draining server takes no new work, so the client should retry elsewhere
+        self._send_json(503, {'error': 'Resume customizer is shutting down, try again shortly.'}, {'Retry-After': '5'})
+
+    def _send_fast(self, job_post, resume, stream):
+        if stream:
+            frames = queue.Queue()
+            resume_customizer_script.stream_customized_resume(job_post, resume, frames.put, 'fast')
+            frames.put(None)
+            self._send_frames(frames)
+            return
+        timings = {}
+        report = {}
+        text = resume_customizer_script.customize_resume_fast(job_post, resume, timings, report)
+        self._send_json(200, {'customizedResume': text, **report, 'timings': timings})
+
+    def _send_frames(self, frames):
+        # No Content-Length: the HTTP/1.0 response ends when the connection closes after the last frame
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        while True:
+            frame = frames.get()
+            if frame is None:
+                return
+            try:
+                self.wfile.write(json.dumps(frame).encode('utf-8') + b'\n')
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # The frames queue is unbounded, so generation finishes without a reader
+                return
+
+    def log_message(self, format, *args):
+        print(f"Debug: {self.address_string()} {format % args}", file=sys.stderr)
+
+class _HTTPServer(ThreadingHTTPServer):
+    # Handler threads are joined on close, so in-flight requests get their answers while draining
+    daemon_threads = False
+
+def serve_http(worker, host='127.0.0.1', port=8765):
+    """
+    Serves the resume customizer over HTTP until SIGTERM/SIGINT.
+
+    Endpoints: GET /healthz (process is up), GET /readyz (model loaded and
+    accepting work), POST /customize with {jobPost, resume, strategy?, numVariants?}, and
+    POST /customize/stream with the same body, which answers with
+    newline-delimited JSON frames as tokens are generated. Strategy 'fast' is
+    answered without queueing, and so is any request that finds the queue
+    full while FAST_FALLBACK is on. On shutdown new requests get 503 while
+    everything already queued is finished and answered.
+    """
+    server = _HTTPServer((host, port), _RequestHandler)
+    server.worker = worker
+
+    def shutdown(signum, frame):
+        def drain():
+            print("Debug: Draining resume customizer queue before shutdown...", file=sys.stderr)
+            worker.close()
+            server.shutdown()
+
+        threading.Thread(target=drain, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    print(f"Debug: Resume customizer listening on http://{host}:{port}", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Precomputed role -> weighted required-skill index.
+
+Built offline from the scraped job corpus (the JobSpy jobs_*.json dumps)
+into one compact binary file that is opened with mmap, so a worker can
+start without parsing anything and look roles up in well under a
+millisecond:
+
+    python role_skill_index.py build
+    python role_skill_index.py query "frontend engineer"
+
+Skills come from each posting's description through the skill taxonomy
+(skill_extractor.py). The synthetic seed jobs are left out: their skill
+lists are random, so they would only add noise.
+
+Layout (little-endian): a header, a string table, role records sorted by
+normalized title, each role's skills sorted by weight, and a token index
+(token -> roles) used for fuzzy title lookup. A query pools every role
+whose title is close enough to it, so "frontend engineer" draws on
+"founding frontend engineer" and "software engineer, frontend" alike.
+"""
+import argparse
+import glob
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import Counter, defaultdict
+
+from skill_extractor import get_extractor
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+INDEX_PATH = os.path.join(DATA_DIR, 'role_skill_index.bin')
+
+MAGIC = b'RSKI'
+VERSION = 1
+# magic, version, then counts and section offsets
+_HEADER = struct.Struct('<4sI5I6I')
+_ROLE = struct.Struct('<IIIfI')         # name string id, first skill, skill count, token norm, posting count
+_ROLE_SKILL = struct.Struct('<If')      # skill string id, weight
+_TOKEN = struct.Struct('<IfII')         # token string id, idf, first posting, posting count
+_U32 = struct.Struct('<I')
+
+MAX_SKILLS_PER_ROLE = 50
+
+# Words that say nothing about which skills a role needs, seniority included
+_STOPWORDS = {'and', 'of', 'the', 'for', 'in', 'a', 'an', 'to', 'with', 'at', 'i', 'ii', 'iii', 'iv',
+              'senior', 'sr', 'sr.', 'junior', 'jr', 'jr.', 'staff', 'principal', 'all', 'level'}
+
+def normalize_title(title):
+    return ' '.join(re.sub(r'[^a-z0-9+#.]+', ' ', str(title).lower()).split())
+
+def _stem(token):
+    if len(token) > 5 and token.endswith('ing'):
+        return token[:-3]
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+def title_tokens(title):
+    return [_stem(token) for token in normalize_title(title).split() if token not in _STOPWORDS]
+
+def load_corpus(data_dir=DATA_DIR):
+    """Returns [(title, [skills])] for each distinct posting in the JobSpy dumps."""
+    extractor = get_extractor()
+    postings = []
+    seen = set()
+    for path in sorted(glob.glob(os.path.join(data_dir, 'jobs_*.json'))):
+        with open(path, encoding='utf-8') as f:
+            for job in json.load(f):
+                # The dumps overlap; the same posting counted twice would double its weight
+                key = job.get('id') or job.get('job_url') or (job.get('title'), job.get('company'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                # JobSpy writes missing fields as NaN, which the extractor treats as no text
+                skills = job.get('skills') if isinstance(job.get('skills'), list) else []
+                postings.append((job.get('title') or '', skills + extractor.extract(job.get('description'))))
+    return postings
+
+def build_index(postings, output_path=INDEX_PATH):
+    """Aggregates postings into per-role skill weights and writes the binary index."""
+    role_postings = Counter()
+    role_skills = defaultdict(Counter)
+    display_names = {}
+    for title, skills in postings:
+        role = normalize_title(title) if isinstance(title, str) else ''
+        # A posting without a description says nothing about the skills its role needs
+        if not role or not skills:
+            continue
+        role_postings[role] += 1
+        # Weight is the share of the role's postings asking for the skill
+        for skill in {skill.lower(): skill for skill in skills}.values():
+            display_names.setdefault(skill.lower(), skill)
+            role_skills[role][skill.lower()] += 1
+
+    roles = sorted(role_postings)
+    role_index = {role: i for i, role in enumerate(roles)}
+
+    token_roles = defaultdict(set)
+    for role in roles:
+        for token in title_tokens(role):
+            token_roles[token].add(role_index[role])
+    idf = {token: math.log(1 + len(roles) / len(ids)) for token, ids in token_roles.items()}
+
+    strings = []
+    string_ids = {}
+
+    def string_id(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    role_records = bytearray()
+    skill_records = bytearray()
+    skill_count = 0
+    for role in roles:
+        ranked = sorted(role_skills[role].items(), key=lambda item: (-item[1], item[0]))[:MAX_SKILLS_PER_ROLE]
+        norm = math.sqrt(sum(idf[token] ** 2 for token in set(title_tokens(role)))) or 1.0
+        role_records += _ROLE.pack(string_id(role), skill_count, len(ranked), norm, role_postings[role])
+        for skill, count in ranked:
+            skill_records += _ROLE_SKILL.pack(string_id(display_names[skill]), count / role_postings[role])
+        skill_count += len(ranked)
+
+    token_records = bytearray()
+    posting_records = bytearray()
+    posting_count = 0
+    for token in sorted(token_roles):
+        ids = sorted(token_roles[token])
+        token_records += _TOKEN.pack(string_id(token), idf[token], posting_count, len(ids))
+        for role_id in ids:
+            posting_records += _U32.pack(role_id)
+        posting_count += len(ids)
+
+    blob = bytearray()
+    string_offsets = bytearray()
+    for text in strings:
+        string_offsets += _U32.pack(len(blob))
+        blob += text.encode('utf-8')
+    string_offsets += _U32.pack(len(blob))
+
+    sections = [string_offsets, blob, role_records, skill_records, token_records, posting_records]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    header = _HEADER.pack(MAGIC, VERSION, len(strings), len(roles), skill_count, len(token_roles), posting_count,
+                          *offsets)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, output_path)
+    return {'roles': len(roles), 'skills': skill_count, 'tokens': len(token_roles), 'bytes': position}
+
+class RoleSkillIndex:
+    """Read-only view over a built index file, backed by mmap."""
+
+    def __init__(self, path=INDEX_PATH):
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.string_count, self.role_count, _, self.token_count, _,
+         self._strings_at, self._blob_at, self._roles_at, self._skills_at, self._tokens_at,
+         self._postings_at) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} role/skill index")
+
+    def _string(self, string_id):
+        start, end = struct.unpack_from('<II', self._buffer, self._strings_at + 4 * string_id)
+        return self._buffer[self._blob_at + start:self._blob_at + end].decode('utf-8')
+
+    def _role(self, i):
+        return _ROLE.unpack_from(self._buffer, self._roles_at + i * _ROLE.size)
+
+    def _token(self, i):
+        return _TOKEN.unpack_from(self._buffer, self._tokens_at + i * _TOKEN.size)
+
+    def _search(self, count, record, key):
+        """Binary search over a table sorted by the string its records start with."""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            value = self._string(record(middle)[0])
+            if value == key:
+                return middle
+            if value < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def match_roles(self, title, threshold=0.0):
+        """
+        Returns [(indexed role title, match score in [0, 1])] for every role whose
+        title scores at least threshold against title, best first.
+
+        The score is the share of the query's (idf-weighted) title words the role's
+        title contains, so "frontend engineer" fully matches "software engineer,
+        frontend" while "product manager" only half matches "product security
+        engineer". Among equal scores, closer titles (by cosine) come first.
+        """
+        shared = defaultdict(float)
+        query_norm = 0.0
+        for token in set(title_tokens(title)):
+            i = self._search(self.token_count, self._token, token)
+            if i is None:
+                # A word no indexed title has still counts against every match
+                query_norm += math.log(1 + self.role_count) ** 2
+                continue
+            _, idf, first, count = self._token(i)
+            query_norm += idf * idf
+            for p in range(first, first + count):
+                role_id = _U32.unpack_from(self._buffer, self._postings_at + 4 * p)[0]
+                # A role with no known skills cannot answer the question, however well it matches
+                if self._role(role_id)[2] > 0:
+                    shared[role_id] += idf * idf
+        if not shared:
+            return []
+
+        matches = []
+        for role_id, weight in shared.items():
+            name_id, _, _, norm, role_postings = self._role(role_id)
+            score = min(1.0, weight / query_norm)
+            if score >= threshold:
+                cosine = weight / (norm * math.sqrt(query_norm))
+                matches.append((round(score, 6), round(cosine, 6), role_postings, self._string(name_id)))
+        # Ties go to the role with more postings behind it
+        matches.sort(key=lambda match: (-match[0], -match[1], -match[2], match[3]))
+        return [(role, score) for score, _, _, role in matches]
+
+    def lookup_role(self, title):
+        """Returns (indexed role title, match score in [0, 1]) for the closest role, or None."""
+        matches = self.match_roles(title)
+        return matches[0] if matches else None
+
+    def postings(self, roles):
+        """Number of corpus postings behind an indexed role title, or behind a match_roles() result."""
+        if isinstance(roles, str):
+            role_id = self._search(self.role_count, self._role, roles)
+            return self._role(role_id)[4] if role_id is not None else 0
+        return sum(self.postings(role) for role, _ in roles)
+
+    def skills_for(self, title, matches=None, threshold=0.75):
+        """
+        Returns [(skill, weight)] pooled over the roles matching title, heaviest first.
+
+        A skill's weight is the share of the matched postings asking for it, each
+        role counted in proportion to how well its title matches. matches is a
+        match_roles() result the caller already has, so the roles are not looked up again.
+        """
+        if matches is None:
+            matches = self.match_roles(title, threshold)
+        counts = defaultdict(float)
+        total = 0.0
+        for role, score in matches:
+            role_id = self._search(self.role_count, self._role, role)
+            _, first, count, _, role_postings = self._role(role_id)
+            total += score * role_postings
+            for i in range(first, first + count):
+                skill_id, weight = _ROLE_SKILL.unpack_from(self._buffer, self._skills_at + i * _ROLE_SKILL.size)
+                counts[self._string(skill_id)] += score * weight * role_postings
+        if not total:
+            return []
+        return sorted(((skill, count / total) for skill, count in counts.items()), key=lambda item: (-item[1], item[0]))
+
+    def missing_skills(self, current_skills, title, limit=8, matches=None):
+        """The role's required skills the user does not have yet, ranked by weight."""
+        have = {str(skill).strip().lower() for skill in current_skills}
+        return [skill for skill, _ in self.skills_for(title, matches) if skill.lower() not in have][:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the role/skill index.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Build the index from the job corpus.")
+    build_parser.add_argument('--data-dir', default=DATA_DIR)
+    build_parser.add_argument('--output', default=INDEX_PATH)
+    query_parser = subparsers.add_parser('query', help="Show the skills the index has for a role.")
+    query_parser.add_argument('role')
+    query_parser.add_argument('--index', default=INDEX_PATH)
+    query_parser.add_argument('--threshold', type=float, default=0.75,
+                              help="Lowest title match score for a role to be pooled (default 0.75)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        summary = build_index(load_corpus(args.data_dir), args.output)
+        print(f"Wrote {args.output}: {summary['roles']} roles, {summary['skills']} role skills, "
+              f"{summary['tokens']} tokens, {summary['bytes']} bytes")
+        return 0
+
+    index = RoleSkillIndex(args.index)
+    matches = index.match_roles(args.role, args.threshold)
+    if not matches:
+        print(f"No role matches '{args.role}'")
+        return 1
+    print(f"{len(matches)} roles, {index.postings(matches)} postings:")
+    for role, score in matches:
+        print(f"  {score:5.2f}  {role} ({index.postings(role)})")
+    print("Skills:")
+    for skill, weight in index.skills_for(args.role, matches)[:20]:
+        print(f"  {weight:5.2f}  {skill}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Persistent index of the job postings the scraper has already emitted.
+
+Every cron run sees mostly the same LinkedIn postings. The index maps a
+short key for each posting (the LinkedIn job id, else the link without its
+tracking parameters, else a normalized title/company/location fingerprint)
+to a hash of its content. The scraper looks a posting up before building
+the job object, so an unchanged posting costs one hash and one SQLite
+lookup instead of date parsing, the skill scan and a database write.
+
+A posting is only recorded as seen once it has been stored: the scraper
+attaches "seen": {"key", "content"} to each new or updated job, and the
+ingester passes those back through mark() (or `seen_jobs.py --mark`) after
+its database write succeeds. A failed write or a run that dies halfway
+therefore emits the same postings again next time instead of losing them.
+Entries not seen for ttl_seconds are dropped, which keeps the file bounded
+by the postings that are still live.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+SEEN_JOBS_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache', 'seen_jobs.sqlite')
+
+NEW = 'new'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+
+_JOB_ID = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)|[?&]currentJobId=(\d+)')
+
+def _digest(text, size):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=size).hexdigest()
+
+def _normalize(value):
+    return ' '.join(str(value or '').lower().split())
+
+def job_key(job_id, link, title, company, place):
+    """The index key for a posting: stable across runs even when the link's tracking parameters change."""
+    if not job_id and link:
+        match = _JOB_ID.search(link)
+        if match:
+            job_id = match.group(1) or match.group(2)
+    if job_id:
+        return 'id:' + str(job_id)
+    if link:
+        return 'url:' + _digest(link.split('?', 1)[0].split('#', 1)[0].rstrip('/').lower(), 12)
+    return 'job:' + _digest('|'.join(_normalize(value) for value in (title, company, place)), 12)
+
+def content_hash(title, company, place, description):
+    """Hash of the fields that make a posting worth re-emitting when they change."""
+    return _digest('\x1f'.join(str(value or '') for value in (title, company, place, description)), 8)
+
+class SeenJobStore:
+    """
+    key -> content hash index in a SQLite file, safe to share between scraper threads.
+
+    check() classifies each posting as new, updated or unchanged and counts
+    them; mark() records the postings whoever consumes the jobs has stored;
+    close(commit=True) is the one place the run's changes are written, and
+    close(commit=False) discards all of them.
+    """
+
+    def __init__(self, db_path=SEEN_JOBS_DB, ttl_seconds=60 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self.counts = {NEW: 0, UPDATED: 0, UNCHANGED: 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS seen_jobs ('
+            'key TEXT PRIMARY KEY, content TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs (last_seen)')
+        self._db.commit()
+
+    def check(self, key, content):
+        """
+        Classifies the posting key with content as 'new', 'updated' or 'unchanged'.
+
+        Only an unchanged posting is recorded (as seen again). New and updated
+        ones are recorded by mark() once they have actually been stored, so a
+        failed ingest leaves them to be emitted again by the next run.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT content FROM seen_jobs WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                status = NEW
+            elif row[0] != content:
+                status = UPDATED
+            else:
+                status = UNCHANGED
+                self._db.execute('UPDATE seen_jobs SET last_seen = ? WHERE key = ?', (time.time(), key))
+            self.counts[status] += 1
+            return status
+
+    def mark(self, entries):
+        """Records (key, content) pairs of stored postings as seen, to be written by close(); returns how many."""
+        now = time.time()
+        rows = [(key, content, now, now) for key, content in entries]
+        with self._lock:
+            self._db.executemany(
+                'INSERT INTO seen_jobs (key, content, first_seen, last_seen) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET content = excluded.content, last_seen = excluded.last_seen',
+                rows
+            )
+        return len(rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM seen_jobs').fetchone()[0]
+
+    def close(self, commit=True):
+        """Commits the run's changes (dropping expired entries) or, with commit=False, discards them."""
+        with self._lock:
+            if self._db is None:
+                return
+            if commit:
+                self._db.execute('DELETE FROM seen_jobs WHERE last_seen < ?', (time.time() - self.ttl_seconds,))
+                self._db.commit()
+            else:
+                self._db.rollback()
+            self._db.close()
+            self._db = None
+
+def open_seen_store(db_path=None):
+    """
+    Opens the seen-job index from environment variables:
+    LINKEDIN_SEEN_JOBS_DB (SQLite path) and LINKEDIN_SEEN_JOBS_TTL (seconds).
+    """
+    return SeenJobStore(
+        db_path=db_path or os.environ.get('LINKEDIN_SEEN_JOBS_DB') or SEEN_JOBS_DB,
+        ttl_seconds=float(os.environ.get('LINKEDIN_SEEN_JOBS_TTL', 60 * 24 * 3600))
+    )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Maintain the seen-job index of the LinkedIn scraper.")
+    parser.add_argument('--mark', action='store_true', required=True,
+                        help="Record the {\"key\", \"content\"} JSON lines on stdin as stored postings")
+    parser.add_argument('--db', help="Seen-job index (default data/cache/seen_jobs.sqlite)")
+    args = parser.parse_args()
+
+    store = open_seen_store(args.db)
+    try:
+        entries = [json.loads(line) for line in sys.stdin if line.strip()]
+        count = store.mark((entry['key'], entry['content']) for entry in entries)
+    except BaseException:
+        store.close(commit=False)
+        raise
+    store.close()
+    print(f"Marked {count} postings as seen.", file=sys.stderr)
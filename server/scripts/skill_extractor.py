@@ -0,0 +1,126 @@
+"""
+Skill extraction from job descriptions against a skill taxonomy.
+
+The taxonomy (data/skill_taxonomy.json) maps each canonical skill name to
+its aliases ("k8s" -> Kubernetes, "nodejs" -> Node.js). Names and aliases
+are matched case-insensitively. Skills that are also ordinary words or
+single letters (Go, R, React, Swift) are listed under caseSensitive with
+the exact spellings that count; their aliases still match in any case.
+
+All spellings are compiled once into a single regex shaped like a trie
+(shared prefixes are factored out, so "java" and "javascript" share one
+branch). Scanning a description is then one left-to-right pass whose cost
+barely depends on the taxonomy size. A match must stand on its own: "java"
+does not match inside "javascript", "git" inside "digital", or "css"
+inside "access".
+"""
+import json
+import os
+import re
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skill_taxonomy.json')
+
+# A skill may not continue a word or a dotted name ("vue.js", ".net") on either side
+_BEFORE = r'(?<![\w+#.])'
+_AFTER = r'(?![\w+#]|\.\w)'
+# Case-sensitive spellings are mostly short, so they also may not touch a hyphen or an
+# ampersand ("C-level", "R-squared", "R&D")
+_BEFORE_EXACT = r'(?<![\w+#.&-])'
+_AFTER_EXACT = r'(?![\w+#&-]|\.\w)'
+
+def trie_regex(words):
+    """
+    A regex alternation matching any of words, built from their trie.
+
+    At every node the longer continuations come before ending the word, so
+    the longest spelling wins ("c++" over "c", "react native" over "react").
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        ends = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if ends else body
+
+    return build(trie)
+
+def lower_same_length(text):
+    """
+    text lowercased character by character, so every position still lines up with text.
+
+    str.lower() turns a few characters into two ('İ' -> 'i̇'), which would shift
+    every match after them; those characters are left as they are.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        # lower() never shortens a character, so equal lengths mean nothing grew
+        return lowered
+    return ''.join(lower if len(lower) == 1 else char for char, lower in ((char, char.lower()) for char in text))
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+class SkillExtractor:
+    """Finds taxonomy skills in text; build once, then call extract() per description."""
+
+    def __init__(self, taxonomy):
+        exact = taxonomy.get('caseSensitive', {})
+        # Lowercased spelling -> canonical name, and exact spelling -> canonical name
+        self.aliases = {}
+        self.exact = {}
+        for name, aliases in taxonomy['skills'].items():
+            if name not in exact:
+                self.aliases.setdefault(name.lower(), name)
+            for alias in aliases:
+                self.aliases.setdefault(alias.lower(), name)
+        for name, spellings in exact.items():
+            for spelling in spellings:
+                self.exact.setdefault(spelling, name)
+
+        # Matched against lowercased text: much faster than re.IGNORECASE on a pattern this large
+        self.pattern = re.compile(_BEFORE + '(' + trie_regex(self.aliases) + ')' + _AFTER)
+        self.exact_pattern = (re.compile(_BEFORE_EXACT + '(' + trie_regex(self.exact) + ')' + _AFTER_EXACT)
+                              if self.exact else None)
+
+    @classmethod
+    def from_file(cls, path=TAXONOMY_PATH):
+        return cls(load_taxonomy(path))
+
+    def extract(self, text):
+        """Canonical names of the skills mentioned in text, in order of first mention."""
+        if not isinstance(text, str) or not text:
+            return []
+        found = {}
+        spans = []
+        # Spans of these matches are compared with positions in text, so the case fold must keep them aligned
+        for match in self.pattern.finditer(lower_same_length(text)):
+            found.setdefault(self.aliases[match.group(1)], match.start())
+            spans.append(match.span())
+        if self.exact_pattern is not None:
+            for match in self.exact_pattern.finditer(text):
+                # "React" inside an already matched "React Native" is not a second skill
+                if not any(start <= match.start() < end for start, end in spans):
+                    found.setdefault(self.exact[match.group(1)], match.start())
+        return sorted(found, key=found.get)
+
+# Extractor for the bundled taxonomy, built on first use
+_default_extractor = None
+
+def get_extractor():
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor.from_file()
+    return _default_extractor
+
+def extract_skills(text):
+    """Canonical names of the bundled taxonomy's skills mentioned in text."""
+    return get_extractor().extract(text)
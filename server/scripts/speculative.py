@@ -0,0 +1,65 @@
+"""
+Speculative (assisted) decoding for the resume customizer.
+
+A cheap drafter proposes several tokens and the 7B model checks them all
+in one forward pass, so every accepted draft token saves a full decode
+step. With do_sample=True, transformers verifies the drafts by speculative
+sampling. The target model's top_k/top_p/temperature processing is applied
+before acceptance, so the output distribution is the same as plain sampling
+with those settings.
+
+RESUME_DRAFT_MODEL (or --draft-model) selects the drafter:
+
+  <model id or path>  a small causal LM. If its tokenizer differs from
+                      Mistral's, transformers' universal assisted decoding
+                      translates between the two vocabularies.
+  prompt-lookup       n-gram lookup in the prompt itself, with no extra
+                      model. A tailored resume copies long spans of the
+                      original, so this often drafts well. It is also the
+                      only drafter the gguf (llama.cpp) backend supports.
+"""
+import os
+import sys
+
+from lazy_imports import lazy_import
+
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+
+PROMPT_LOOKUP = 'prompt-lookup'
+
+# Tokens proposed per verification step
+DRAFT_TOKENS = int(os.environ.get('RESUME_DRAFT_TOKENS', '10'))
+
+def draft_generation_kwargs(draft, generator):
+    """
+    Loads the drafter for an HF pipeline and returns the extra generate()
+    kwargs that turn on assisted decoding ({} when draft is empty).
+    """
+    if not draft:
+        return {}
+    if draft == PROMPT_LOOKUP:
+        return {'prompt_lookup_num_tokens': DRAFT_TOKENS}
+
+    print(f"Debug: Loading draft model {draft} for assisted decoding...", file=sys.stderr)
+    model = generator.model
+    assistant = transformers.AutoModelForCausalLM.from_pretrained(draft, torch_dtype=model.dtype).to(model.device)
+    assistant.eval()
+    assistant.generation_config.num_assistant_tokens = DRAFT_TOKENS
+
+    kwargs = {'assistant_model': assistant}
+    assistant_tokenizer = transformers.AutoTokenizer.from_pretrained(draft)
+    if assistant_tokenizer.get_vocab() != generator.tokenizer.get_vocab():
+        # Different vocabularies: drafts are re-tokenized through text (universal assisted decoding)
+        kwargs.update({'tokenizer': generator.tokenizer, 'assistant_tokenizer': assistant_tokenizer})
+    return kwargs
+
+def llama_cpp_draft(draft):
+    """The llama-cpp-python draft_model for a drafter spec, or None."""
+    if not draft:
+        return None
+    if draft != PROMPT_LOOKUP:
+        print(f"Debug: The gguf backend only supports '{PROMPT_LOOKUP}' drafting; ignoring {draft}.", file=sys.stderr)
+        return None
+    llama_speculative = lazy_import("llama_cpp.llama_speculative")
+    return llama_speculative.LlamaPromptLookupDecoding(num_pred_tokens=DRAFT_TOKENS)
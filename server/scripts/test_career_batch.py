@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import career_batch
+from career_batch import BatchCheckpoint, run_batch
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def fake_generate(requests, budgets=None):
+    return [({'title': f"Path to {role}", 'skills': skills}, 0) for skills, role in requests]
+
+def write_input(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(json.dumps({'userId': f'u{i}', 'skills': ['python'], 'role': f'role {i}'}) + '\n')
+
+def user_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['userId'] for line in f]
+
+@pytest.fixture(autouse=True)
+def fake_model(monkeypatch):
+    monkeypatch.setattr(career_batch, 'generate_career_paths', fake_generate)
+
+def test_answers_every_row_and_clears_the_checkpoint(tmp_path):
+    source, output = str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl')
+    write_input(source, 7)
+    assert run_batch(source, output, batch_size=3) == 7
+    assert user_ids(output) == [f'u{i}' for i in range(7)]
+    assert not os.path.exists(output + '.checkpoint')
+
+def test_invalid_rows_get_an_error_result_in_place(tmp_path):
+    source, output = str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl')
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write('{"userId": "a", "skills": ["x"], "role": "r"}\n\nnot json\n{"userId": "b", "skills": []}\n')
+    run_batch(source, output, batch_size=2)
+    with open(output, encoding='utf-8') as f:
+        statuses = [json.loads(line)['status'] for line in f]
+    assert statuses == ['ok', 'error', 'error']
+
+def test_resumes_after_a_crash_between_writing_and_checkpointing(tmp_path, monkeypatch):
+    source, output = str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl')
+    write_input(source, 10)
+    saves = []
+    real_save = BatchCheckpoint.save
+
+    def crash_on_third_save(checkpoint):
+        saves.append(checkpoint.rows)
+        if len(saves) == 3:
+            # The third batch is already in the output file, but the checkpoint never records it
+            raise KeyboardInterrupt
+        real_save(checkpoint)
+
+    monkeypatch.setattr(BatchCheckpoint, 'save', crash_on_third_save)
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(source, output, batch_size=3)
+    assert len(user_ids(output)) == 9
+
+    monkeypatch.setattr(BatchCheckpoint, 'save', real_save)
+    assert run_batch(source, output, batch_size=3) == 4
+    assert user_ids(output) == [f'u{i}' for i in range(10)]
+
+def test_resumes_after_the_process_is_killed(tmp_path):
+    source, output = str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl')
+    write_input(source, 20)
+    # A child process that dies hard (no cleanup, no exception handling) in its fourth batch
+    driver = textwrap.dedent(f"""
+        import os, sys
+        sys.path.insert(0, {SCRIPTS_DIR!r})
+        import career_batch
+        calls = []
+        def generate(requests, budgets=None):
+            calls.append(1)
+            if len(calls) == 4:
+                os._exit(9)
+            return [({{'title': role}}, 0) for skills, role in requests]
+        career_batch.generate_career_paths = generate
+        career_batch.run_batch({source!r}, {output!r}, batch_size=4)
+    """)
+    killed = subprocess.run([sys.executable, '-c', driver], capture_output=True)
+    assert killed.returncode == 9
+
+    checkpoint = BatchCheckpoint(output + '.checkpoint', source)
+    assert checkpoint.load()
+    assert checkpoint.rows == 12
+    assert checkpoint.output_offset == os.path.getsize(output)
+
+    assert run_batch(source, output, batch_size=4) == 8
+    assert user_ids(output) == [f'u{i}' for i in range(20)]
+
+def test_checkpoint_for_another_input_is_ignored(tmp_path):
+    checkpoint = BatchCheckpoint(str(tmp_path / 'cp'), str(tmp_path / 'a.jsonl'))
+    checkpoint.input_offset, checkpoint.output_offset, checkpoint.rows = 10, 20, 1
+    checkpoint.save()
+    assert not BatchCheckpoint(str(tmp_path / 'cp'), str(tmp_path / 'b.jsonl')).load()
+    assert BatchCheckpoint(str(tmp_path / 'cp'), str(tmp_path / 'a.jsonl')).load()
+
+def test_no_resume_starts_over(tmp_path):
+    source, output = str(tmp_path / 'in.jsonl'), str(tmp_path / 'out.jsonl')
+    write_input(source, 6)
+    checkpoint = BatchCheckpoint(output + '.checkpoint', source)
+    checkpoint.input_offset, checkpoint.rows = os.path.getsize(source), 6
+    checkpoint.save()
+    assert run_batch(source, output, batch_size=4, resume=False) == 6
+    assert user_ids(output) == [f'u{i}' for i in range(6)]
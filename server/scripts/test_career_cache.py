@@ -0,0 +1,100 @@
+import pytest
+
+import career_cache
+from career_cache import CareerPathCache, make_cache_key
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(career_cache.time, 'time', clock)
+    return clock
+
+def disk_cache(tmp_path, **kwargs):
+    return CareerPathCache(db_path=str(tmp_path / 'cache.sqlite'), **kwargs)
+
+def test_key_ignores_skill_order_case_and_spacing():
+    first = make_cache_key(['Python', ' SQL '], 'Data  Engineer', 'model', {'temperature': 0.7})
+    second = make_cache_key(['sql', 'python', 'Python'], 'data engineer', 'model', {'temperature': 0.7})
+    assert first == second
+    assert first != make_cache_key(['sql', 'python'], 'data engineer', 'model', {'temperature': 0.8})
+
+def test_get_returns_a_defensive_copy(tmp_path, clock):
+    cache = disk_cache(tmp_path)
+    response = {'steps': [{'title': 'Learn SQL'}]}
+    cache.put('k', response)
+    response['steps'].append({'title': 'changed after put'})
+
+    first = cache.get('k')
+    first['steps'][0]['title'] = 'changed by a caller'
+    assert cache.get('k') == {'steps': [{'title': 'Learn SQL'}]}
+    assert cache.get('k') is not cache.get('k')
+
+def test_entries_expire_after_the_ttl_in_both_tiers(tmp_path, clock):
+    cache = disk_cache(tmp_path, ttl_seconds=60)
+    cache.put('k', {'v': 1})
+    clock.now += 60
+    assert cache.get('k') == {'v': 1}
+    assert cache.counters['memoryHits'] == 1
+
+    clock.now += 1
+    assert cache.get('k') is None
+    assert cache.counters['expired'] == 2
+    assert cache.stats()['diskEntries'] == 0
+    assert cache.stats()['memoryEntries'] == 0
+
+def test_disk_entries_expire_without_a_memory_tier(tmp_path, clock):
+    cache = disk_cache(tmp_path, max_memory_entries=0, ttl_seconds=60)
+    cache.put('k', {'v': 1})
+    clock.now += 30
+    assert cache.get('k') == {'v': 1}
+    assert cache.counters['diskHits'] == 1
+    clock.now += 31
+    assert cache.get('k') is None
+
+def test_memory_tier_evicts_the_least_recently_used_entry():
+    cache = CareerPathCache(max_memory_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.counters['memoryEvictions'] == 1
+
+def test_disk_tier_evicts_by_last_disk_access(tmp_path, clock):
+    cache = disk_cache(tmp_path, max_memory_entries=1, max_disk_entries=2)
+    cache.put('a', 1)
+    clock.now += 1
+    cache.put('b', 2)
+    clock.now += 1
+    # 'a' was pushed out of memory by 'b', so this hit reads (and touches) the disk entry
+    assert cache.get('a') == 1
+    assert cache.counters['diskHits'] == 1
+    clock.now += 1
+    cache.put('c', 3)
+
+    assert cache.counters['diskEvictions'] == 1
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_memory_misses_are_refilled_from_disk(tmp_path, clock):
+    cache = disk_cache(tmp_path, max_memory_entries=1)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    assert cache.get('a') == 1
+    assert (cache.counters['diskHits'], cache.counters['memoryHits']) == (1, 1)
+
+def test_disk_entries_survive_a_restart(tmp_path, clock):
+    disk_cache(tmp_path).put('k', {'v': 1})
+    cache = disk_cache(tmp_path)
+    assert cache.get('k') == {'v': 1}
+    assert cache.counters['diskHits'] == 1
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+from json_constraint import (CAREER_PATH_SCHEMA, JsonAliasDecoder, JsonSchemaLogitsProcessor, JsonSchemaMatcher,
+                             JsonTokenTable)
+
+STEP = {'year': 2025, 'title': 'Learn "SQL"', 'description': 'Path\\to (data)', 'skills': ['SQL'],
+        'resources': [{'name': 'Docs', 'url': 'https://example.com'}]}
+DOCUMENT = {
+    'title': 'Path to Data Engineer',
+    'missingSkills': ['SQL', 'Airflow'],
+    'steps': [STEP, dict(STEP, year=2026, resources=[])],
+    'learningModules': [{'name': 'Course', 'url': 'https://example.com', 'type': 'Course'}]
+}
+
+class FakeTokenizer:
+    """Vocabulary-only stand-in for a Hugging Face tokenizer."""
+
+    def __init__(self, pieces, special=('</s>', '<pad>', '<unk>')):
+        self.pieces = list(special) + list(pieces)
+        self.all_special_ids = list(range(len(special)))
+        self.eos_token_id = 0
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def convert_ids_to_tokens(self, ids):
+        return [self.pieces[token_id] for token_id in ids]
+
+def feeds(text):
+    return JsonSchemaMatcher(CAREER_PATH_SCHEMA).feed(text)
+
+def test_accepts_every_prefix_of_a_valid_document():
+    text = json.dumps(DOCUMENT)
+    matcher = JsonSchemaMatcher(CAREER_PATH_SCHEMA)
+    for char in text:
+        assert matcher.feed(char)
+    assert matcher.done
+    assert json.loads(text) == DOCUMENT
+
+def test_accepts_bounded_whitespace_between_tokens():
+    assert feeds('{ "title" :  "x",')
+    assert not feeds('{   "title"')
+
+@pytest.mark.parametrize('text', [
+    '[',                               # top level must be an object
+    '{"missingSkills"',                # keys come in schema order
+    '{"title": 5',                     # wrong value type
+    '{"tit le"',                       # no whitespace inside a key
+    '{"title": "x"}',                  # every key is required
+    '{"title": "a\\q"',                # unknown escape
+    '{"title": "\\u12g4"',             # bad unicode escape
+    '{"title": "line\nbreak"',         # raw control character in a string
+])
+def test_rejects_invalid_prefixes(text):
+    assert not feeds(text)
+
+def test_string_escapes_do_not_end_the_string():
+    matcher = JsonSchemaMatcher(CAREER_PATH_SCHEMA)
+    assert matcher.feed('{"title": "say \\"hi\\" \\\\ \\u00e9 \\n')
+    assert matcher.stack[-1][0] == 'string'
+    assert matcher.feed('", "missingSkills": [')
+
+def test_nested_objects_and_arrays():
+    steps = '{"title": "t", "missingSkills": [], "steps": [{"year": 2024, "title": "a", "description": "b", ' \
+            '"skills": ["x", "y"], "resources": [{"name": "n", "url": "u"}]}'
+    assert feeds(steps + ']')
+    assert feeds(steps + ', {"year": 2025')
+    # Closing the array while a step object is still open is an error
+    assert not feeds(steps[:-1] + ']')
+
+def test_integers_and_limits():
+    prefix = '{"title": "t", "missingSkills": [], "steps": [{"year": '
+    assert feeds(prefix + '2024,')
+    assert not feeds(prefix + '01')
+    assert not feeds(prefix + '20245')
+    assert not feeds('{"title": "' + 'x' * 301)
+    assert not feeds('{"title": "t", "missingSkills": [' + ', '.join(['"s"'] * 11))
+
+def test_nothing_is_accepted_after_the_document():
+    matcher = JsonSchemaMatcher(CAREER_PATH_SCHEMA)
+    assert matcher.feed(json.dumps(DOCUMENT))
+    assert not matcher.clone().feed(' ')
+
+def test_clone_is_independent():
+    matcher = JsonSchemaMatcher(CAREER_PATH_SCHEMA)
+    matcher.feed('{"title": "')
+    probe = matcher.clone()
+    assert not probe.feed('\x01')
+    assert matcher.feed('ok"')
+
+def test_token_table_maps_markers_and_skips_special_tokens():
+    table = JsonTokenTable(FakeTokenizer(['▁{', '}', '[', ']', '"', ':', ',', 'Ġtitle', 'Ċ']))
+    assert table.texts[:3] == [None, None, None]
+    assert table.texts[3:] == [' {', '}', '[', ']', '"', ':', ',', ' title', '\n']
+    assert table.eos_token_id == 0
+    assert table.aliases == {}
+
+def test_token_table_spells_missing_braces_with_stand_ins():
+    # Like T5's SentencePiece vocabulary: no curly braces
+    table = JsonTokenTable(FakeTokenizer(['▁(', ')', '[', ']', '"', ':', ',']))
+    assert table.aliases == {'{': '(', '}': ')'}
+    assert table.matcher_aliases == {'(': '{', ')': '}'}
+
+def test_token_table_rejects_vocabularies_that_cannot_spell_json():
+    with pytest.raises(ValueError, match='"'):
+        JsonTokenTable(FakeTokenizer(['{', '}', '[', ']', ':', ',']))
+
+def test_stand_ins_are_structural_only_outside_strings():
+    aliases = {'(': '{', ')': '}'}
+    # The description contains "(data)", which has to survive the round trip as it is
+    text = json.dumps(DOCUMENT).replace('{', '(').replace('}', ')')
+    matcher = JsonSchemaMatcher(CAREER_PATH_SCHEMA, aliases=aliases)
+    assert matcher.feed(text)
+    assert matcher.done
+    assert json.loads(JsonAliasDecoder(aliases).feed(text)) == DOCUMENT
+
+def test_alias_decoder_keeps_string_state_across_chunks():
+    aliases = {'(': '{', ')': '}'}
+    text = '("title": "a \\"(b)\\" c", "x": ())'
+    decoder = JsonAliasDecoder(aliases)
+    streamed = ''.join(decoder.feed(text[i:i + 3]) for i in range(0, len(text), 3))
+    assert streamed == '{"title": "a \\"(b)\\" c", "x": {}}'
+
+def test_processor_only_allows_tokens_that_keep_the_prefix_valid():
+    tokenizer = FakeTokenizer(['(', ')', '[', ']', '"', ':', ',', 'title', '▁"', 'x'])
+    processor = JsonSchemaLogitsProcessor(JsonTokenTable(tokenizer), CAREER_PATH_SCHEMA)
+    ids = {piece: token_id for token_id, piece in enumerate(tokenizer.pieces)}
+    matcher = processor._matcher_for(0, [ids['('], ids['"'], ids['title'], ids['"'], ids[':']])
+    allowed = {tokenizer.pieces[token_id] for token_id in processor._allowed(matcher, range(len(tokenizer)))}
+    assert allowed == {'▁"', '"'}
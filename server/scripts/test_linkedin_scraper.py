@@ -22,12 +22,14 @@ def main():
     print(f"Testing LinkedIn scraper with keyword='{keyword}', location='{location}', limit={limit}")
     
     try:
-        # Import the scrape_linkedin_jobs function from the linkedin_scraper module
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from scripts.linkedin_scraper import scrape_linkedin_jobs
-        
-        # Run the scraper
-        jobs = scrape_linkedin_jobs(keyword, location, limit)
+        # The script runs from the scripts directory, so its sibling modules import directly
+        from linkedin_scraper import LinkedInJobCollector
+
+        # Run the scraper, printing each job as it arrives
+        jobs = []
+        for job in LinkedInJobCollector(keyword, location, limit):
+            print(f"  {job['title']} at {job['company']}")
+            jobs.append(job)
         
         # Print results
         print(f"\nScraping completed! Found {len(jobs)} jobs.")
@@ -0,0 +1,89 @@
+import re
+
+import pytest
+
+from prompt_budget import JOB_TEXT_RESERVE, MARGIN_TOKENS, fit_prompt_inputs
+
+class WordTokenizer:
+    """One token per word, trailing whitespace included, so decode(encode(text)) == text."""
+
+    def __init__(self):
+        self.vocab = []
+        self.ids = {}
+
+    def __call__(self, text, add_special_tokens=False):
+        ids = []
+        for piece in re.findall(r'\s+|\S+\s*', text):
+            if piece not in self.ids:
+                self.ids[piece] = len(self.vocab)
+                self.vocab.append(piece)
+            ids.append(self.ids[piece])
+        return {'input_ids': ids}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return ''.join(self.vocab[token_id] for token_id in ids)
+
+class Generator:
+    def __init__(self):
+        self.tokenizer = WordTokenizer()
+
+def count(generator, text):
+    return len(generator.tokenizer(text)['input_ids'])
+
+def build_prompt(job_text, resume):
+    return f"[INST] Tailor this resume to the job.\nJob:\n{job_text}\nResume:\n{resume}\n[/INST]"
+
+def lines(prefix, n, words=10):
+    return '\n'.join(f"{prefix} {i} " + ' '.join(['word'] * words) for i in range(n))
+
+JOB = "Data Engineer\nRequirements:\n- 3+ years of Python and SQL\n- Airflow experience"
+RESUME = "Jane Doe\nExperience\n- Built ETL pipelines in Python\nSkills\nPython, SQL"
+
+def test_short_inputs_are_unchanged():
+    generator = Generator()
+    job, resume, report = fit_prompt_inputs(generator, JOB, RESUME, 256, build_prompt, context_tokens=4096)
+    assert (job, resume) == (JOB, RESUME)
+    assert not report['truncated']
+    assert report['jobTokens'] == report['jobTokensIn'] and report['resumeTokens'] == report['resumeTokensIn']
+
+@pytest.mark.parametrize('context_tokens', [600, 1200, 3000])
+def test_long_inputs_fit_the_context(context_tokens):
+    generator = Generator()
+    job, resume, report = fit_prompt_inputs(generator, lines('job', 150), lines('resume', 150), 256, build_prompt,
+                                            context_tokens=context_tokens)
+    assert report['truncated']
+    prompt_tokens = count(generator, build_prompt(job, resume))
+    assert prompt_tokens + 256 <= context_tokens
+    assert report['promptTokens'] + report['maxNewTokens'] + MARGIN_TOKENS <= context_tokens
+
+def test_resume_has_priority_but_the_job_keeps_its_reserve():
+    generator = Generator()
+    job_in, resume_in = lines('job', 200), lines('resume', 200)
+    job, resume, report = fit_prompt_inputs(generator, job_in, resume_in, 256, build_prompt, context_tokens=2048)
+    assert report['jobTokens'] == pytest.approx(JOB_TEXT_RESERVE, abs=1)
+    assert report['resumeTokens'] > report['jobTokens']
+    # Cuts keep the start of each input and end on a whole line
+    assert job_in.startswith(job) and resume_in.startswith(resume)
+    assert resume_in[len(resume)] == '\n'
+
+def test_a_short_job_text_leaves_the_rest_to_the_resume():
+    generator = Generator()
+    job, resume, report = fit_prompt_inputs(generator, JOB, lines('resume', 300), 256, build_prompt,
+                                            context_tokens=2048)
+    assert job == JOB
+    assert report['jobTokens'] == report['jobTokensIn']
+    assert report['resumeTokens'] + report['jobTokens'] + report['templateTokens'] + 256 + MARGIN_TOKENS == 2048
+
+def test_boilerplate_goes_before_the_requirements_are_cut():
+    generator = Generator()
+    benefits = "Benefits:\n" + lines('- Dental and vision plan', 80)
+    eeo = "We are an equal opportunity employer and consider applicants without regard to national origin."
+    job, _, report = fit_prompt_inputs(generator, f"{JOB}\n\n{benefits}\n\n{eeo}", RESUME, 256, build_prompt,
+                                       context_tokens=4096)
+    assert job == JOB
+    assert report['boilerplateChars'] > len(benefits)
+    assert not report['truncated']
+
+def test_no_room_for_the_prompt_is_an_error():
+    with pytest.raises(ValueError):
+        fit_prompt_inputs(Generator(), JOB, RESUME, 4090, build_prompt, context_tokens=4096)
@@ -0,0 +1,70 @@
+import pytest
+
+from rate_limit import HostRateLimiter, TokenBucket
+
+class Clock:
+    """A monotonic clock that only moves when sleep() is called."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def acquire_times(bucket, clock, count):
+    times = []
+    for _ in range(count):
+        bucket.acquire()
+        times.append(clock.now - 100.0)
+    return times
+
+def test_a_full_bucket_allows_a_burst_without_waiting():
+    clock = Clock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+    assert acquire_times(bucket, clock, 3) == [0, 0, 0]
+    assert clock.sleeps == []
+
+def test_after_the_burst_acquisitions_come_at_the_rate():
+    clock = Clock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+    times = acquire_times(bucket, clock, 7)
+    assert times[3:] == pytest.approx([0.5, 1.0, 1.5, 2.0])
+
+@pytest.mark.parametrize('rate, burst, count', [(0.5, 2, 10), (4, 1, 40), (10, 5, 100)])
+def test_long_run_average_is_the_rate(rate, burst, count):
+    clock = Clock()
+    bucket = TokenBucket(rate, burst, clock=clock, sleep=clock.sleep)
+    elapsed = acquire_times(bucket, clock, count)[-1]
+    # The first burst tokens are free, every later one costs 1 / rate
+    assert elapsed == pytest.approx((count - burst) / rate)
+
+def test_idle_time_refills_up_to_the_burst_only():
+    clock = Clock()
+    bucket = TokenBucket(rate=1, burst=2, clock=clock, sleep=clock.sleep)
+    acquire_times(bucket, clock, 2)
+    clock.now += 60
+    start = clock.now
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.now == start
+    bucket.acquire()
+    assert clock.now == pytest.approx(start + 1)
+
+def test_burst_is_at_least_one():
+    clock = Clock()
+    bucket = TokenBucket(rate=1, burst=0, clock=clock, sleep=clock.sleep)
+    assert acquire_times(bucket, clock, 3) == pytest.approx([0, 1, 2])
+
+def test_hosts_have_separate_buckets():
+    clock = Clock()
+    limiter = HostRateLimiter(rate=1, burst=1, clock=clock, sleep=clock.sleep)
+    limiter.acquire('https://www.linkedin.com/jobs/search?keywords=a')
+    limiter.acquire('https://example.com/jobs')
+    assert clock.now == 100.0
+    limiter.acquire('https://www.linkedin.com/jobs/search?keywords=b')
+    assert clock.now == pytest.approx(101.0)
@@ -0,0 +1,84 @@
+import pytest
+
+import resume_fastpath
+from job_digest import digest_job_post
+from resume_fastpath import BM25, fast_customize, job_query, keyword_gaps
+
+JOB_POST = """Senior Data Engineer
+Requirements:
+- 5+ years of experience building Airflow pipelines
+- Strong SQL and Snowflake skills
+- Experience with Kafka streaming is required
+"""
+
+RESUME = """Jane Doe
+
+Experience
+Acme Corp - Engineer
+- Organised the team offsite
+- Built Airflow pipelines loading Snowflake with SQL
+- Wrote internal documentation
+
+Globex - Analyst
+- Presented quarterly results
+- Tuned SQL queries on Snowflake
+
+Skills
+Excel, Tableau, SQL, Airflow
+"""
+
+@pytest.fixture(autouse=True)
+def uncached_digest(monkeypatch):
+    # Keep the tests off the on-disk digest cache
+    monkeypatch.setattr(resume_fastpath, 'cached_job_digest', lambda job_post: (digest_job_post(job_post), False))
+
+def test_bm25_prefers_documents_with_more_query_terms():
+    model = BM25([['sql', 'snowflake'], ['sql'], ['excel', 'slides']])
+    query = {'sql': 1.0, 'snowflake': 2.0}
+    scores = [model.score(i, query) for i in range(3)]
+    assert scores[0] > scores[1] > scores[2] == 0.0
+
+def test_bm25_rare_terms_weigh_more():
+    model = BM25([['sql', 'kafka'], ['sql'], ['sql']])
+    assert model.idf['kafka'] > model.idf['sql']
+
+def test_job_query_weighs_keywords_double():
+    query = job_query({'requirements': ['Strong SQL skills'], 'keywords': ['Snowflake', 'SQL']})
+    assert query['sql'] == 3.0
+    assert query['snowflake'] == 2.0
+
+def test_relevant_bullets_move_up_within_their_employer():
+    customized, _, _ = fast_customize(JOB_POST, RESUME)
+    lines = customized.split('\n')
+    acme = lines[lines.index('Acme Corp - Engineer') + 1:lines.index('Acme Corp - Engineer') + 4]
+    globex = lines[lines.index('Globex - Analyst') + 1:lines.index('Globex - Analyst') + 3]
+    assert acme[0] == '- Built Airflow pipelines loading Snowflake with SQL'
+    # Ties keep their order
+    assert acme[1:] == ['- Organised the team offsite', '- Wrote internal documentation']
+    assert globex == ['- Tuned SQL queries on Snowflake', '- Presented quarterly results']
+
+def test_matching_skills_are_listed_first():
+    customized, _, _ = fast_customize(JOB_POST, RESUME)
+    skills = customized.split('Skills\n', 1)[1].split('\n')[0]
+    assert skills.split(', ')[:2] in (['SQL', 'Airflow'], ['Airflow', 'SQL'])
+    assert sorted(skills.split(', ')) == ['Airflow', 'Excel', 'SQL', 'Tableau']
+
+def test_skill_labels_and_separators_are_kept():
+    resume = "Skills\n- Tools: Excel | Snowflake | Jira\nLanguages: French"
+    customized, _, _ = fast_customize(JOB_POST, resume)
+    assert customized == "Skills\n- Tools: Snowflake | Excel | Jira\nLanguages: French"
+
+def test_only_the_order_changes():
+    customized, _, _ = fast_customize(JOB_POST, RESUME)
+    skills_line = 'Excel, Tableau, SQL, Airflow'
+    kept = [line for line in customized.split('\n') if ', ' not in line]
+    assert sorted(kept) == sorted(line for line in RESUME.strip().split('\n') if line != skills_line)
+
+def test_an_already_ordered_resume_is_unchanged():
+    resume = "Summary\nData engineer.\n\nExperience\n- Built Airflow pipelines on Snowflake\n- Hosted meetups"
+    customized, _, _ = fast_customize(JOB_POST, resume)
+    assert customized == resume
+
+def test_keyword_gaps_report_what_the_resume_never_mentions():
+    report = keyword_gaps(RESUME, {'keywords': ['Airflow', 'Kafka', 'SQL', 'C']})
+    assert report == {'matched': ['Airflow', 'SQL'], 'missing': ['Kafka', 'C'], 'coverage': 0.5}
@@ -0,0 +1,72 @@
+import pytest
+
+from resume_sections import chunk_text, plan_rewrites, split_sections, stitch_sections
+
+RESUME = """Jane Doe
+jane@example.com | Berlin
+
+## Summary
+Backend engineer with six years of Python.
+
+
+Experience:
+Acme Corp - Senior Engineer (2020 - 2024)
+- Built the billing service in Python
+- Ran the on-call rotation
+
+Globex - Engineer (2018 - 2020)
+- Migrated reports to PostgreSQL
+
+SKILLS
+Python, SQL, Docker
+Hobbies
+Climbing
+"""
+
+def test_split_finds_sections_in_order():
+    sections = split_sections(RESUME)
+    assert [section.kind for section in sections] == ['header', 'summary', 'experience', 'skills', 'other']
+    assert sections[0].body == 'Jane Doe\njane@example.com | Berlin'
+    assert sections[1].heading == '## Summary'
+    assert sections[2].body.startswith('Acme Corp') and sections[2].body.endswith('PostgreSQL')
+    assert not sections[4].rewritable
+
+@pytest.mark.parametrize('resume', [
+    RESUME,
+    RESUME.strip(),
+    '\n\n' + RESUME + '\n\n',
+    'Skills\nPython',
+    'No headings at all\njust text\n',
+    'Summary\n\nEducation\nBSc',
+    '',
+])
+def test_split_then_stitch_gives_back_the_original(resume):
+    assert stitch_sections(split_sections(resume), [], []) == resume
+
+def test_windows_line_endings_come_back_as_newlines():
+    assert stitch_sections(split_sections(RESUME.replace('\n', '\r\n')), [], []) == RESUME
+
+def test_stitch_puts_rewrites_in_place_and_keeps_the_spacing():
+    sections = split_sections(RESUME)
+    prompts, chunks = plan_rewrites(sections, 'Key requirements: Go')
+    assert [sections[index].kind for index, _ in chunks] == ['summary', 'experience', 'skills']
+    assert len(prompts) == 3
+    stitched = stitch_sections(sections, chunks, ['  Go engineer.  ', '', 'Go, Python, SQL, Docker'])
+    expected = (RESUME.replace('Backend engineer with six years of Python.', 'Go engineer.')
+                .replace('Python, SQL, Docker', 'Go, Python, SQL, Docker'))
+    assert stitched == expected
+
+def test_long_sections_are_chunked_and_rejoined():
+    body = '\n\n'.join(f"Company {i}\n- " + 'did things ' * 20 for i in range(10))
+    resume = 'Experience\n' + body
+    sections = split_sections(resume)
+    prompts, chunks = plan_rewrites(sections, 'digest', max_chars=500)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for _, chunk in chunks)
+    assert stitch_sections(sections, chunks, [''] * len(chunks)) == resume
+
+def test_chunk_text_falls_back_to_line_breaks():
+    text = '\n'.join(['x' * 30] * 10)
+    chunks = chunk_text(text, max_chars=100)
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert '\n'.join(chunks) == text
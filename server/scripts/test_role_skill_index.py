@@ -0,0 +1,46 @@
+import pytest
+
+from role_skill_index import RoleSkillIndex, build_index, title_tokens
+
+POSTINGS = [
+    ('Software Engineer, Frontend', ['React', 'TypeScript', 'GraphQL']),
+    ('Founding Frontend Engineer', ['React', 'TypeScript', 'Next.js']),
+    ('Software Engineer, Backend', ['Python', 'PostgreSQL', 'AWS']),
+    ('Senior Software Engineer, Backend', ['Python', 'Go', 'AWS']),
+    ('Product Security Engineer', ['OWASP', 'Threat Modeling']),
+    ('Data Analyst', []),
+]
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / 'index.bin')
+    build_index(POSTINGS, path)
+    return RoleSkillIndex(path)
+
+def test_seniority_words_are_not_title_tokens():
+    assert title_tokens('Senior Sr. Staff Software Engineers') == ['software', 'engineer']
+
+def test_pools_every_role_covering_the_query(index):
+    matches = index.match_roles('frontend engineer', 0.75)
+    assert {role for role, _ in matches} == {'software engineer frontend', 'founding frontend engineer'}
+    assert index.postings(matches) == 2
+    skills = dict(index.skills_for('frontend engineer', matches))
+    assert skills['React'] == pytest.approx(1.0)
+    assert skills['GraphQL'] == pytest.approx(0.5)
+
+def test_seniority_does_not_split_a_role(index):
+    assert index.postings(index.match_roles('Senior Backend Engineer', 0.75)) == 2
+
+def test_partial_title_matches_are_not_pooled(index):
+    # "product" matches the security role, "manager" matches nothing
+    assert index.match_roles('Product Manager', 0.75) == []
+    assert index.match_roles('Product Manager')[0][0] == 'product security engineer'
+
+def test_postings_without_skills_are_left_out(index):
+    assert index.lookup_role('Data Analyst') is None
+    assert index.postings('data analyst') == 0
+
+def test_missing_skills_skip_what_the_user_has(index):
+    missing = index.missing_skills(['python', 'Go'], 'backend engineer')
+    assert missing[:1] == ['AWS']
+    assert 'Python' not in missing and 'Go' not in missing
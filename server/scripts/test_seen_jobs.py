@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import seen_jobs
+from seen_jobs import NEW, UNCHANGED, UPDATED, SeenJobStore, content_hash, job_key
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'seen.sqlite')
+
+def posting(job_id='123', description='Python and SQL'):
+    key = job_key(job_id, f'https://www.linkedin.com/jobs/view/{job_id}/?trk=a', 'Data Engineer', 'Acme', 'Berlin')
+    return key, content_hash('Data Engineer', 'Acme', 'Berlin', description)
+
+def test_a_posting_is_new_until_it_is_marked(db_path):
+    store = SeenJobStore(db_path)
+    key, content = posting()
+    assert store.check(key, content) == NEW
+    # check() alone does not record it: an ingest that never marks it gets it again
+    assert store.check(key, content) == NEW
+    store.mark([(key, content)])
+    assert store.check(key, content) == UNCHANGED
+    assert store.counts == {NEW: 2, UPDATED: 0, UNCHANGED: 1}
+    store.close()
+
+def test_only_unchanged_postings_count_as_seen(db_path):
+    store = SeenJobStore(db_path)
+    key, content = posting()
+    store.mark([(key, content)])
+    _, edited = posting(description='Python, SQL and Airflow')
+    assert store.check(key, edited) == UPDATED
+    # The changed posting keeps being re-emitted until its new content is marked
+    assert store.check(key, edited) == UPDATED
+    assert store.check(key, content) == UNCHANGED
+    store.mark([(key, edited)])
+    assert store.check(key, edited) == UNCHANGED
+    assert store.check(key, content) == UPDATED
+    store.close()
+
+def test_keys_ignore_tracking_parameters():
+    assert job_key(None, 'https://www.linkedin.com/jobs/view/data-engineer-at-acme-42?trk=x', '', '', '') == 'id:42'
+    assert (job_key(None, 'https://example.com/job/7?utm=a', '', '', '')
+            == job_key(None, 'https://example.com/job/7/#top', '', '', ''))
+    assert job_key(None, None, 'Data  Engineer', 'ACME', 'Berlin') == job_key(None, None, 'data engineer', 'acme', 'berlin')
+
+def test_marks_are_written_on_close(db_path):
+    key, content = posting()
+    store = SeenJobStore(db_path)
+    assert store.mark([(key, content)]) == 1
+    store.close()
+    assert SeenJobStore(db_path).check(key, content) == UNCHANGED
+
+def test_close_without_commit_discards_the_marks(db_path):
+    key, content = posting()
+    store = SeenJobStore(db_path)
+    store.mark([(key, content)])
+    store.close(commit=False)
+    assert SeenJobStore(db_path).check(key, content) == NEW
+
+def test_expired_entries_are_dropped_on_close(db_path, monkeypatch):
+    old, fresh = posting('1'), posting('2')
+    store = SeenJobStore(db_path, ttl_seconds=100)
+    monkeypatch.setattr(seen_jobs.time, 'time', lambda: 1000.0)
+    store.mark([old])
+    monkeypatch.setattr(seen_jobs.time, 'time', lambda: 1050.0)
+    store.mark([fresh])
+    monkeypatch.setattr(seen_jobs.time, 'time', lambda: 1120.0)
+    store.close()
+    store = SeenJobStore(db_path)
+    assert len(store) == 1
+    assert store.check(*fresh) == UNCHANGED
+    store.close()
+
+def test_mark_cli_records_the_entries(db_path):
+    entries = [posting('1'), posting('2')]
+    lines = ''.join(json.dumps({'key': key, 'content': content}) + '\n' for key, content in entries)
+    result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'seen_jobs.py'), '--mark', '--db', db_path],
+                            input=lines, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert 'Marked 2 postings' in result.stderr
+    store = SeenJobStore(db_path)
+    assert [store.check(key, content) for key, content in entries] == [UNCHANGED, UNCHANGED]
+    store.close()
+
+def test_mark_cli_records_nothing_when_the_input_is_bad(db_path):
+    key, content = posting()
+    lines = json.dumps({'key': key, 'content': content}) + '\nnot json\n'
+    result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'seen_jobs.py'), '--mark', '--db', db_path],
+                            input=lines, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert SeenJobStore(db_path).check(key, content) == NEW
@@ -0,0 +1,78 @@
+import re
+
+import pytest
+
+from skill_extractor import SkillExtractor, get_extractor, lower_same_length, trie_regex
+
+@pytest.fixture(scope='module')
+def extract():
+    return get_extractor().extract
+
+@pytest.mark.parametrize('text, skills', [
+    ('Java and JavaScript', ['Java', 'JavaScript']),
+    ('JavaScript only', ['JavaScript']),
+    ('Java only', ['Java']),
+    ('Java/Kotlin', ['Java', 'Kotlin']),
+    ('css in the access layer of a digital product', ['CSS']),
+    ('No skills here: digital access', []),
+])
+def test_word_boundaries(extract, text, skills):
+    assert extract(text) == skills
+
+@pytest.mark.parametrize('text, skills', [
+    ('Services written in Go', ['Go']),
+    ('Ready to go live', []),
+    ('Models in R and Python', ['R', 'Python']),
+    ('Our R&D team', []),
+    ('C-level stakeholders', []),
+    ('R-squared above 0.9', []),
+    ('React and React Native', ['React', 'React Native']),
+    ('react to incidents', []),
+    ('reactjs and ReactJS', ['React']),
+    ('golang or Golang', ['Go']),
+])
+def test_case_sensitive_entries(extract, text, skills):
+    assert extract(text) == skills
+
+@pytest.mark.parametrize('text, skills', [
+    ('.NET and ASP.NET', ['.NET', 'ASP.NET']),
+    ('Node.js services', ['Node.js']),
+    ('nodejs, node js', ['Node.js']),
+    ('Vue.js 3 and vue', ['Vue.js']),
+    ('Built with Node.js.', ['Node.js']),
+    ('A vue.jsx file', []),
+    ('Deployed on .NET Core.', ['.NET']),
+])
+def test_dotted_names(extract, text, skills):
+    assert extract(text) == skills
+
+def test_longest_spelling_wins(extract):
+    assert extract('C++ and C# but not C') == ['C++', 'C#', 'C']
+
+def test_results_are_in_order_of_first_mention(extract):
+    assert extract('Docker, then Python, then Docker again') == ['Docker', 'Python']
+
+def test_characters_that_grow_when_lowercased_do_not_shift_matches(extract):
+    # 'İ'.lower() is two characters; React must still be seen as part of React Native
+    assert extract('İİİİ React Native') == ['React Native']
+    assert extract('İstanbul office: React, Go') == ['React', 'Go']
+    assert len(lower_same_length('İstanbul JAVA')) == len('İstanbul JAVA')
+    assert lower_same_length('İstanbul JAVA').endswith('java')
+
+def test_non_text_is_empty(extract):
+    assert extract(None) == []
+    assert extract(float('nan')) == []
+    assert extract('') == []
+
+def test_small_taxonomy():
+    extractor = SkillExtractor({
+        'skills': {'Kubernetes': ['k8s'], 'Go': ['golang']},
+        'caseSensitive': {'Go': ['Go']}
+    })
+    assert extractor.extract('K8S and golang') == ['Kubernetes', 'Go']
+    assert extractor.extract('go home') == []
+
+def test_trie_regex_matches_exactly_the_words():
+    pattern = re.compile('(?:' + trie_regex(['java', 'javascript', 'jax']) + ')$')
+    assert all(pattern.match(word) for word in ['java', 'javascript', 'jax'])
+    assert not any(pattern.match(word) for word in ['jav', 'javas', 'ja'])
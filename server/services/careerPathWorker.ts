@@ -0,0 +1,165 @@
+import { ChildProcessWithoutNullStreams, spawn } from 'child_process';
+import crypto from 'crypto';
+import path from 'path';
+import readline from 'readline';
+import { CareerPathResponse, CareerStep, GenerationBudget } from '../types/career';
+
+export interface CareerPathStreamEvent {
+  event: 'token' | 'step' | 'summary';
+  text?: string;
+  index?: number;
+  step?: CareerStep;
+  timings?: { firstTokenMs: number | null; totalMs: number };
+}
+
+interface WorkerResponse extends Partial<CareerPathStreamEvent> {
+  id: string | null;
+  status: 'ok' | 'error';
+  result: CareerPathResponse & { error?: string };
+}
+
+interface PendingRequest {
+  resolve: (response: CareerPathResponse) => void;
+  reject: (error: Error) => void;
+  onEvent?: (event: CareerPathStreamEvent) => void;
+  timer: NodeJS.Timeout;
+}
+
+// How long a request may wait for the worker before it is rejected, so a hung worker
+// cannot hold callers forever. Requests with a deadline get their deadline plus the
+// grace period, since the worker answers them with the fallback path once it passes.
+const REQUEST_TIMEOUT_MS = Number(process.env.CAREER_WORKER_TIMEOUT_MS) || 120000;
+const DEADLINE_GRACE_MS = 10000;
+
+class CareerPathWorker {
+  private process: ChildProcessWithoutNullStreams | null = null;
+  private pending = new Map<string, PendingRequest>();
+  private scriptPath = path.join(__dirname, '..', 'scripts', 'career_path_predictor.py');
+
+  /**
+   * Start the long-running Python worker if it is not already running.
+   * The worker keeps the career model loaded between requests.
+   */
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.process) {
+      return this.process;
+    }
+
+    console.log('Starting career path worker...');
+    const python = spawn('python', [this.scriptPath, '--serve']);
+
+    readline.createInterface({ input: python.stdout }).on('line', (line) => {
+      let response: WorkerResponse;
+      try {
+        response = JSON.parse(line);
+      } catch (error) {
+        console.error('Career path worker sent invalid JSON:', line);
+        return;
+      }
+
+      const request = response.id ? this.pending.get(response.id) : undefined;
+      if (!request) {
+        console.warn('Career path worker response without a pending request:', line);
+        return;
+      }
+
+      if (response.event && response.event !== 'summary') {
+        // Partial output of a streamed request; the summary line completes it
+        request.onEvent?.(response as CareerPathStreamEvent);
+        return;
+      }
+
+      this.pending.delete(response.id as string);
+      clearTimeout(request.timer);
+      if (response.event === 'summary') {
+        request.onEvent?.(response as CareerPathStreamEvent);
+      }
+      if (response.status === 'ok') {
+        request.resolve(response.result);
+      } else {
+        request.reject(new Error(response.result?.error || 'Career path worker returned an error'));
+      }
+    });
+
+    python.stderr.on('data', (data) => {
+      console.error('Career path worker stderr:', data.toString());
+    });
+
+    const failPending = (reason: string) => {
+      this.process = null;
+      for (const request of this.pending.values()) {
+        clearTimeout(request.timer);
+        request.reject(new Error(reason));
+      }
+      this.pending.clear();
+    };
+
+    python.on('error', (error) => failPending(`Failed to start career path worker: ${error.message}`));
+    python.on('close', (code) => failPending(`Career path worker exited with code ${code}`));
+
+    this.process = python;
+    return python;
+  }
+
+  /**
+   * Register a pending request and send it to the worker. The request is
+   * rejected and forgotten if no answer arrives within its timeout.
+   */
+  private send(
+    request: Record<string, unknown>,
+    budget: GenerationBudget,
+    resolve: (response: CareerPathResponse) => void,
+    reject: (error: Error) => void,
+    onEvent?: (event: CareerPathStreamEvent) => void
+  ): void {
+    const python = this.ensureStarted();
+    const id = crypto.randomUUID();
+    const timeoutMs = budget.deadlineMs
+      ? Math.min(REQUEST_TIMEOUT_MS, budget.deadlineMs + DEADLINE_GRACE_MS)
+      : REQUEST_TIMEOUT_MS;
+
+    const timer = setTimeout(() => {
+      if (this.pending.delete(id)) {
+        reject(new Error(`Career path worker did not answer within ${timeoutMs}ms`));
+      }
+    }, timeoutMs);
+    this.pending.set(id, { resolve, reject, onEvent, timer });
+    python.stdin.write(JSON.stringify({ id, ...request, ...budget }) + '\n');
+  }
+
+  /**
+   * Predict a career path using the resident worker
+   *
+   * @param skills - The user's current skills
+   * @param role - The target role
+   * @param budget - Optional deadline and token cap; past the deadline the fallback path is returned
+   * @returns Promise<CareerPathResponse> - The generated career path
+   */
+  predict(skills: string[], role: string, budget: GenerationBudget = {}): Promise<CareerPathResponse> {
+    return new Promise<CareerPathResponse>((resolve, reject) => {
+      this.send({ skills, role }, budget, resolve, reject);
+    });
+  }
+
+  /**
+   * Predict a career path, receiving tokens and completed steps as they are generated
+   *
+   * @param skills - The user's current skills
+   * @param role - The target role
+   * @param onEvent - Called for every token, step and the final summary event
+   * @param budget - Optional deadline and token cap; past the deadline the fallback path is returned
+   * @returns Promise<CareerPathResponse> - The complete career path
+   */
+  stream(
+    skills: string[],
+    role: string,
+    onEvent: (event: CareerPathStreamEvent) => void,
+    budget: GenerationBudget = {}
+  ): Promise<CareerPathResponse> {
+    return new Promise<CareerPathResponse>((resolve, reject) => {
+      this.send({ skills, role, stream: true }, budget, resolve, reject, onEvent);
+    });
+  }
+}
+
+export default new CareerPathWorker();
@@ -37,15 +37,8 @@ class CronService {
     cron.schedule('0 0,12 * * *', async () => {
       try {
         console.log('Starting scheduled job scraping...');
-        for (const keyword of this.keywords) {
-          try {
-            await scraperService.scrapeJobs(keyword, ""); // Empty location = all locations
-            await new Promise(resolve => setTimeout(resolve, 5000));
-          } catch (error) {
-            console.error(`Error scraping jobs for ${keyword}:`, error);
-            continue;
-          }
-        }
+        // One LinkedIn run covers every keyword, with its queries scraped concurrently
+        await scraperService.scrapeJobMatrix(this.keywords, [""]); // Empty location = all locations
         await this.chatbot.initialize();
         console.log('Scheduled job scraping completed');
       } catch (error) {
@@ -1,4 +1,6 @@
 import Job, { IJob } from '../models/Job';
+import { IScrapedJob } from '../types/job.types';
+import { skillPatterns } from '../utils/skills';
 
 class JobService {
   /**
@@ -189,7 +191,10 @@ class JobService {
       }
       
       if (filters.skills && filters.skills.length > 0) {
-        query.skills = { $in: filters.skills };
+        // Case-insensitive, and by canonical name too: older jobs store lowercase skills
+        query.skills = {
+          $in: (filters.skills as string[]).reduce<RegExp[]>((patterns, skill) => patterns.concat(skillPatterns(skill)), [])
+        };
       }
       
       // Calculate pagination
@@ -244,6 +249,36 @@ class JobService {
     }
   }
 
+  /**
+   * Store scraped jobs, updating the ones already stored
+   *
+   * A job replaces the stored one with the same URL (or, without a URL, the same
+   * title, company and location), so a re-scraped posting is updated rather than
+   * inserted again.
+   */
+  async createManyJobs(jobs: IScrapedJob[]): Promise<{ inserted: number; updated: number }> {
+    if (jobs.length === 0) {
+      return { inserted: 0, updated: 0 };
+    }
+    try {
+      const result = await Job.bulkWrite(
+        // query and seen describe the scrape, not the job
+        jobs.map(({ query, seen, ...job }) => ({
+          updateOne: {
+            filter: job.url ? { url: job.url } : { title: job.title, company: job.company, location: job.location },
+            update: { $set: job },
+            upsert: true
+          }
+        })),
+        { ordered: false }
+      );
+      return { inserted: result.upsertedCount, updated: result.modifiedCount };
+    } catch (error) {
+      console.error('Error storing scraped jobs:', error);
+      throw error;
+    }
+  }
+
   /**
    * Update a job
    */
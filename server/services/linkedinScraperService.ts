@@ -1,12 +1,28 @@
-import { exec } from 'child_process';
-import fs from 'fs/promises';
+import { exec, spawn } from 'child_process';
 import path from 'path';
-import { IScrapedJob } from '../types/job.types';
+import { IScrapedJob, ISeenJobEntry } from '../types/job.types';
+import { forEachLine } from '../utils/lineStream';
 import jobService from './jobService';
 
+// Jobs stored per database write while the scraper is still running
+const INGEST_BATCH_SIZE = 25;
+
+export interface LinkedInQueryCount {
+  keyword: string;
+  location: string;
+  count: number;
+}
+
+export interface LinkedInMatrixResult {
+  total: number;
+  perQuery: LinkedInQueryCount[];
+}
+
 class LinkedinScraperService {
   /**
    * Scrape LinkedIn jobs using the Python script
+   *
+   * Jobs are stored in batches while scraping continues (see runScraper).
    * 
    * @param keyword - Job title or keyword to search for
    * @param location - Location to search in
@@ -16,61 +32,199 @@ class LinkedinScraperService {
   async scrapeLinkedInJobs(keyword: string, location: string, limit: number = 25): Promise<IScrapedJob[]> {
     try {
       console.log(`Starting LinkedIn job scraping for ${keyword} in ${location}...`);
-      
-      // Path to the Python script
-      const scriptPath = path.join(__dirname, '..', 'scripts', 'linkedin_scraper.py');
-      
-      // Execute the Python script
-      const command = `python "${scriptPath}" "${keyword}" "${location}" ${limit}`;
-      
-      return new Promise<IScrapedJob[]>((resolve, reject) => {
-        exec(command, async (error, stdout, stderr) => {
-          if (error) {
-            console.error(`Error executing LinkedIn scraper: ${error.message}`);
-            reject(error);
-            return;
-          }
-          
-          if (stderr) {
-            console.warn(`LinkedIn scraper stderr: ${stderr}`);
+
+      const jobs: IScrapedJob[] = [];
+      await this.runScraper([keyword, location, String(limit), '--stream'], null, (job) => jobs.push(job));
+
+      if (jobs.length > 0) {
+        console.log(`Successfully stored ${jobs.length} LinkedIn jobs in the database`);
+      } else {
+        console.log('No LinkedIn jobs found');
+      }
+      return jobs;
+    } catch (error) {
+      console.error('Error in scrapeLinkedInJobs:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Scrape every keyword x location combination in one run of the Python script
+   *
+   * The script shares one scraper across all queries, runs up to `workers` of them
+   * concurrently and rate-limits job pages per host, which replaces one process
+   * and a fixed sleep per keyword. The run is incremental: postings already stored
+   * unchanged are skipped by the script's seen-job index, so only new and updated
+   * jobs arrive here. They are stored in batches as they do, and recorded in the
+   * index once their batch is stored.
+   *
+   * @param keywords - Job titles or keywords to search for
+   * @param locations - Locations to search in ("" for all locations)
+   * @param limit - Maximum number of jobs to scrape per query
+   * @param workers - Concurrent queries; the script's default when omitted
+   * @returns Promise<LinkedInMatrixResult> - New and updated jobs stored, in total and per query
+   */
+  async scrapeLinkedInMatrix(
+    keywords: string[],
+    locations: string[],
+    limit: number = 25,
+    workers?: number
+  ): Promise<LinkedInMatrixResult> {
+    try {
+      console.log(`Starting LinkedIn job scraping for ${keywords.length} keywords in ${locations.length} locations...`);
+
+      const perQuery = new Map<string, LinkedInQueryCount>();
+      for (const keyword of keywords) {
+        for (const location of locations) {
+          perQuery.set(JSON.stringify([keyword, location]), { keyword, location, count: 0 });
+        }
+      }
+      let total = 0;
+
+      const args = ['--matrix', '-', '--incremental'];
+      if (workers !== undefined) {
+        args.push('--workers', String(workers));
+      }
+      await this.runScraper(args, JSON.stringify({ keywords, locations, limit }), (job) => {
+        total++;
+        if (job.query) {
+          const entry = perQuery.get(JSON.stringify([job.query.keyword, job.query.location]));
+          if (entry) {
+            entry.count++;
           }
-          
-          console.log(`LinkedIn scraper stdout: ${stdout}`);
-          
-          try {
-            // Read the output JSON file
-            const outputFile = path.join(__dirname, '..', 'data', `linkedin_jobs_${keyword}_${location}.json`);
-            const fileContent = await fs.readFile(outputFile, 'utf-8');
-            const jobs: IScrapedJob[] = JSON.parse(fileContent);
-            
-            // Process and store jobs
-            if (jobs.length > 0) {
-              // Convert string dates to Date objects
-              const processedJobs = jobs.map(job => ({
-                ...job,
-                posted_date: new Date(job.posted_date),
-              }));
-              
-              // Store jobs in database
-              await jobService.createManyJobs(processedJobs);
-              console.log(`Successfully stored ${jobs.length} LinkedIn jobs in the database`);
-            } else {
-              console.log('No LinkedIn jobs found');
+        }
+      });
+
+      console.log(`Successfully stored ${total} LinkedIn jobs from ${perQuery.size} queries in the database`);
+      return { total, perQuery: Array.from(perQuery.values()) };
+    } catch (error) {
+      console.error('Error in scrapeLinkedInMatrix:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Run the Python script in a streaming mode and store its jobs in batches
+   *
+   * The script writes one JSON line per job as soon as it is scraped, so jobs are
+   * stored while scraping continues instead of after the whole run.
+   *
+   * @param args - Script arguments; passed as-is, without a shell
+   * @param input - Written to the script's stdin, if given
+   * @param onJob - Called with every job as it arrives
+   */
+  private async runScraper(args: string[], input: string | null, onJob: (job: IScrapedJob) => void): Promise<void> {
+    // Path to the Python script
+    const scriptPath = path.join(__dirname, '..', 'scripts', 'linkedin_scraper.py');
+
+    const pythonProcess = spawn('python', [scriptPath, ...args]);
+    const exited = new Promise<number | null>((resolve, reject) => {
+      pythonProcess.on('close', resolve);
+      pythonProcess.on('error', reject);
+    });
+    // Avoid an unhandled rejection if spawning fails before the output loop ends
+    exited.catch(() => undefined);
+    // Once its jobs can no longer be stored, the scraper is stopped and its remaining output ignored
+    let stopped = false;
+    const stop = () => {
+      stopped = true;
+      if (pythonProcess.exitCode === null && pythonProcess.signalCode === null) {
+        pythonProcess.kill();
+      }
+    };
+
+    pythonProcess.stderr.on('data', (data) => {
+      console.warn(`LinkedIn scraper stderr: ${data}`);
+    });
+    if (input !== null) {
+      pythonProcess.stdin.end(input);
+    }
+
+    let batch: IScrapedJob[] = [];
+    // Seen-job entries of the jobs stored so far; only these are recorded in the index
+    const storedSeen: ISeenJobEntry[] = [];
+    // Batches are written one after another while the scraper keeps producing jobs
+    let stored = Promise.resolve();
+    const storeBatch = () => {
+      if (batch.length > 0) {
+        const jobsToStore = batch;
+        batch = [];
+        stored = stored.then(async () => {
+          const { inserted, updated } = await jobService.createManyJobs(jobsToStore);
+          console.log(`Stored ${jobsToStore.length} LinkedIn jobs in the database (${inserted} new, ${updated} updated)`);
+          for (const job of jobsToStore) {
+            if (job.seen) {
+              storedSeen.push(job.seen);
             }
-            
-            resolve(jobs);
-          } catch (readError) {
-            console.error(`Error reading LinkedIn scraper output: ${readError}`);
-            reject(readError);
           }
         });
+        // A failed write stops the scraper at once; the error is reported by the await below
+        stored.catch(stop);
+      }
+    };
+
+    try {
+      await forEachLine(pythonProcess.stdout, (line) => {
+        if (stopped) {
+          return;
+        }
+        const scraped = JSON.parse(line) as IScrapedJob;
+        // Convert string dates to Date objects
+        const job = { ...scraped, posted_date: new Date(scraped.posted_date) };
+        onJob(job);
+        batch.push(job);
+        if (batch.length >= INGEST_BATCH_SIZE) {
+          storeBatch();
+        }
       });
+      storeBatch();
+      await stored;
     } catch (error) {
-      console.error('Error in scrapeLinkedInJobs:', error);
+      // Bad output or a failed write: don't leave the scraper running (and its Chrome sessions open)
+      stop();
+      await exited.catch(() => undefined);
       throw error;
+    } finally {
+      // Jobs of a failed batch stay unrecorded, so the next incremental run emits them again
+      if (storedSeen.length > 0) {
+        await this.markSeen(storedSeen);
+      }
+    }
+
+    const code = await exited;
+    if (code !== 0) {
+      throw new Error(`LinkedIn scraper exited with code ${code}`);
+    }
+  }
+
+  /**
+   * Record stored jobs in the scraper's seen-job index (scripts/seen_jobs.py)
+   *
+   * A failure is logged, not thrown: the jobs are stored, and the next
+   * incremental run merely emits them again.
+   *
+   * @param entries - Seen-job entries of the stored jobs
+   */
+  private async markSeen(entries: ISeenJobEntry[]): Promise<void> {
+    const scriptPath = path.join(__dirname, '..', 'scripts', 'seen_jobs.py');
+    try {
+      const markProcess = spawn('python', [scriptPath, '--mark']);
+      markProcess.stderr.on('data', (data) => {
+        console.warn(`Seen-job index stderr: ${data}`);
+      });
+      const code = await new Promise<number | null>((resolve, reject) => {
+        markProcess.on('close', resolve);
+        markProcess.on('error', reject);
+        markProcess.stdin.end(entries.map((entry) => JSON.stringify(entry)).join('\n') + '\n');
+      });
+      if (code !== 0) {
+        throw new Error(`seen_jobs.py exited with code ${code}`);
+      }
+    } catch (error) {
+      console.error('Error recording stored LinkedIn jobs as seen:', error);
     }
   }
-  
+
   /**
    * Check if Chrome and ChromeDriver are installed
    * @returns Promise<boolean> - True if dependencies are installed
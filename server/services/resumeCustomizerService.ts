@@ -0,0 +1,109 @@
+import axios, { AxiosError } from 'axios';
+import { forEachLine } from '../utils/lineStream';
+
+export type CustomizeStrategy = 'single' | 'sections' | 'fast';
+
+/** Job keywords the resume does and does not mention (fast path only) */
+export interface KeywordGaps {
+  matched: string[];
+  missing: string[];
+  coverage: number;
+}
+
+export interface CustomizeResult {
+  customizedResume: string;
+  /** 'model' for an LLM rewrite, 'fastpath' for the deterministic reordering */
+  servedBy?: 'model' | 'fastpath';
+  keywordGaps?: KeywordGaps;
+  /** Every alternative when more than one was requested; customizedResume is the first */
+  variants?: string[];
+  timings?: { queueMs?: number; generationMs?: number; fastPathMs?: number };
+}
+
+/** One newline-delimited JSON frame from the resume customizer's streaming mode */
+export type ResumeStreamFrame =
+  | { event: 'token'; text: string }
+  | {
+      event: 'meta';
+      status: 'ok';
+      strategy: string;
+      servedBy: 'model' | 'fastpath';
+      keywordGaps?: KeywordGaps;
+      promptTokens: number | null;
+      completionTokens: number | null;
+      timings: { firstTokenMs: number | null; totalMs: number; [name: string]: unknown };
+    }
+  | { event: 'error'; error: string };
+
+export class ResumeCustomizerBusyError extends Error {}
+
+class ResumeCustomizerService {
+  private baseUrl = process.env.RESUME_CUSTOMIZER_URL?.replace(/\/+$/, '');
+
+  /**
+   * Whether a resident resume customizer server is configured.
+   * Start one with `python scripts/resume_customizer_script.py --serve` and set RESUME_CUSTOMIZER_URL.
+   */
+  isEnabled(): boolean {
+    return Boolean(this.baseUrl);
+  }
+
+  /**
+   * Customize a resume using the resident server, which keeps the model loaded between requests
+   *
+   * @param jobPost - The job description text
+   * @param resume - The user's resume text
+   * @param strategy - 'single', 'sections' or 'fast'; the server's default when omitted
+   * @param numVariants - How many alternative resumes to generate in one batched pass (1-4)
+   * @returns Promise<CustomizeResult> - The customized resume(s) and server-side timings
+   * @throws ResumeCustomizerBusyError when the server's queue is full or it is shutting down
+   */
+  async customize(
+    jobPost: string,
+    resume: string,
+    strategy?: CustomizeStrategy,
+    numVariants?: number
+  ): Promise<CustomizeResult> {
+    try {
+      const response = await axios.post<CustomizeResult>(`${this.baseUrl}/customize`, { jobPost, resume, strategy, numVariants });
+      return response.data;
+    } catch (error) {
+      const axiosError = error as AxiosError<{ error?: string }>;
+      if (axiosError.response?.status === 503) {
+        throw new ResumeCustomizerBusyError(axiosError.response.data?.error || 'Resume customizer is busy');
+      }
+      throw new Error(axiosError.response?.data?.error || axiosError.message);
+    }
+  }
+
+  /**
+   * Customize a resume using the resident server, receiving tokens as they are generated
+   *
+   * @param jobPost - The job description text
+   * @param resume - The user's resume text
+   * @param strategy - 'single', 'sections' or 'fast'; the server's default when omitted
+   * @param onFrame - Called with every token frame, then the final meta (or error) frame
+   * @throws ResumeCustomizerBusyError when the server's queue is full or it is shutting down
+   */
+  async stream(
+    jobPost: string,
+    resume: string,
+    strategy: CustomizeStrategy | undefined,
+    onFrame: (frame: ResumeStreamFrame) => void
+  ): Promise<void> {
+    let response;
+    try {
+      response = await axios.post(`${this.baseUrl}/customize/stream`, { jobPost, resume, strategy }, { responseType: 'stream' });
+    } catch (error) {
+      const axiosError = error as AxiosError;
+      if (axiosError.response?.status === 503) {
+        throw new ResumeCustomizerBusyError('Resume customizer is busy');
+      }
+      throw new Error(axiosError.message);
+    }
+
+    await forEachLine(response.data, (line) => onFrame(JSON.parse(line) as ResumeStreamFrame));
+  }
+}
+
+export default new ResumeCustomizerService();
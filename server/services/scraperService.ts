@@ -200,6 +200,49 @@ class ScraperService {
       throw e;
     }
   }
+
+  // Scrape every keyword x location: LinkedIn in one concurrent, rate-limited run, then the HTML sources per query
+  async scrapeJobMatrix(keywords: string[], locations: string[]): Promise<number> {
+    console.log(`Starting job scraping for ${keywords.length} keywords in ${locations.length} locations...`);
+    let total = 0;
+
+    // LinkedIn: the Python scraper stores its jobs itself as they arrive
+    let linkedInDone = false;
+    try {
+      if (await linkedinScraperService.checkDependencies()) {
+        const result = await linkedinScraperService.scrapeLinkedInMatrix(keywords, locations, 25);
+        total += result.total;
+        linkedInDone = true;
+      } else {
+        console.warn('LinkedIn scraper dependencies are not properly installed. Falling back to basic scraper.');
+      }
+    } catch (error) {
+      console.error('Error using Python LinkedIn scraper, falling back to basic scraper:', error);
+    }
+
+    for (const keyword of keywords) {
+      for (const location of locations) {
+        try {
+          const linkedInJobs = linkedInDone ? [] : await this.scrapeLinkedInJobsBasic(keyword, location);
+          const indeedJobs = await this.scrapeIndeedJobs(keyword, location);
+          await setTimeout(2000); // 2 second delay between requests to the same site
+          const naukriJobs = await this.scrapeNaukriJobs(keyword, location);
+
+          const allJobs = [...linkedInJobs, ...indeedJobs, ...naukriJobs];
+          if (allJobs.length > 0) {
+            await jobService.createManyJobs(allJobs);
+            total += allJobs.length;
+          }
+        } catch (error) {
+          console.error(`Error scraping jobs for ${keyword} in ${location}:`, error);
+        }
+        await setTimeout(2000);
+      }
+    }
+
+    console.log(`Successfully scraped and stored ${total} jobs`);
+    return total;
+  }
 }
 
 export default new ScraperService(); 
\ No newline at end of file
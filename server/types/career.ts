@@ -21,4 +21,13 @@ export interface CareerPathResponse {
   missingSkills: string[];
   steps: CareerStep[];
   learningModules: LearningModule[];
+  /** Which path answered: the model, the result cache, or the deterministic fallback */
+  servedBy?: 'model' | 'cache' | 'fallback';
+}
+
+export interface GenerationBudget {
+  /** Wall-clock budget in milliseconds, counted from when the worker receives the request */
+  deadlineMs?: number;
+  /** Cap on newly generated tokens */
+  maxNewTokens?: number;
 } 
\ No newline at end of file
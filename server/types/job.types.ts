@@ -13,6 +13,15 @@ export interface IScrapedJob {
   remote?: boolean;
   skills?: string[];
   requirements?: string[];
+  // The keyword x location query that found the job, in multi-query scrapes
+  query?: IScrapeTarget;
+  // Seen-job index entry of an incremental scrape, recorded once the job is stored
+  seen?: ISeenJobEntry;
+}
+
+export interface ISeenJobEntry {
+  key: string;
+  content: string;
 }
 
 export interface IScrapeTarget {
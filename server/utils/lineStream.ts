@@ -0,0 +1,36 @@
+/**
+ * Calls onLine for every complete line of a text stream as soon as it arrives
+ */
+export function forEachLine(stream: NodeJS.ReadableStream, onLine: (line: string) => void): Promise<void> {
+  return new Promise((resolve, reject) => {
+    // Decode as UTF-8 here so a character split across chunks is not garbled
+    stream.setEncoding('utf8');
+    let buffered = '';
+    stream.on('data', (chunk: string) => {
+      buffered += chunk;
+      let newline;
+      while ((newline = buffered.indexOf('\n')) !== -1) {
+        const line = buffered.slice(0, newline).trim();
+        buffered = buffered.slice(newline + 1);
+        if (line) {
+          try {
+            onLine(line);
+          } catch (error) {
+            reject(error);
+          }
+        }
+      }
+    });
+    stream.on('end', () => {
+      if (buffered.trim()) {
+        try {
+          onLine(buffered.trim());
+        } catch (error) {
+          return reject(error);
+        }
+      }
+      resolve();
+    });
+    stream.on('error', reject);
+  });
+}
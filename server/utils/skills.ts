@@ -0,0 +1,58 @@
+import fs from 'fs';
+import path from 'path';
+
+interface SkillTaxonomy {
+  skills: Record<string, string[]>;
+  caseSensitive?: Record<string, string[]>;
+}
+
+// Lowercased name or alias -> canonical name from data/skill_taxonomy.json, loaded on first use
+let canonicalNames: Map<string, string> | null = null;
+
+function loadCanonicalNames(): Map<string, string> {
+  const names = new Map<string, string>();
+  try {
+    const taxonomyPath = path.join(__dirname, '..', 'data', 'skill_taxonomy.json');
+    const taxonomy = JSON.parse(fs.readFileSync(taxonomyPath, 'utf8')) as SkillTaxonomy;
+    for (const name of Object.keys(taxonomy.skills)) {
+      for (const spelling of [name, ...taxonomy.skills[name]]) {
+        if (!names.has(spelling.toLowerCase())) {
+          names.set(spelling.toLowerCase(), name);
+        }
+      }
+    }
+    const caseSensitive = taxonomy.caseSensitive || {};
+    for (const name of Object.keys(caseSensitive)) {
+      for (const spelling of caseSensitive[name]) {
+        if (!names.has(spelling.toLowerCase())) {
+          names.set(spelling.toLowerCase(), name);
+        }
+      }
+    }
+  } catch (error) {
+    console.error('Error loading the skill taxonomy:', error);
+  }
+  return names;
+}
+
+/**
+ * The taxonomy's canonical name for a skill ("node.js" and "nodejs" -> "Node.js"),
+ * or the trimmed skill itself when the taxonomy does not know it
+ */
+export function canonicalSkill(skill: string): string {
+  if (canonicalNames === null) {
+    canonicalNames = loadCanonicalNames();
+  }
+  const trimmed = skill.trim();
+  return canonicalNames.get(trimmed.toLowerCase()) || trimmed;
+}
+
+/**
+ * Matches a stored skill equal to skill or its canonical name, ignoring case, so
+ * jobs stored with lowercase skills and jobs stored with canonical names both match
+ */
+export function skillPatterns(skill: string): RegExp[] {
+  const escape = (text: string) => text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  const spellings = new Set([skill.trim().toLowerCase(), canonicalSkill(skill).toLowerCase()]);
+  return Array.from(spellings).map((spelling) => new RegExp(`^${escape(spelling)}$`, 'i'));
+}